@@ -4,6 +4,171 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "AI Interviewer & Presentation Coach"
     API_V1_STR: str = "/api/v1"
 
+    # Per-session message pipeline (bounded queues)
+    AUDIO_QUEUE_SIZE: int = 32
+    VIDEO_QUEUE_SIZE: int = 2
+    CONTROL_QUEUE_SIZE: int = 16
+
+    # Vision gate: frames within this pHash distance of a cached frame reuse its description
+    VISION_HASH_THRESHOLD: int = 5
+    VISION_CACHE_SIZE: int = 64
+
+    # Image attached to visual_log messages: "full" | "thumbnail" | "ref" | "none"
+    VISUAL_LOG_IMAGE_MODE: str = "thumbnail"
+    THUMBNAIL_MAX_WIDTH: int = 240
+    THUMBNAIL_JPEG_QUALITY: int = 60
+
+    # LLM response cache (LLM_CACHE_DB_PATH="" disables the SQLite tier)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: float = 3600
+    LLM_CACHE_DB_PATH: str = ""
+
+    # Provider limits: concurrency, token-bucket rate (req/s) and burst
+    GROQ_MAX_CONCURRENCY: int = 16
+    GROQ_RATE_PER_SEC: float = 5.0
+    GROQ_BURST: float = 10
+    VISION_MAX_CONCURRENCY: int = 4
+    VISION_RATE_PER_SEC: float = 1.0
+    VISION_BURST: float = 4
+    OPENAI_COMPAT_MAX_CONCURRENCY: int = 8
+    OPENAI_COMPAT_RATE_PER_SEC: float = 5.0
+    OPENAI_COMPAT_BURST: float = 10
+
+    # Retries (jittered exponential backoff, Retry-After honoured) and per-call deadlines (seconds)
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE: float = 0.5
+    LLM_BACKOFF_MAX: float = 8.0
+    CHAT_DEADLINE_SECONDS: float = 30
+    TRANSCRIBE_DEADLINE_SECONDS: float = 15
+    VISION_DEADLINE_SECONDS: float = 30
+
+    # Provider backends (app.core.providers). OPENAI_COMPAT_* adds any OpenAI-compatible
+    # endpoint (key in OPENAI_COMPAT_API_KEY); a capability with an empty model is not
+    # served there. Local faster-whisper / EasyOCR take over transcription / screen
+    # reading when the cloud is down or slow, if installed
+    GROQ_CHAT_MODEL: str = "llama-3.3-70b-versatile"
+    GROQ_TRANSCRIBE_MODEL: str = "whisper-large-v3"
+    OPENROUTER_VISION_MODEL: str = "google/gemma-3-27b-it:free"
+    OPENAI_COMPAT_BASE_URL: str = ""
+    OPENAI_COMPAT_CHAT_MODEL: str = ""
+    OPENAI_COMPAT_TRANSCRIBE_MODEL: str = ""
+    OPENAI_COMPAT_VISION_MODEL: str = ""
+    LOCAL_ASR_FALLBACK: bool = True
+    LOCAL_OCR_FALLBACK: bool = True
+    LOCAL_FALLBACK_WARM_UP: bool = False
+
+    # Provider routing: fastest expected backend first (EWMA latency / success rate);
+    # a breaker opens after PROVIDER_BREAKER_FAILURES consecutive failures and lets one
+    # probe through after the cooldown (doubling per failed probe). Backends slower than
+    # PROVIDER_SLOW_*_SECONDS rank behind local engines, probed every PROVIDER_PROBE_SECONDS
+    PROVIDER_EWMA_ALPHA: float = 0.2
+    PROVIDER_BREAKER_FAILURES: int = 3
+    PROVIDER_BREAKER_COOLDOWN: float = 15.0
+    PROVIDER_BREAKER_MAX_COOLDOWN: float = 120.0
+    PROVIDER_PROBE_SECONDS: float = 15.0
+    PROVIDER_SLOW_CHAT_SECONDS: float = 10.0
+    PROVIDER_SLOW_TRANSCRIBE_SECONDS: float = 4.0
+    PROVIDER_SLOW_VISION_SECONDS: float = 8.0
+
+    # Speculative next-question drafts while the candidate answers
+    SPECULATION_DEBOUNCE_SECONDS: float = 1.0
+    SPECULATION_MIN_CHARS: int = 40
+
+    # Run answer evaluation and next-question generation concurrently on submit
+    OVERLAP_EVALUATION: bool = True
+
+    # Bounded per-session transcript window; evicted segments spill to
+    # TRANSCRIPT_SPILL_DIR/<client_id>.jsonl when set
+    TRANSCRIPT_MAX_SEGMENTS: int = 500
+    TRANSCRIPT_MAX_CHARS: int = 50_000
+    TRANSCRIPT_SPILL_DIR: str = ""
+
+    # Speech recognition for `audio` messages: "groq" (remote, per chunk) or
+    # "local" (streaming faster-whisper with partial hypotheses)
+    ASR_BACKEND: str = "groq"
+    ASR_MODEL_SIZE: str = "base"
+    ASR_DEVICE: str = "cpu"
+    ASR_COMPUTE_TYPE: str = "int8"
+    ASR_WORKERS: int = 2
+    ASR_RING_SECONDS: float = 30.0
+    ASR_PARTIAL_INTERVAL_SECONDS: float = 1.0
+    ASR_WINDOW_SECONDS: float = 8.0
+    ASR_MAX_UTTERANCE_SECONDS: float = 15.0
+    VAD_HANGOVER_MS: int = 600
+
+    # Groq path: drop silence and coalesce speech into one upload per utterance
+    AUDIO_GATE_ENABLED: bool = True
+    AUDIO_MIN_SEGMENT_SECONDS: float = 1.5
+    AUDIO_MIN_UTTERANCE_SECONDS: float = 0.3
+    AUDIO_MAX_LATENCY_SECONDS: float = 5.0
+
+    # Screen understanding: "llm" (vision model description) or "ocr" (local EasyOCR pool)
+    VISION_BACKEND: str = "llm"
+    OCR_WORKERS: int = 2
+    OCR_BATCH_SIZE: int = 8
+    OCR_BATCH_WINDOW_MS: int = 50
+    OCR_LANGUAGES: str = "en"
+    OCR_GPU: bool = False
+    # Region-of-change OCR: re-read only tile rows that changed (replaces the pHash gate)
+    OCR_REGION_MODE: bool = True
+    OCR_TILE_WIDTH: int = 64
+    OCR_TILE_HEIGHT: int = 32
+    OCR_PIXEL_DELTA: int = 24
+    OCR_TILE_CHANGE_RATIO: float = 0.005
+    OCR_FULL_REFRESH_RATIO: float = 0.5
+
+    # Adaptive frame sampling: vision runs on scene changes (mean thumbnail difference
+    # >= SCENE_CHANGE_THRESHOLD) or a per-state refresh on static screens, and the
+    # client is told to slow capture after RATE_IDLE_AFTER / RATE_STATIC_AFTER quiet seconds
+    SCENE_CHANGE_THRESHOLD: float = 0.02
+    VISION_MIN_INTERVAL: float = 1.0
+    VISION_SLOW_SECONDS: float = 3.0
+    QUESTION_TRIGGER_INTERVAL: float = 5.0
+    RATE_IDLE_AFTER: float = 10.0
+    RATE_STATIC_AFTER: float = 30.0
+
+    # Durable sessions: per-session event log + snapshot under EVENT_LOG_DIR (off when
+    # empty); appends are fsynced in batches every EVENT_LOG_FSYNC_MS and compacted
+    # into a snapshot every EVENT_LOG_SNAPSHOT_EVERY events (0 = never)
+    EVENT_LOG_DIR: str = ""
+    EVENT_LOG_FSYNC_MS: int = 100
+    EVENT_LOG_SNAPSHOT_EVERY: int = 200
+
+    # Session store: "memory" (this process only) or "redis" (any Redis-protocol server,
+    # shared by all workers/nodes). Snapshots are saved every SESSION_STORE_SAVE_SECONDS
+    # and on disconnect with optimistic versioning, so a reconnect can land on any worker
+    SESSION_STORE: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    SESSION_STORE_SAVE_SECONDS: float = 1.0
+    SESSION_TTL_SECONDS: int = 6 * 3600
+
+    # Offline mock in place of Groq/OpenRouter (load tests, CI): deterministic
+    # responses, log-normal latency "median,p95" seconds, retryable error rate
+    MOCK_PROVIDER: bool = False
+    MOCK_SEED: int = 0
+    MOCK_CHAT_LATENCY: str = "0.6,1.5"
+    MOCK_STREAM_FIRST_TOKEN: str = "0.25,0.6"
+    MOCK_TRANSCRIBE_LATENCY: str = "0.35,0.9"
+    MOCK_VISION_LATENCY: str = "1.2,3.0"
+    MOCK_ERROR_RATE: float = 0.0
+
+    # Prometheus text metrics at /metrics. The event-loop lag probe wakes every
+    # METRICS_LAG_INTERVAL_SECONDS; METRICS_PER_SESSION adds queue-depth gauges per client id
+    METRICS_ENABLED: bool = True
+    METRICS_LAG_INTERVAL_SECONDS: float = 0.5
+    METRICS_PER_SESSION: bool = True
+
+    # Startup: load models/clients in the background after startup; /ready reports
+    # when done, and WebSockets are refused (close code 1013) until then
+    WARM_UP_ON_STARTUP: bool = True
+    REJECT_WEBSOCKETS_WHILE_COLD: bool = True
+
+    # Token budgets (system + user prompt) per call, estimated locally
+    QUESTION_PROMPT_TOKENS: int = 1200
+    EVALUATION_PROMPT_TOKENS: int = 1000
+    REPORT_PROMPT_TOKENS: int = 4000
+
     class Config:
         case_sensitive = True
 
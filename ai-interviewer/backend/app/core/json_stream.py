@@ -0,0 +1,99 @@
+import json
+import re
+
+ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+def _hex4(text: str):
+    try:
+        return int(text, 16) if len(text) == 4 else None
+    except ValueError:
+        return None
+
+class JSONStringFieldExtractor:
+    """
+    Incrementally extracts one top-level string field from a JSON object that is
+    arriving in chunks (e.g. an LLM token stream).
+
+        extractor = JSONStringFieldExtractor("question_text")
+        for chunk in stream:
+            delta = extractor.feed(chunk)   # newly decoded characters of the value, may be ""
+
+    Escape sequences split across chunks are held back until complete; a \\u
+    surrogate pair (e.g. an escaped emoji) is decoded as one character, and an
+    unpaired surrogate becomes U+FFFD so the text always encodes as UTF-8.
+    """
+    def __init__(self, field: str):
+        self.key_pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self.buffer = ""
+        self.pos = None  # index of the next undecoded value char, once the key has been seen
+        self.value = ""
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk
+        if self.done:
+            return ""
+        if self.pos is None:
+            match = self.key_pattern.search(self.buffer)
+            if not match:
+                return ""
+            self.pos = match.end()
+
+        out = []
+        buf = self.buffer
+        i = self.pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch == "\\":
+                if i + 1 >= len(buf):
+                    break  # wait for the rest of the escape
+                esc = buf[i + 1]
+                if esc == "u":
+                    if i + 6 > len(buf):
+                        break
+                    code = _hex4(buf[i + 2:i + 6])
+                    if code is not None and 0xD800 <= code <= 0xDBFF:
+                        # High surrogate: pairs with a \\uDCxx right after it
+                        follow = buf[i + 6:i + 8]
+                        if "\\u".startswith(follow) and i + 12 > len(buf):
+                            break
+                        low = _hex4(buf[i + 8:i + 12]) if follow == "\\u" else None
+                        if low is not None and 0xDC00 <= low <= 0xDFFF:
+                            out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                            i += 12
+                            continue
+                        code = 0xFFFD
+                    elif code is not None and 0xDC00 <= code <= 0xDFFF:
+                        code = 0xFFFD
+                    if code is not None:
+                        out.append(chr(code))
+                    i += 6
+                    continue
+                out.append(ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        self.pos = i
+
+        delta = "".join(out)
+        self.value += delta
+        return delta
+
+def parse_json_object(text: str):
+    """
+    Parses an LLM response that should be a JSON object, tolerating surrounding
+    prose or code fences (streamed completions can't use provider JSON mode).
+    Raises json.JSONDecodeError if no object can be parsed.
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json.loads(text[start:end + 1])
@@ -0,0 +1,159 @@
+from collections import deque
+
+from app.core.keywords import KEYWORD_ALIASES, TECHNICAL_KEYWORDS
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a keyword taxonomy.
+
+    - One pass over the text regardless of how many keywords there are.
+    - Case-insensitive, whitespace runs collapsed, so "REST   API" matches "rest api".
+    - Whole-word matches only: "go" doesn't match "good", "java" doesn't match "javascript".
+      Keywords that start/end with punctuation ("c++", "c#") only need a boundary on
+      their alphanumeric edges.
+    - Aliases report their canonical term ("k8s" -> "kubernetes").
+    """
+    def __init__(self, keywords, aliases: dict = None):
+        aliases = aliases or {}
+        terms = {self._normalize(k): aliases.get(k, k) for k in keywords}
+        terms.update({self._normalize(a): c for a, c in aliases.items()})
+
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # state -> [(term_length, canonical, needs_start_boundary, needs_end_boundary)]
+        self.max_len = 0
+        for term, canonical in terms.items():
+            if not term:
+                continue
+            self._add(term, canonical)
+        self._build_failure_links()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _add(self, term: str, canonical: str):
+        state = 0
+        for ch in term:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append((len(term), canonical, _is_word_char(term[0]), _is_word_char(term[-1])))
+        self.max_len = max(self.max_len, len(term))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def scan(self, text: str) -> set:
+        """
+        Canonical keywords found in a standalone piece of text.
+        """
+        stream = KeywordStream(self)
+        found = stream.feed(text)
+        return found | stream.flush()
+
+    def stream(self, separator: str = " ") -> "KeywordStream":
+        return KeywordStream(self, separator)
+
+class KeywordStream:
+    """
+    Incremental scan over a stream of text segments (e.g. transcript chunks).
+    Automaton state and a short tail of context carry over between feed() calls,
+    so a multi-word term split across two segments ("rest" | "api") still matches.
+    Segments are joined with `separator`, as the transcript itself is.
+    """
+    def __init__(self, matcher: KeywordMatcher, separator: str = " "):
+        self.matcher = matcher
+        self.separator = separator
+        self.state = 0
+        self.tail = ""      # last max_len+1 normalized chars, for start-boundary checks
+        self.pending = []   # matches ending at the end of the last segment, awaiting the next char
+        self.started = False
+
+    def _normalized(self, text: str) -> str:
+        # Collapse whitespace runs across segment boundaries too
+        out = []
+        prev_space = self.tail.endswith(" ") or not self.tail
+        for ch in text.lower():
+            if ch.isspace():
+                if not prev_space:
+                    out.append(" ")
+                prev_space = True
+            else:
+                out.append(ch)
+                prev_space = False
+        return "".join(out)
+
+    def feed(self, text: str) -> set:
+        if self.started and self.separator:
+            text = self.separator + text
+        self.started = True
+        chunk = self._normalized(text)
+        if not chunk:
+            return set()
+
+        found = set()
+        for canonical, needs_end in self.pending:
+            if not needs_end or not _is_word_char(chunk[0]):
+                found.add(canonical)
+        self.pending = []
+
+        m = self.matcher
+        goto, fail, output = m.goto, m.fail, m.output
+        window = self.tail + chunk
+        offset = len(self.tail)
+        state = self.state
+        last = len(chunk) - 1
+        for i, ch in enumerate(chunk):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            pos = offset + i
+            for length, canonical, needs_start, needs_end in output[state]:
+                start = pos - length + 1
+                if needs_start and start > 0 and _is_word_char(window[start - 1]):
+                    continue
+                if i == last:
+                    self.pending.append((canonical, needs_end))
+                    continue
+                if needs_end and _is_word_char(chunk[i + 1]):
+                    continue
+                found.add(canonical)
+
+        self.state = state
+        self.tail = window[-(m.max_len + 1):]
+
+        # When segments are joined by whitespace, a match at the very end is already complete
+        if self.separator and not _is_word_char(self.separator[0]):
+            found |= self.flush()
+        return found
+
+    def flush(self) -> set:
+        """
+        Reports matches ending at the end of the stream.
+        """
+        found = {canonical for canonical, _ in self.pending}
+        self.pending = []
+        return found
+
+# Compiled once per process
+keyword_matcher = KeywordMatcher(TECHNICAL_KEYWORDS, KEYWORD_ALIASES)
@@ -17,3 +17,19 @@ TECHNICAL_KEYWORDS = {
     # AI / ML
     "pytorch", "tensorflow", "keras", "openai", "llm", "bert", "transformer", "nlp", "pandas", "numpy", "scikit-learn"
 }
+
+# Alternate spellings -> canonical keyword reported by the matcher
+KEYWORD_ALIASES = {
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "golang": "go",
+    "nodejs": "node",
+    "node.js": "node",
+    "next.js": "nextjs",
+    "cpp": "c++",
+    "sklearn": "scikit-learn",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "restful api": "rest api",
+    "large language model": "llm",
+}
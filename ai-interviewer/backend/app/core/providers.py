@@ -0,0 +1,516 @@
+import asyncio
+import base64
+import importlib.util
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import PROVIDER_SECONDS
+from app.core.resilience import ProviderGuard
+
+logger = logging.getLogger(__name__)
+
+VISION_PROMPT = "Describe the technical content of this screen accurately. Identify any code, diagrams, or slide titles. Be concise."
+
+class NoBackendAvailable(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    closed -> open after `failures` consecutive failed calls. While open, calls are
+    refused for `cooldown` seconds; then the breaker is half-open and lets a single
+    probe through: success closes it, failure re-opens it with the cooldown doubled
+    (up to max_cooldown).
+    """
+    def __init__(self, failures: int, cooldown: float, max_cooldown: float):
+        self.threshold = failures
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.opens = 0
+
+    def available(self, now: float) -> bool:
+        """Whether acquire() would let a call through now."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return now - self.opened_at >= self.cooldown
+        return not self.probing
+
+    def acquire(self, now: float) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and now - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+        if self.state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def release(self):
+        """A call finished without a verdict (cancelled)."""
+        self.probing = False
+
+    def record_success(self):
+        self.consecutive = 0
+        self.probing = False
+        self.state = "closed"
+        self.cooldown = self.base_cooldown
+
+    def record_failure(self, now: float):
+        self.consecutive += 1
+        if self.state == "half_open":
+            self.probing = False
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self._open(now)
+        elif self.state == "closed" and self.consecutive >= self.threshold:
+            self._open(now)
+
+    def _open(self, now: float):
+        self.state = "open"
+        self.opened_at = now
+        self.opens += 1
+
+class BackendHealth:
+    """
+    Moving (EWMA) latency and error rate of one backend for one capability,
+    plus its circuit breaker.
+    """
+    def __init__(self, alpha: float, breaker: CircuitBreaker):
+        self.alpha = alpha
+        self.breaker = breaker
+        self.latency = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.last_attempt = 0.0  # start, then end, of the latest call
+
+    def record_success(self, seconds: float, probe: bool = False):
+        self.calls += 1
+        self.last_attempt = time.monotonic()
+        if self.latency is None or probe or self.breaker.state == "half_open":
+            # First sample, or a recovery probe: the old estimate is stale
+            self.latency = seconds
+        else:
+            self.latency += self.alpha * (seconds - self.latency)
+        self.error_rate *= 1 - self.alpha
+        self.breaker.record_success()
+
+    def record_failure(self, now: float):
+        self.calls += 1
+        self.failures += 1
+        self.last_attempt = now
+        self.error_rate += self.alpha * (1 - self.error_rate)
+        self.breaker.record_failure(now)
+
+    def expected_seconds(self, prior: float) -> float:
+        """Expected time to a successful answer: latency inflated by the error rate."""
+        latency = prior if self.latency is None else self.latency
+        return latency / max(0.1, 1 - self.error_rate)
+
+    def stats(self) -> dict:
+        return {
+            "breaker": self.breaker.state,
+            "latency_ms": round(self.latency * 1000) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "failures": self.failures,
+            "opens": self.breaker.opens
+        }
+
+class OpenAICompatibleBackend:
+    """
+    Any OpenAI-style API: chat (plain and streaming), audio transcription and
+    image description, each with its own model. The Groq SDK mirrors the OpenAI
+    one, so Groq, OpenRouter, vLLM and friends are all instances of this.
+    A capability is served only if it has a model.
+    """
+    local = False
+
+    def __init__(self, name: str, client, models: dict, guard: ProviderGuard, extra_headers: dict = None):
+        self.name = name
+        self.client = client
+        self.models = models
+        self.guard = guard
+        self.extra_headers = extra_headers
+        self.capabilities = {capability for capability, model in models.items() if model}
+
+    def _create(self, **kwargs):
+        if self.extra_headers:
+            kwargs["extra_headers"] = self.extra_headers
+        return self.client.chat.completions.create(**kwargs)
+
+    async def chat(self, messages, model=None, temperature=0.7, json_mode=True, deadline=30.0,
+                   hedge=False, max_retries=None) -> str:
+        kwargs = {"messages": messages, "model": model or self.models["chat"], "temperature": temperature}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        completion = await self.guard.call(lambda: self._create(**kwargs), deadline=deadline, hedge=hedge,
+                                           max_retries=max_retries)
+        return completion.choices[0].message.content
+
+    async def stream(self, messages, model=None, temperature=0.7, deadline=30.0, max_retries=None):
+        """Async generator of content deltas; the deadline covers opening the stream."""
+        stream = await self.guard.call(
+            lambda: self._create(messages=messages, model=model or self.models["chat"], temperature=temperature,
+                                 stream=True),
+            deadline=deadline, max_retries=max_retries
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def transcribe(self, audio_bytes: bytes, filename="audio.webm", deadline=15.0, hedge=False,
+                         max_retries=None, pcm=False, sample_rate=None) -> str:
+        if pcm:
+            # The hosted APIs want a container; raw PCM16 goes up as WAV
+            from app.services.audio_frontend import SAMPLE_RATE, decode_audio, encode_wav
+            rate = sample_rate or SAMPLE_RATE
+            audio_bytes = await asyncio.to_thread(lambda: encode_wav(decode_audio(audio_bytes, rate, pcm=True), rate))
+            filename = "audio.wav"
+        return await self.guard.call(
+            lambda: self.client.audio.transcriptions.create(
+                file=(filename, audio_bytes),
+                model=self.models["transcribe"],
+                response_format="text",
+                language="en"
+            ),
+            deadline=deadline, hedge=hedge, max_retries=max_retries
+        )
+
+    async def vision(self, base64_image: str, deadline=30.0, hedge=False, max_retries=None) -> str:
+        messages = [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": VISION_PROMPT},
+                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}}
+            ]
+        }]
+        response = await self.guard.call(
+            lambda: self._create(model=self.models["vision"], messages=messages),
+            deadline=deadline, hedge=hedge, max_retries=max_retries
+        )
+        return response.choices[0].message.content
+
+    def stats(self) -> dict:
+        return self.guard.stats()
+
+class LocalASRBackend:
+    """
+    faster-whisper on this machine (app.services.streaming_asr). Slower per
+    utterance than a hosted Whisper on CPU, but it doesn't depend on the network.
+    """
+    name = "local_asr"
+    local = True
+    capabilities = {"transcribe"}
+
+    async def transcribe(self, audio_bytes: bytes, filename=None, deadline=15.0, pcm=False, sample_rate=None,
+                         **_) -> str:
+        # Imported here: numpy / faster-whisper stay out of the client's import path
+        from app.services.audio_frontend import SAMPLE_RATE, decode_audio, resample
+        from app.services.streaming_asr import local_asr_engine
+        rate = sample_rate or SAMPLE_RATE
+        try:
+            samples = await asyncio.to_thread(decode_audio, audio_bytes, rate if pcm else SAMPLE_RATE, pcm)
+        except (ValueError, ImportError) as e:
+            # e.g. a headerless MediaRecorder continuation chunk: nothing to recognize,
+            # and not a fault of this backend (no failover, no breaker failure)
+            logger.debug(f"local_asr: undecodable audio ({e})")
+            return ""
+        if pcm and rate != SAMPLE_RATE:
+            samples = resample(samples, rate, SAMPLE_RATE)
+        engine = await asyncio.to_thread(local_asr_engine)
+        return await asyncio.wait_for(engine.transcribe(samples), deadline)
+
+    async def warm_up(self):
+        from app.services.streaming_asr import local_asr_engine
+        await asyncio.to_thread(local_asr_engine)
+
+    def stats(self) -> dict:
+        from app.services.streaming_asr import _engine
+        return _engine.stats() if _engine is not None else {}
+
+class LocalOCRBackend:
+    """
+    Screen text from the local EasyOCR pool (app.services.ocr_pool) in place of a
+    vision-model description: less context, but no network.
+    """
+    name = "local_ocr"
+    local = True
+    capabilities = {"vision"}
+
+    async def vision(self, base64_image: str, deadline=30.0, **_) -> str:
+        from app.services.ocr_pool import ocr_pool
+        image_bytes = base64.b64decode(base64_image)
+        return await asyncio.wait_for(ocr_pool().extract_text(image_bytes), deadline)
+
+    async def warm_up(self):
+        from app.services.ocr_pool import ocr_pool
+        await ocr_pool().start()
+
+    def stats(self) -> dict:
+        from app.services.ocr_pool import _pool
+        return _pool.stats() if _pool is not None else {}
+
+class ProviderRouter:
+    """
+    Routes each capability ("chat", "transcribe", "vision") across the backends
+    that serve it, best first:
+    1. cloud backends under the capability's slow threshold, by expected latency
+       (EWMA latency / success rate; an untried backend counts as half the threshold),
+    2. local engines,
+    3. cloud backends over the slow threshold (a brown-out), except that one due a
+       probe (not tried for PROVIDER_PROBE_SECONDS) goes first so its estimate recovers.
+    Backends with an open breaker are skipped. A failed call falls through to the
+    next candidate within the caller's deadline, so a cloud outage costs a slower
+    answer rather than none.
+    """
+    def __init__(self):
+        self.backends = {}
+        self.health = {}  # (backend name, capability) -> BackendHealth
+        self.slow_seconds = {
+            "chat": settings.PROVIDER_SLOW_CHAT_SECONDS,
+            "transcribe": settings.PROVIDER_SLOW_TRANSCRIBE_SECONDS,
+            "vision": settings.PROVIDER_SLOW_VISION_SECONDS
+        }
+        self.failovers = 0
+        self.degraded = 0
+        self.unavailable = 0
+
+    def register(self, backend):
+        self.backends[backend.name] = backend
+        for capability in backend.capabilities:
+            breaker = CircuitBreaker(settings.PROVIDER_BREAKER_FAILURES, settings.PROVIDER_BREAKER_COOLDOWN,
+                                     settings.PROVIDER_BREAKER_MAX_COOLDOWN)
+            self.health[(backend.name, capability)] = BackendHealth(settings.PROVIDER_EWMA_ALPHA, breaker)
+        logger.info(f"Provider backend registered: {backend.name} ({', '.join(sorted(backend.capabilities))})")
+
+    def serves(self, capability: str) -> bool:
+        return any(capability in backend.capabilities for backend in self.backends.values())
+
+    def candidates(self, capability: str, now: float = None) -> list:
+        now = time.monotonic() if now is None else now
+        slow = self.slow_seconds[capability]
+        healthy, local, lagging = [], [], []
+        for backend in self.backends.values():
+            health = self.health.get((backend.name, capability))
+            if health is None or not health.breaker.available(now):
+                continue
+            expected = health.expected_seconds(slow / 2)
+            if backend.local:
+                local.append((expected, backend, health))
+            elif expected <= slow:
+                healthy.append((expected, backend, health))
+            elif now - health.last_attempt >= settings.PROVIDER_PROBE_SECONDS:
+                healthy.insert(0, (0.0, backend, health))
+            else:
+                lagging.append((expected, backend, health))
+        ordered = sorted(healthy, key=lambda c: c[0]) + sorted(local, key=lambda c: c[0]) + sorted(lagging, key=lambda c: c[0])
+        return [(backend, health) for _, backend, health in ordered]
+
+    def preferred(self, capability: str):
+        """Name of the backend a call would try first now, or None."""
+        candidates = self.candidates(capability)
+        return candidates[0][0].name if candidates else None
+
+    def model_label(self, name: str, capability: str, models: dict = None) -> str:
+        """
+        "<backend>/<model>" that backend `name` answers capability with, given
+        per-backend overrides; distinct answers (e.g. for cache keys) per model.
+        """
+        if models and name in models:
+            return f"{name}/{models[name]}"
+        backend = self.backends.get(name)
+        model = getattr(backend, "models", {}).get(capability) if backend is not None else None
+        return f"{name}/{model or 'default'}"
+
+    @staticmethod
+    def _request_for(backend, request: dict, models: dict = None) -> dict:
+        # A model override names one backend's model; the others keep their own
+        if models and backend.name in models:
+            return {**request, "model": models[backend.name]}
+        return request
+
+    def _is_probe(self, capability: str, backend, health) -> bool:
+        """A call to a cloud backend currently ranked as slow (see candidates())."""
+        slow = self.slow_seconds[capability]
+        return not backend.local and health.expected_seconds(slow / 2) > slow
+
+    def _budget(self, capability: str, remaining: float, last: bool) -> float:
+        # Leave the rest of the deadline to the next candidate
+        if last:
+            return remaining
+        return min(remaining, max(remaining / 2, 2 * self.slow_seconds[capability]))
+
+    async def call(self, capability: str, deadline: float, models: dict = None, served: list = None, **request):
+        """
+        The first successful answer for `capability` (backend method of the same name).
+        models: per-backend model overrides by backend name. The name of the backend
+        that answered is appended to `served`, if given.
+        Raises NoBackendAvailable if every breaker is open, or the last backend error.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline
+        candidates = self.candidates(capability)
+        last_error = None
+        for i, (backend, health) in enumerate(candidates):
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+            now = time.monotonic()
+            if not health.breaker.acquire(now):
+                continue
+            health.last_attempt = now
+            probe = self._is_probe(capability, backend, health)
+            last = i == len(candidates) - 1
+            try:
+                result = await getattr(backend, capability)(
+                    deadline=self._budget(capability, remaining, last), max_retries=None if last else 1,
+                    **self._request_for(backend, request, models)
+                )
+            except asyncio.CancelledError:
+                health.breaker.release()
+                raise
+            except Exception as e:
+                health.record_failure(time.monotonic())
+                PROVIDER_SECONDS.labels(backend.name, capability, "error").observe(time.monotonic() - now)
+                last_error = e
+                logger.warning(f"{backend.name} {capability} failed ({e}){'' if last else '; failing over'}")
+                continue
+            elapsed = time.monotonic() - now
+            health.record_success(elapsed, probe)
+            PROVIDER_SECONDS.labels(backend.name, capability, "ok").observe(elapsed)
+            self._served(backend, i)
+            if served is not None:
+                served.append(backend.name)
+            return result
+        if last_error is None:
+            self.unavailable += 1
+            raise NoBackendAvailable(f"No {capability} backend available")
+        raise last_error
+
+    async def stream(self, deadline: float, models: dict = None, served: list = None, **request):
+        """
+        Async generator of chat deltas. Fails over only until the first delta has
+        been yielded; after that an error ends the stream. Latency is time to first delta.
+        models / served as for call(); served is filled in at the first delta.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline
+        candidates = self.candidates("chat")
+        last_error = None
+        for i, (backend, health) in enumerate(candidates):
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+            now = time.monotonic()
+            if not health.breaker.acquire(now):
+                continue
+            health.last_attempt = now
+            probe = self._is_probe("chat", backend, health)
+            last = i == len(candidates) - 1
+            started = False
+            try:
+                async for delta in backend.stream(deadline=self._budget("chat", remaining, last),
+                                                  max_retries=None if last else 1,
+                                                  **self._request_for(backend, request, models)):
+                    if not started:
+                        started = True
+                        self._stream_started(backend, health, now, probe, i)
+                        if served is not None:
+                            served.append(backend.name)
+                    yield delta
+            except (asyncio.CancelledError, GeneratorExit):
+                if not started:
+                    health.breaker.release()
+                raise
+            except Exception as e:
+                health.record_failure(time.monotonic())
+                PROVIDER_SECONDS.labels(backend.name, "chat", "error").observe(time.monotonic() - now)
+                if started:
+                    raise
+                last_error = e
+                logger.warning(f"{backend.name} stream failed ({e}){'' if last else '; failing over'}")
+                continue
+            if not started:
+                self._stream_started(backend, health, now, probe, i)
+            return
+        if last_error is None:
+            self.unavailable += 1
+            raise NoBackendAvailable("No chat backend available")
+        raise last_error
+
+    def _stream_started(self, backend, health, start: float, probe: bool, position: int):
+        elapsed = time.monotonic() - start
+        health.record_success(elapsed, probe)
+        PROVIDER_SECONDS.labels(backend.name, "chat", "first_token").observe(elapsed)
+        self._served(backend, position)
+
+    def _served(self, backend, position: int):
+        if position > 0:
+            self.failovers += 1
+        if backend.local:
+            self.degraded += 1
+
+    def stats(self) -> dict:
+        backends = {}
+        for name, backend in self.backends.items():
+            backends[name] = {"engine": backend.stats()}
+            for capability in sorted(backend.capabilities):
+                backends[name][capability] = self.health[(name, capability)].stats()
+        return {
+            "failovers": self.failovers,
+            "degraded": self.degraded,
+            "unavailable": self.unavailable,
+            "backends": backends
+        }
+
+def local_backends() -> list:
+    """Local fallbacks that are enabled and whose engines are installed."""
+    backends = []
+    if settings.LOCAL_ASR_FALLBACK and importlib.util.find_spec("faster_whisper"):
+        backends.append(LocalASRBackend())
+    if settings.LOCAL_OCR_FALLBACK and importlib.util.find_spec("easyocr"):
+        backends.append(LocalOCRBackend())
+    return backends
+
+def cloud_backends(groq_client, openrouter_client, compat_client=None) -> list:
+    """The configured cloud backends, each behind its own ProviderGuard."""
+    def guard(name, max_concurrency, rate_per_sec, burst):
+        return ProviderGuard(
+            name,
+            max_concurrency=max_concurrency,
+            rate_per_sec=rate_per_sec,
+            burst=burst,
+            max_retries=settings.LLM_MAX_RETRIES,
+            backoff_base=settings.LLM_BACKOFF_BASE,
+            backoff_max=settings.LLM_BACKOFF_MAX
+        )
+
+    backends = []
+    if groq_client is not None:
+        backends.append(OpenAICompatibleBackend(
+            "groq", groq_client,
+            {"chat": settings.GROQ_CHAT_MODEL, "transcribe": settings.GROQ_TRANSCRIBE_MODEL},
+            guard("groq", settings.GROQ_MAX_CONCURRENCY, settings.GROQ_RATE_PER_SEC, settings.GROQ_BURST)
+        ))
+    if compat_client is not None:
+        backends.append(OpenAICompatibleBackend(
+            "openai_compat", compat_client,
+            {"chat": settings.OPENAI_COMPAT_CHAT_MODEL, "transcribe": settings.OPENAI_COMPAT_TRANSCRIBE_MODEL,
+             "vision": settings.OPENAI_COMPAT_VISION_MODEL},
+            guard("openai_compat", settings.OPENAI_COMPAT_MAX_CONCURRENCY, settings.OPENAI_COMPAT_RATE_PER_SEC,
+                  settings.OPENAI_COMPAT_BURST)
+        ))
+    if openrouter_client is not None:
+        backends.append(OpenAICompatibleBackend(
+            "openrouter", openrouter_client,
+            {"vision": settings.OPENROUTER_VISION_MODEL},
+            guard("openrouter", settings.VISION_MAX_CONCURRENCY, settings.VISION_RATE_PER_SEC, settings.VISION_BURST),
+            extra_headers={"HTTP-Referer": "http://localhost:5173", "X-Title": "AI Interviewer"}
+        ))
+    return backends
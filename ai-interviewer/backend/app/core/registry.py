@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class Resource:
+    __slots__ = ("name", "loader", "required", "state", "value", "error", "load_seconds", "lock")
+
+    def __init__(self, name: str, loader, required: bool):
+        self.name = name
+        self.loader = loader
+        self.required = required
+        self.state = "cold"  # cold -> loading -> ready | failed
+        self.value = None
+        self.error = None
+        self.load_seconds = None
+        self.lock = asyncio.Lock()
+
+class ModelRegistry:
+    """
+    Models and provider clients that are expensive to import or load.
+
+    Nothing is loaded at registration. warm_up() (started in the background after
+    app startup) loads every resource concurrently: plain loaders run in a thread so
+    the event loop keeps serving /health meanwhile, async loaders are awaited.
+    get() returns a resource, loading it on demand if warm-up hasn't reached it.
+    is_ready() is True once every required resource has loaded.
+    """
+    def __init__(self):
+        self.resources = {}
+        self.warm_task = None
+        self.started_at = None
+
+    def register(self, name: str, loader, required: bool = True):
+        self.resources[name] = Resource(name, loader, required)
+
+    async def get(self, name: str):
+        resource = self.resources[name]
+        if resource.state != "ready":
+            await self._load(resource)
+        if resource.state != "ready":
+            raise RuntimeError(f"{name} failed to load: {resource.error}")
+        return resource.value
+
+    async def _load(self, resource: Resource):
+        async with resource.lock:
+            if resource.state == "ready":
+                return
+            resource.state = "loading"
+            start = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(resource.loader):
+                    value = await resource.loader()
+                else:
+                    value = await asyncio.to_thread(resource.loader)
+                    if inspect.isawaitable(value):
+                        value = await value
+                resource.value = value
+                resource.state = "ready"
+                resource.error = None
+            except Exception as e:
+                resource.state = "failed"
+                resource.error = str(e)
+                logger.error(f"Failed to load {resource.name}: {e}")
+            resource.load_seconds = round(time.perf_counter() - start, 3)
+            if resource.state == "ready":
+                logger.info(f"{resource.name} ready in {resource.load_seconds}s")
+
+    async def warm_up(self):
+        self.started_at = time.perf_counter()
+        await asyncio.gather(*(self._load(r) for r in self.resources.values() if r.state != "ready"))
+        logger.info(f"Warm-up finished in {time.perf_counter() - self.started_at:.1f}s "
+                    f"({'ready' if self.is_ready() else 'NOT ready'})")
+
+    def start_warm_up(self):
+        if self.warm_task is None:
+            self.warm_task = asyncio.create_task(self.warm_up())
+        return self.warm_task
+
+    def is_ready(self) -> bool:
+        return all(r.state == "ready" for r in self.resources.values() if r.required)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.is_ready(),
+            "resources": {
+                r.name: {
+                    "state": r.state,
+                    "required": r.required,
+                    "load_seconds": r.load_seconds,
+                    **({"error": r.error} if r.error else {})
+                }
+                for r in self.resources.values()
+            }
+        }
+
+# Populated in app.main
+models = ModelRegistry()
@@ -0,0 +1,205 @@
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+class DeadlineExceeded(Exception):
+    pass
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, up to `capacity` banked.
+    acquire() waits until a token is available.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies (seconds).
+    """
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def status_code_of(exc: Exception):
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+def retry_after_of(exc: Exception):
+    """
+    Seconds to wait from a Retry-After / retry-after-ms response header, if any.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return float(value) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except Exception:
+        return None
+
+def is_retryable(exc: Exception) -> bool:
+    status = status_code_of(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # Network-level failures (timeouts, dropped connections) carry no status
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name or isinstance(exc, (asyncio.TimeoutError, ConnectionError))
+
+class ProviderGuard:
+    """
+    Wraps every call to one provider with:
+    - a concurrency semaphore and a token-bucket rate limiter,
+    - retries with jittered exponential backoff that honour Retry-After,
+    - an overall per-call deadline,
+    - optional hedging: a duplicate request after the provider's p95 latency.
+    """
+    def __init__(self, name: str, max_concurrency: int, rate_per_sec: float, burst: float,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 hedge_min_samples: int = 20, hedge_min_delay: float = 0.25, hedge_default_delay: float = 2.0):
+        self.name = name
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.latency = LatencyTracker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.retries = 0
+        self.hedges = 0
+        self.failures = 0
+
+    def hedge_delay(self) -> float:
+        if len(self.latency.samples) < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, self.latency.percentile(0.95))
+
+    def backoff(self, attempt: int) -> float:
+        # "Full jitter" exponential backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def call(self, fn, deadline: float, hedge: bool = False, max_retries: int = None):
+        """
+        Runs `fn` (a zero-arg coroutine factory) under the guard.
+        Raises DeadlineExceeded if no attempt succeeds within `deadline` seconds,
+        or the last provider error once retries are exhausted.
+        max_retries overrides the guard's default for this call (e.g. fewer when
+        another provider can take over).
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline
+        retries = self.max_retries if max_retries is None else max_retries
+        try:
+            return await asyncio.wait_for(self._with_retries(fn, hedge, deadline_at, retries), timeout=deadline)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            raise DeadlineExceeded(f"{self.name} call exceeded {deadline:.1f}s deadline")
+        except Exception:
+            self.failures += 1
+            raise
+
+    async def _with_retries(self, fn, hedge: bool, deadline_at: float, max_retries: int):
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            try:
+                if hedge:
+                    return await self._hedged(fn)
+                return await self._attempt(fn)
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable(e):
+                    raise
+                delay = retry_after_of(e)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                if loop.time() + delay >= deadline_at:
+                    raise
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"{self.name} call failed ({e}); retry {attempt}/{max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, fn):
+        async with self.semaphore:
+            await self.bucket.acquire()
+            start = time.monotonic()
+            result = await fn()
+            self.latency.record(time.monotonic() - start)
+            return result
+
+    async def _hedged(self, fn):
+        primary = asyncio.create_task(self._attempt(fn))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if not done:
+                self.hedges += 1
+                tasks.add(asyncio.create_task(self._attempt(fn)))
+
+            first_error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        p95 = self.latency.percentile(0.95)
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "failures": self.failures,
+            "p95_seconds": round(p95, 3) if p95 is not None else None
+        }
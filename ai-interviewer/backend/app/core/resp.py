@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class RespError(Exception):
+    """An error reply (-ERR ...) from the server."""
+
+def encode_command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+async def read_reply(reader: asyncio.StreamReader):
+    """
+    One RESP2 reply: str for simple strings, int, bytes (or None) for bulk
+    strings, list (or None) for arrays. Error replies are returned as RespError
+    instances, not raised, so they can sit inside an EXEC result.
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RespError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(rest)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise ConnectionError(f"Unexpected RESP reply: {line!r}")
+
+class RespConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(self, *args):
+        self.writer.write(encode_command(*args))
+        await self.writer.drain()
+        reply = await read_reply(self.reader)
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def close(self):
+        self.writer.close()
+
+class RespClient:
+    """
+    Minimal asyncio client for Redis-protocol servers (Redis, Valkey, KeyDB, or
+    the local stand-in in resp_standin.py), enough for the session store.
+
+    Connections are pooled, up to max_connections. Use execute() for one-off
+    commands and connection() to hold one connection across commands that depend
+    on connection state (WATCH / MULTI / EXEC). A connection whose block raised is
+    discarded, not returned to the pool.
+    """
+    def __init__(self, url: str = "redis://localhost:6379/0", max_connections: int = 16):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.idle = []
+        self.slots = asyncio.Semaphore(max_connections)
+
+    async def _open(self) -> RespConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        conn = RespConnection(reader, writer)
+        if self.password:
+            await conn.execute("AUTH", self.password)
+        if self.db:
+            await conn.execute("SELECT", self.db)
+        return conn
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self.slots:
+            conn = self.idle.pop() if self.idle else await self._open()
+            try:
+                yield conn
+            except BaseException:
+                # May be mid-reply or inside MULTI; don't hand it to the next caller
+                conn.close()
+                raise
+            self.idle.append(conn)
+
+    async def execute(self, *args):
+        async with self.connection() as conn:
+            return await conn.execute(*args)
+
+    async def close(self):
+        while self.idle:
+            self.idle.pop().close()
@@ -1,6 +1,13 @@
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
+from app.core.metrics import metrics, monitor_loop_lag
+from app.core.registry import models
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -18,17 +25,81 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is up (models may still be loading)."""
     return {"status": "ok"}
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness: every required model/client is loaded. 503 until then."""
+    status = models.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
 from fastapi import WebSocket, WebSocketDisconnect
+from app.core.llm_client import llm_client
+from app.services.audio_frontend import compressed_decoder_available
+from app.services.ocr_pool import ocr_pool
+from app.services.streaming_asr import local_asr_engine
 from app.services.stream_manager import manager
 
+models.register("llm_clients", llm_client.connect)
+if settings.ASR_BACKEND == "local":
+    models.register("local_asr", local_asr_engine)
+if settings.VISION_BACKEND == "ocr":
+    models.register("ocr_pool", lambda: ocr_pool().start())
+if settings.LOCAL_FALLBACK_WARM_UP:
+    # Not required: the cloud backends can serve without them
+    models.register("local_fallbacks", llm_client.warm_up_fallbacks, required=False)
+
+@app.on_event("startup")
+async def warm_up():
+    if settings.WARM_UP_ON_STARTUP:
+        models.start_warm_up()
+
+@app.on_event("startup")
+async def check_audio_gate():
+    if settings.AUDIO_GATE_ENABLED and settings.ASR_BACKEND != "local" and not compressed_decoder_available():
+        logger.warning("AUDIO_GATE_ENABLED but faster-whisper is not installed: only PCM16/WAV audio is gated; "
+                       "webm/ogg chunks are uploaded one by one, silence included")
+
+@app.on_event("startup")
+async def start_loop_lag_probe():
+    if settings.METRICS_ENABLED:
+        app.state.loop_lag_task = asyncio.create_task(monitor_loop_lag(settings.METRICS_LAG_INTERVAL_SECONDS))
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """
+    Prometheus scrape target: stage / provider latency histograms, counters and gauges.
+    Async so rendering runs on the event loop, where every metric is updated.
+    """
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/sessions")
+def session_stats():
+    """Per-session queue depths and drop counts."""
+    return manager.stats()
+
 @app.websocket("/ws/stream/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
-    await manager.connect(websocket)
+    if settings.WARM_UP_ON_STARTUP and settings.REJECT_WEBSOCKETS_WHILE_COLD and not models.is_ready():
+        # 1013 Try Again Later (accepted first so the browser sees the code)
+        await websocket.accept()
+        await websocket.close(code=1013)
+        return
+    # Sent back by the client (from session_started) when it reconnects to the same interview
+    session = await manager.connect(websocket, client_id, websocket.query_params.get("resume"))
     try:
         while True:
-            data = await websocket.receive_text()
-            await manager.process_message(websocket, data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                await manager.enqueue_binary(session, message["bytes"])
+            elif message.get("text") is not None:
+                await manager.enqueue(session, message["text"])
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
+    finally:
+        await manager.disconnect(websocket, client_id)
@@ -0,0 +1,209 @@
+import importlib.util
+import io
+import logging
+import wave
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+def is_wav(data: bytes) -> bool:
+    return data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+
+def compressed_decoder_available() -> bool:
+    """Whether decode_audio can read webm/ogg/mp4/mp3 (needs faster-whisper, for PyAV)."""
+    return importlib.util.find_spec("faster_whisper") is not None
+
+def decode_audio(data: bytes, sample_rate: int = SAMPLE_RATE, pcm: bool = False) -> np.ndarray:
+    """
+    Mono float32 samples in [-1, 1] at sample_rate.
+
+    - pcm=True: raw 16-bit little-endian PCM at sample_rate, as binary `audio`
+      frames flagged PCM16 carry (app.core.protocol).
+    - WAV (RIFF) is parsed with the wave module and resampled if needed.
+    - Compressed containers (webm/ogg/mp4/mp3, e.g. MediaRecorder chunks) are decoded
+      with faster-whisper's PyAV decoder.
+    - Anything else (e.g. a headerless MediaRecorder continuation chunk) raises
+      ValueError rather than being misread as PCM noise.
+    """
+    if not data:
+        return np.zeros(0, dtype=np.float32)
+    if pcm:
+        usable = len(data) - len(data) % 2
+        return np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+    if is_wav(data):
+        with wave.open(io.BytesIO(data)) as wav:
+            rate, channels, width = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+            frames = wav.readframes(wav.getnframes())
+        if width != 2:
+            raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        return resample(samples, rate, sample_rate)
+    if data[:4] in (b"\x1a\x45\xdf\xa3", b"OggS", b"ID3\x03", b"ID3\x04") or data[4:8] == b"ftyp":
+        from faster_whisper.audio import decode_audio as av_decode
+        return av_decode(io.BytesIO(data), sampling_rate=sample_rate)
+    raise ValueError(f"Unrecognized audio container (first bytes {data[:4].hex()})")
+
+def resample(samples: np.ndarray, rate: int, target: int) -> np.ndarray:
+    """Linear-interpolation resampler; plenty for speech going into Whisper."""
+    if rate == target or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+    duration = len(samples) / rate
+    positions = np.arange(int(duration * target)) * (rate / target)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def encode_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """16-bit mono WAV, e.g. for uploading a segment to a remote transcription API."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity sample buffer addressed by absolute sample index
+    (samples since the session started), so segment boundaries stay valid
+    while old audio is overwritten.
+    """
+    def __init__(self, max_seconds: float, sample_rate: int = SAMPLE_RATE):
+        self.capacity = int(max_seconds * sample_rate)
+        self.sample_rate = sample_rate
+        self.buffer = np.zeros(self.capacity, dtype=np.float32)
+        self.end = 0  # absolute index one past the newest sample
+
+    @property
+    def start(self) -> int:
+        return max(0, self.end - self.capacity)
+
+    def append(self, samples: np.ndarray):
+        if len(samples) >= self.capacity:
+            self.buffer[:] = samples[-self.capacity:]
+            self.end += len(samples)
+            # Keep the invariant that absolute index i lives at i % capacity
+            self.buffer = np.roll(self.buffer, self.end % self.capacity)
+            return
+        pos = self.end % self.capacity
+        first = min(len(samples), self.capacity - pos)
+        self.buffer[pos:pos + first] = samples[:first]
+        self.buffer[:len(samples) - first] = samples[first:]
+        self.end += len(samples)
+
+    def read(self, start: int, end: int = None) -> np.ndarray:
+        """Copy of samples [start, end), clamped to what is still buffered."""
+        end = self.end if end is None else min(end, self.end)
+        start = max(start, self.start)
+        if start >= end:
+            return np.zeros(0, dtype=np.float32)
+        a, b = start % self.capacity, end % self.capacity
+        if a < b or b == 0:
+            return self.buffer[a:a + (end - start)].copy()
+        return np.concatenate((self.buffer[a:], self.buffer[:b]))
+
+class SpeechSegmenter:
+    """
+    Energy-based voice activity detection over 30 ms frames.
+
+    The speech threshold follows an adaptive noise floor (floor + margin_db, never
+    below min_db), so a steady fan or room hum doesn't count as speech. An utterance
+    starts after min_speech_ms of speech (backdated by preroll_ms so the first
+    syllable isn't clipped) and ends after hangover_ms of silence.
+
+    feed() returns completed (start, end) utterances as absolute sample indices;
+    speech_start is the start of the utterance in progress, if any.
+    """
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = 30, margin_db: float = 10.0,
+                 min_db: float = -50.0, min_speech_ms: int = 90, hangover_ms: int = 600, preroll_ms: int = 200):
+        self.frame = int(sample_rate * frame_ms / 1000)
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.preroll = int(sample_rate * preroll_ms / 1000)
+
+        self.noise_floor = -60.0
+        self.remainder = np.zeros(0, dtype=np.float32)
+        self.position = 0  # absolute index of the first sample in remainder
+        self.speech_run = 0
+        self.silence_run = 0
+        self.candidate_start = None
+        self.speech_start = None
+        self.speech_frames = 0
+        self.total_frames = 0
+
+    def feed(self, samples: np.ndarray) -> list:
+        data = np.concatenate((self.remainder, samples)) if len(self.remainder) else samples
+        n_frames = len(data) // self.frame
+        completed = []
+        if n_frames:
+            frames = data[:n_frames * self.frame].reshape(n_frames, self.frame)
+            energy_db = 10 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-10)
+            for i, db in enumerate(energy_db):
+                frame_start = self.position + i * self.frame
+                segment = self._step(float(db), frame_start)
+                if segment:
+                    completed.append(segment)
+        used = n_frames * self.frame
+        self.remainder = data[used:].copy()
+        self.position += used
+        return completed
+
+    def _step(self, db: float, frame_start: int):
+        self.total_frames += 1
+        is_speech = db > max(self.noise_floor + self.margin_db, self.min_db)
+        # The floor drops instantly and rises slowly (much slower during speech), so it
+        # follows the quiet gaps between words and adapts to a new steady background
+        if db < self.noise_floor:
+            self.noise_floor = db
+        else:
+            self.noise_floor += (0.01 if is_speech else 0.05) * (db - self.noise_floor)
+
+        if self.speech_start is None:
+            if is_speech:
+                if self.speech_run == 0:
+                    self.candidate_start = frame_start
+                self.speech_run += 1
+                if self.speech_run >= self.min_speech_frames:
+                    self.speech_start = max(0, self.candidate_start - self.preroll)
+                    self.silence_run = 0
+            else:
+                self.speech_run = 0
+            return None
+
+        if is_speech:
+            self.speech_frames += 1
+            self.silence_run = 0
+            return None
+        self.silence_run += 1
+        if self.silence_run >= self.hangover_frames:
+            # End after the first silent frame (a little trailing context)
+            end = frame_start + self.frame - (self.silence_run - 1) * self.frame
+            segment = (self.speech_start, end)
+            self.speech_start = None
+            self.speech_run = 0
+            return segment
+        return None
+
+    def split(self, at: int):
+        """
+        Ends the utterance in progress at `at` and continues it as a new one
+        (used to cap utterance length while the speaker keeps talking).
+        """
+        if self.speech_start is None:
+            return None
+        segment = (self.speech_start, at)
+        self.speech_start = at
+        return segment
+
+    def stats(self) -> dict:
+        return {
+            "speech_ratio": round(self.speech_frames / self.total_frames, 3) if self.total_frames else 0.0,
+            "noise_floor_db": round(self.noise_floor, 1)
+        }
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.audio_frontend import (SAMPLE_RATE, AudioRingBuffer, SpeechSegmenter, compressed_decoder_available,
+                                         decode_audio, encode_wav, is_wav)
+
+logger = logging.getLogger(__name__)
+
+class SpeechGate:
+    """
+    Server-side audio front end for remote transcription.
+
+    Incoming chunks are decoded and run through the speech segmenter; silence is
+    dropped, blips shorter than AUDIO_MIN_UTTERANCE_SECONDS are discarded, and
+    speech is coalesced until there is at least AUDIO_MIN_SEGMENT_SECONDS of it.
+    Nothing waits longer than AUDIO_MAX_LATENCY_SECONDS: a long utterance is split
+    and pending speech is flushed by a timer once it is that old.
+
+    Each flushed segment is passed to `await on_segment(wav_bytes, filename)` as one
+    WAV. Chunks that can't be decoded (e.g. headerless MediaRecorder continuation
+    chunks) are forwarded unchanged, as before.
+
+    Only PCM16 frames and WAV can always be gated. Compressed chunks (webm/ogg from
+    MediaRecorder) need faster-whisper installed for its PyAV decoder; without it
+    they are forwarded without a decode attempt and the gate saves nothing on them
+    (warned about at startup, see app.main).
+    """
+    GAP = np.zeros(int(0.2 * SAMPLE_RATE), dtype=np.float32)  # between coalesced utterances
+
+    def __init__(self, on_segment):
+        self.on_segment = on_segment
+        self.min_segment = settings.AUDIO_MIN_SEGMENT_SECONDS
+        self.min_utterance = int(settings.AUDIO_MIN_UTTERANCE_SECONDS * SAMPLE_RATE)
+        self.max_latency = settings.AUDIO_MAX_LATENCY_SECONDS
+        self.ring = AudioRingBuffer(max(settings.ASR_RING_SECONDS, 2 * self.max_latency))
+        self.segmenter = SpeechSegmenter(hangover_ms=settings.VAD_HANGOVER_MS)
+        self.decodes_compressed = compressed_decoder_available()
+
+        self.pending = []
+        self.pending_since = None
+        self.lock = asyncio.Lock()
+        self.timer = None
+
+        self.chunks = 0
+        self.requests = 0
+        self.passthrough = 0
+        self.audio_seconds = 0.0
+        self.speech_seconds = 0.0
+        self.dropped_blips = 0
+
+    async def feed(self, audio_bytes: bytes, pcm: bool = False):
+        self.chunks += 1
+        if not (pcm or self.decodes_compressed or is_wav(audio_bytes)):
+            await self._forward(audio_bytes)
+            return
+        try:
+            samples = await asyncio.to_thread(decode_audio, audio_bytes, SAMPLE_RATE, pcm)
+        except Exception as e:
+            logger.debug(f"Undecodable audio chunk, forwarding as-is: {e}")
+            await self._forward(audio_bytes)
+            return
+        if not len(samples):
+            return
+        self.ring.append(samples)
+        self.audio_seconds += len(samples) / SAMPLE_RATE
+
+        for start, end in self.segmenter.feed(samples):
+            self._hold(start, end)
+        start = self.segmenter.speech_start
+        if start is not None and (self.ring.end - start) / SAMPLE_RATE >= self.max_latency:
+            self._hold(*self.segmenter.split(self.ring.end))
+
+        if self._pending_seconds() >= self.min_segment or self._pending_age() >= self.max_latency:
+            await self.flush()
+        elif self.pending and self.timer is None:
+            delay = max(0.0, self.max_latency - self._pending_age())
+            self.timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    async def _forward(self, audio_bytes: bytes):
+        self.passthrough += 1
+        self.requests += 1
+        await self.on_segment(audio_bytes, "audio.webm")
+
+    def _hold(self, start: int, end: int):
+        if end - start < self.min_utterance:
+            self.dropped_blips += 1
+            return
+        self.pending.append(self.ring.read(start, end))
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+
+    def _pending_seconds(self) -> float:
+        return sum(len(p) for p in self.pending) / SAMPLE_RATE
+
+    def _pending_age(self) -> float:
+        return time.monotonic() - self.pending_since if self.pending_since is not None else 0.0
+
+    def _on_timer(self):
+        self.timer = None
+        asyncio.ensure_future(self._flush_logged())
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Audio flush error: {e}")
+
+    async def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        # Serialized so segments reach on_segment in order when a timer flush overlaps a feed
+        async with self.lock:
+            if not self.pending:
+                return
+            parts = []
+            for segment in self.pending:
+                if parts:
+                    parts.append(self.GAP)
+                parts.append(segment)
+            self.pending = []
+            self.pending_since = None
+            samples = np.concatenate(parts)
+            self.speech_seconds += len(samples) / SAMPLE_RATE
+            self.requests += 1
+            wav = await asyncio.to_thread(encode_wav, samples)
+            await self.on_segment(wav, "utterance.wav")
+
+    def close(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def stats(self) -> dict:
+        return {
+            "chunks": self.chunks,
+            "requests": self.requests,
+            "passthrough": self.passthrough,
+            "audio_seconds": round(self.audio_seconds, 1),
+            "speech_seconds": round(self.speech_seconds, 1),
+            "dropped_blips": self.dropped_blips,
+            **self.segmenter.stats()
+        }
@@ -1,38 +1,59 @@
 import logging
 import re
-from app.core.keywords import TECHNICAL_KEYWORDS
+from app.core.config import settings
+from app.core.keyword_matcher import keyword_matcher
+from app.services.jd_digest import digest_job_description
+from app.services.transcript_store import TranscriptStore
 
 logger = logging.getLogger(__name__)
 
 class ContextEngine:
-    def __init__(self):
-        self.transcript_history = []  # List of strings
+    def __init__(self, spill_path: str = None):
+        self.transcript = TranscriptStore(
+            max_segments=settings.TRANSCRIPT_MAX_SEGMENTS,
+            max_chars=settings.TRANSCRIPT_MAX_CHARS,
+            spill_path=spill_path
+        )
         self.detected_keywords = set()
         self.current_slide_text = ""
         self.detected_topics = set()
-        self.raw_transcript = ""
         self.job_description = ""
+        self.job_digest = None
+        self.transcript_scanner = keyword_matcher.stream()
+
+    @property
+    def raw_transcript(self) -> str:
+        return self.transcript.text()
+
+    def reset(self):
+        """Forgets the transcript, visuals and job description of the previous interview."""
+        self.transcript.clear()
+        self.detected_keywords = set()
+        self.current_slide_text = ""
+        self.detected_topics = set()
+        self.job_description = ""
+        self.job_digest = None
+        self.transcript_scanner = keyword_matcher.stream()
 
     def set_job_description(self, text: str):
         self.job_description = text
+        # Digested once here; every question prompt reuses the same digest text
+        self.job_digest = digest_job_description(text)
         logger.info(f"Job Description set ({len(text)} chars)")
 
-    def update_transcript(self, text: str):
+    def update_transcript(self, text: str, timestamp: float = None):
         """
         Ingests new transcript segment.
-        1. Appends to history.
+        1. Appends to the bounded transcript store.
         2. Scans for keywords.
         """
-        self.transcript_history.append(text)
-        self.raw_transcript += " " + text
+        self.transcript.append(text, timestamp)
         
-        # Simple keyword matching (case-insensitive)
-        lower_text = text.lower()
-        for kw in TECHNICAL_KEYWORDS:
-            if kw in lower_text:
-                if kw not in self.detected_keywords:
-                    self.detected_keywords.add(kw)
-                    logger.info(f"Context Detected Keyword: {kw}")
+        # Incremental whole-word keyword scan (terms may span segments)
+        for kw in self.transcript_scanner.feed(text):
+            if kw not in self.detected_keywords:
+                self.detected_keywords.add(kw)
+                logger.info(f"Context Detected Keyword: {kw}")
 
     def update_visuals(self, text: str):
         """
@@ -44,10 +65,7 @@ class ContextEngine:
         self.current_slide_text = text
         
         # Keyword scan in slide text
-        lower_text = text.lower()
-        for kw in TECHNICAL_KEYWORDS:
-            if kw in lower_text:
-                self.detected_keywords.add(kw)
+        self.detected_keywords |= keyword_matcher.scan(text)
  
         # Simple Heuristic for Topic/Title:
         # Assume the first non-empty line that is short (< 50 chars) is a title candidate
@@ -58,17 +76,38 @@ class ContextEngine:
                  self.detected_topics.add(potential_title)
                  logger.info(f"Context Potential Topic: {potential_title}")
 
+    def snapshot(self) -> dict:
+        """
+        JSON-safe state for the session event log. Only the in-memory transcript
+        window is kept; evicted segments live in the spill file.
+        """
+        return {
+            "transcript": [segment.to_dict() for segment in self.transcript.segments],
+            "total_segments": self.transcript.total_segments,
+            "keywords": sorted(self.detected_keywords),
+            "current_slide": self.current_slide_text,
+            "topics": sorted(self.detected_topics),
+            "job_description": self.job_description
+        }
+
+    def restore(self, state: dict):
+        for segment in state["transcript"]:
+            self.transcript.append(segment["text"], segment["timestamp"])
+        self.transcript.total_segments = state["total_segments"]
+        self.detected_keywords = set(state["keywords"])
+        self.current_slide_text = state["current_slide"]
+        self.detected_topics = set(state["topics"])
+        if state["job_description"]:
+            self.set_job_description(state["job_description"])
+
     def get_context(self) -> dict:
         """
         Returns structured context summary.
         """
         return {
-            "transcript_summary": self.raw_transcript[-1000:], # Last 1000 chars for prompt context
-            "keywords": list(self.detected_keywords),
+            "transcript_summary": self.transcript.tail_tokens(400), # Most recent ~400 tokens; PromptAssembler enforces the final budget
+            "keywords": sorted(self.detected_keywords),
             "current_slide": self.current_slide_text,
             "topics": list(self.detected_topics),
-            "job_description": self.job_description
+            "job_digest": self.job_digest.text if self.job_digest else ""
         }
-
-# Global Instance
-context_engine = ContextEngine()
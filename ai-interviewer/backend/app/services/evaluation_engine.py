@@ -1,6 +1,8 @@
 import logging
 import json
 from app.core.llm_client import llm_client
+from app.core.prompt_builder import PromptAssembler, estimate_tokens
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,22 +26,21 @@ class EvaluationEngine:
         4. Output MUST be valid JSON with keys: "score" (int), "feedback" (str), "missing_points" (list[str]), "better_answer" (str).
         """
         
-        user_prompt = f"""
-        Question: {question}
-        
-        Candidate's Answer: {answer}
-        
-        Context (What they were presenting):
-        - Tech Stack: {', '.join(context.get('keywords', []))}
-        
-        Evaluate now.
-        """
+        prompt = (
+            PromptAssembler(settings.EVALUATION_PROMPT_TOKENS, reserved=estimate_tokens(system_prompt))
+            .add("Question", question, priority=10)
+            .add("Candidate's Answer", answer, priority=5, min_tokens=200)
+            .add("Context (What they were presenting) - Tech Stack", ', '.join(context.get('keywords', [])), priority=1)
+            .add(None, "Evaluate now.", priority=100)
+            .assemble()
+        )
+        logger.info(f"Evaluation prompt: {prompt.tokens} tokens")
 
         logger.info("Requesting Evaluation from LLM...")
         response_json_str = await llm_client.get_chat_completion(
             messages=[
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "user", "content": prompt.text}
             ]
         )
         
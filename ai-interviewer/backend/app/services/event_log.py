@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class EventLog:
+    """
+    Append-only, crash-safe record of one session's state changes.
+
+    <base>.events.jsonl holds one JSON event per line, numbered by "seq";
+    <base>.snapshot.json holds the whole session state as of some seq.
+    Recovery is the snapshot plus a replay of newer events, so its cost is bounded
+    by snapshot_every rather than by the length of the interview.
+
+    append() writes through to the OS immediately and fsyncs in batches: the first
+    append after a sync schedules one flush + fsync (in a thread) fsync_interval
+    seconds later, so a burst of events costs one fsync and a crash loses at most
+    that window.
+
+    Compaction: once snapshot_every events have been appended, the log is rotated
+    to <base>.events.jsonl.1 and a fresh one started; a thread fsyncs the rotated
+    log, writes the snapshot to a temp file, fsyncs and renames it into place, then
+    deletes the rotated log. Whenever a crash lands, the files on disk are either
+    the old snapshot plus every newer event, or the new snapshot plus events it
+    may already cover, which load() skips by seq.
+    """
+    def __init__(self, base_path: str, fsync_interval: float = 0.1, snapshot_every: int = 200):
+        self.log_path = base_path + ".events.jsonl"
+        self.rotated_path = self.log_path + ".1"
+        self.snapshot_path = base_path + ".snapshot.json"
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.since_snapshot = 0
+        self.file = None
+        self.sync_handle = None
+        self.sync_task = None
+        self.snapshot_task = None
+
+        self.appends = 0
+        self.syncs = 0
+        self.snapshots = 0
+        self.errors = 0
+
+    def _read(self, path: str, after: int) -> list:
+        events = []
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # Torn final write from a crash; everything before it is intact
+                        logger.warning(f"Event log {path}: ignoring truncated tail")
+                        break
+                    if event.get("seq", 0) > after:
+                        events.append(event)
+        except FileNotFoundError:
+            pass
+        return events
+
+    def load(self):
+        """
+        (snapshot state or None, events newer than it, in order). Blocking; run in a thread.
+        """
+        state, seq = None, 0
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            state, seq = snapshot["state"], snapshot["seq"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Unreadable snapshot {self.snapshot_path}: {e}")
+        events = self._read(self.rotated_path, seq) + self._read(self.log_path, seq)
+        self.seq = max([seq] + [event["seq"] for event in events])
+        return state, events
+
+    def append(self, event: dict):
+        self.seq += 1
+        line = json.dumps({"seq": self.seq, **event}, ensure_ascii=False)
+        try:
+            if self.file is None:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                # Line-buffered: each event reaches the OS at once and survives a process crash
+                self.file = open(self.log_path, "a", encoding="utf-8", buffering=1)
+            self.file.write(line + "\n")
+        except OSError as e:
+            self.errors += 1
+            logger.error(f"Event log write error: {e}")
+            return
+        self.appends += 1
+        self.since_snapshot += 1
+        if self.sync_handle is None:
+            self.sync_handle = asyncio.get_running_loop().call_later(self.fsync_interval, self._start_sync)
+
+    def _start_sync(self):
+        self.sync_handle = None
+        self.sync_task = asyncio.create_task(self.sync())
+
+    async def sync(self):
+        """Flushes and fsyncs everything appended so far."""
+        file = self.file
+        if file is None:
+            return
+        try:
+            file.flush()
+            await asyncio.to_thread(os.fsync, file.fileno())
+            self.syncs += 1
+        except (OSError, ValueError) as e:
+            # ValueError: rotated and closed meanwhile; the snapshot thread fsyncs it
+            if not file.closed:
+                self.errors += 1
+                logger.error(f"Event log fsync error: {e}")
+
+    def snapshot_due(self) -> bool:
+        return (
+            self.snapshot_every > 0
+            and self.since_snapshot >= self.snapshot_every
+            and (self.snapshot_task is None or self.snapshot_task.done())
+        )
+
+    def snapshot(self, state: dict):
+        """
+        Starts compaction with state as of the last appended event. Serialized
+        now, so later state changes can't leak into it.
+        """
+        data = json.dumps({"seq": self.seq, "state": state}, ensure_ascii=False)
+        rotated = False
+        # A leftover rotated log (failed compaction) must not be overwritten; the
+        # snapshot still covers it and load() skips by seq
+        if self.file is not None and not os.path.exists(self.rotated_path):
+            try:
+                self.file.close()
+                os.replace(self.log_path, self.rotated_path)
+                rotated = True
+            except OSError as e:
+                logger.error(f"Event log rotation error: {e}")
+            self.file = None
+        self.since_snapshot = 0
+        self.snapshot_task = asyncio.create_task(asyncio.to_thread(self._write_snapshot, data, rotated))
+
+    def _write_snapshot(self, data: str, rotated: bool) -> bool:
+        try:
+            if rotated:
+                with open(self.rotated_path, "ab") as f:
+                    os.fsync(f.fileno())
+            tmp = self.snapshot_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            if os.path.exists(self.rotated_path):
+                os.remove(self.rotated_path)
+            self.snapshots += 1
+            return True
+        except OSError as e:
+            self.errors += 1
+            logger.error(f"Snapshot write error: {e}")
+            return False
+
+    async def compact(self, state: dict):
+        """
+        Snapshots state and drops both logs; for use right after recovery, before
+        any new event is appended.
+        """
+        data = json.dumps({"seq": self.seq, "state": state}, ensure_ascii=False)
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if not await asyncio.to_thread(self._write_snapshot, data, False):
+            return
+        self._remove(self.rotated_path, self.log_path)
+        self.since_snapshot = 0
+
+    async def reset(self):
+        """
+        Deletes the log and snapshot, so the next load() finds nothing; for a
+        finished or discarded interview.
+        """
+        if self.snapshot_task is not None:
+            await asyncio.gather(self.snapshot_task, return_exceptions=True)
+        self.close()
+        await asyncio.to_thread(self._remove, self.rotated_path, self.log_path, self.snapshot_path)
+        self.seq = 0
+        self.since_snapshot = 0
+
+    def _remove(self, *paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Event log cleanup error: {e}")
+
+    def close(self):
+        if self.sync_handle is not None:
+            self.sync_handle.cancel()
+            self.sync_handle = None
+        if self.file is not None:
+            try:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+            except (OSError, ValueError) as e:
+                logger.error(f"Event log close error: {e}")
+            self.file = None
+
+    def stats(self) -> dict:
+        return {
+            "seq": self.seq,
+            "appends": self.appends,
+            "fsyncs": self.syncs,
+            "snapshots": self.snapshots,
+            "errors": self.errors
+        }
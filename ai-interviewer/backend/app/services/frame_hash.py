@@ -0,0 +1,19 @@
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+def compute_phash(image_bytes: bytes):
+    """
+    Perceptual hash of an encoded image (JPEG/PNG bytes).
+    Returns None if the image can't be decoded.
+    """
+    # Imported on first use: imagehash pulls in numpy/scipy, which slows startup
+    import imagehash
+    from PIL import Image
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        return imagehash.phash(image)
+    except Exception as e:
+        logger.error(f"Error computing frame hash: {e}")
+        return None
@@ -0,0 +1,53 @@
+import base64
+import hashlib
+import io
+import logging
+from PIL import Image
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VISUAL_LOG_IMAGE_MODES = ("full", "thumbnail", "ref", "none")
+
+def frame_ref(image_bytes: bytes) -> str:
+    """
+    Content reference for a frame: hex SHA-256 of the encoded image bytes the
+    client uploaded, so it can look the frame up among the ones it kept locally.
+    """
+    return hashlib.sha256(image_bytes).hexdigest()
+
+def make_thumbnail(image_bytes: bytes, max_width: int = None, quality: int = None):
+    """
+    Small JPEG preview as a data URL, or None if the frame can't be decoded.
+    """
+    max_width = max_width or settings.THUMBNAIL_MAX_WIDTH
+    quality = quality or settings.THUMBNAIL_JPEG_QUALITY
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        image.thumbnail((max_width, max_width))
+        buf = io.BytesIO()
+        image.convert("RGB").save(buf, format="JPEG", quality=quality)
+        return "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+    except Exception as e:
+        logger.error(f"Thumbnail error: {e}")
+        return None
+
+def visual_log_image_fields(image_bytes: bytes, payload: str, mode: str = None) -> dict:
+    """
+    Image fields for a visual_log message according to VISUAL_LOG_IMAGE_MODE:
+    - full:      the uploaded frame echoed back as raw base64, no data-URL
+                 prefix (the legacy wire format)
+    - thumbnail: a small server-generated preview (data URL)
+    - ref:       a content hash the client resolves from its own frames
+    - none:      no image
+    Blocking (PIL); call via asyncio.to_thread.
+    """
+    mode = mode or settings.VISUAL_LOG_IMAGE_MODE
+    if mode == "full":
+        return {"image": payload}
+    if mode == "thumbnail":
+        return {"image": make_thumbnail(image_bytes)}
+    if mode == "ref":
+        return {"image_ref": frame_ref(image_bytes)}
+    return {}
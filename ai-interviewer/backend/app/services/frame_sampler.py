@@ -0,0 +1,135 @@
+import io
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds between vision samples on a static screen, by interview state.
+# While the candidate answers or the model is busy the slide matters less.
+STATIC_INTERVALS = {
+    "MONITORING": 6.0,
+    "QUESTIONING": 20.0,
+    "AWAITING_ANSWER": 20.0,
+    "EVALUATING": 20.0,
+}
+
+# Client capture settings the server can ask for, most to least active
+RATE_LEVELS = {
+    "active": {"fps": 1.0, "jpeg_quality": 0.7},
+    "idle": {"fps": 0.5, "jpeg_quality": 0.6},
+    "static": {"fps": 0.2, "jpeg_quality": 0.5},
+}
+
+def frame_signature(image_bytes: bytes):
+    """
+    Tiny grayscale thumbnail (32x18) used to score scene change, or None if the
+    frame can't be decoded. JPEG draft mode decodes at reduced size, so this stays
+    cheap even for full-HD frames.
+    """
+    from PIL import Image
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        image.draft("L", (160, 90))
+        return image.convert("L").resize((32, 18))
+    except Exception as e:
+        logger.error(f"Frame signature error: {e}")
+        return None
+
+def scene_change_score(a, b) -> float:
+    """Mean absolute difference of two signatures, 0.0 (same) to 1.0."""
+    from PIL import ImageChops, ImageStat
+    if a is None or b is None:
+        return 1.0
+    return ImageStat.Stat(ImageChops.difference(a, b)).mean[0] / 255
+
+class FrameSampler:
+    """
+    Per-session decision of which uploaded frames go to vision, and what capture
+    rate the client should use.
+
+    A frame is sampled when:
+    - it differs from the last *sampled* frame by SCENE_CHANGE_THRESHOLD or more
+      (slow edits accumulate until they count), no sooner than VISION_MIN_INTERVAL
+      seconds and the vision latency EWMA after the previous sample; or
+    - the screen has been static for the state's STATIC_INTERVALS refresh period.
+    Nothing is sampled while older video frames are still queued.
+
+    rate_control() picks a RATE_LEVELS entry from recent screen activity, interview
+    state and vision latency, and returns it only when it changes.
+    """
+    def __init__(self):
+        self.threshold = settings.SCENE_CHANGE_THRESHOLD
+        self.min_interval = settings.VISION_MIN_INTERVAL
+        self.previous = None
+        self.sampled = None
+        self.last_sample_at = None
+        self.last_activity_at = None
+        self.last_trigger_at = None
+        self.latency = None
+        self.level = "active"
+
+        self.frames = 0
+        self.samples = 0
+        self.skipped_backlog = 0
+
+    def observe(self, signature, now: float) -> float:
+        """Records a new frame; returns its change score vs the last sampled frame."""
+        self.frames += 1
+        # Frame-to-frame motion (typing, scrolling) counts as activity at half the threshold
+        if self.previous is None or scene_change_score(signature, self.previous) >= self.threshold / 2:
+            self.last_activity_at = now
+        self.previous = signature
+        return scene_change_score(signature, self.sampled)
+
+    def should_sample(self, change: float, state: str, backlog: int, now: float) -> bool:
+        if backlog > 0:
+            self.skipped_backlog += 1
+            return False
+        if self.last_sample_at is None:
+            return True
+        elapsed = now - self.last_sample_at
+        if change >= self.threshold:
+            return elapsed >= max(self.min_interval, self.latency or 0.0)
+        return elapsed >= STATIC_INTERVALS.get(state, 6.0)
+
+    def mark_sampled(self, signature, now: float):
+        self.sampled = signature
+        self.last_sample_at = now
+        self.samples += 1
+
+    def observe_latency(self, seconds: float):
+        self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+
+    def trigger_due(self, now: float) -> bool:
+        """MONITORING question-trigger check, every QUESTION_TRIGGER_INTERVAL seconds."""
+        if self.last_trigger_at is not None and now - self.last_trigger_at < settings.QUESTION_TRIGGER_INTERVAL:
+            return False
+        self.last_trigger_at = now
+        return True
+
+    def rate_control(self, state: str, now: float):
+        """New client capture settings, or None if the level hasn't changed."""
+        quiet = now - self.last_activity_at if self.last_activity_at is not None else 0.0
+        if quiet < settings.RATE_IDLE_AFTER:
+            level, reason = "active", "screen activity"
+        elif quiet < settings.RATE_STATIC_AFTER and state == "MONITORING":
+            level, reason = "idle", "screen idle"
+        else:
+            level, reason = "static", f"static screen while {state.lower()}"
+        # Don't upload faster than vision can keep up with
+        if level == "active" and self.latency is not None and self.latency > settings.VISION_SLOW_SECONDS:
+            level, reason = "idle", "vision latency"
+        if level == self.level:
+            return None
+        self.level = level
+        return {"level": level, "reason": reason, **RATE_LEVELS[level]}
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "samples": self.samples,
+            "skipped_backlog": self.skipped_backlog,
+            "level": self.level,
+            "vision_latency": round(self.latency, 2) if self.latency is not None else None
+        }
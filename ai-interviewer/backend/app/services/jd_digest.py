@@ -0,0 +1,93 @@
+import logging
+import re
+from app.core.keyword_matcher import keyword_matcher
+from app.core.prompt_builder import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+_BULLET = re.compile(r"^\s*(?:[-*•▪◦]|\d+[.)])\s+")
+_SENTENCE = re.compile(r"(?<=[.!?;])\s+")
+_REQUIREMENT_HINTS = (
+    "experience", "years", "must", "required", "requirement", "proficien", "knowledge",
+    "familiar", "understanding", "ability", "skills", "strong", "expert", "hands-on",
+    "responsib", "you will", "design", "build", "develop", "maintain", "degree", "plus"
+)
+_TITLE_HINTS = ("engineer", "developer", "scientist", "analyst", "architect", "intern", "lead", "manager")
+
+class JobDigest:
+    """
+    Compact, structured form of a job description, computed once when the JD arrives.
+    render() is deterministic so prompts built on it stay byte-identical across calls.
+    """
+    def __init__(self, title: str, requirements: list, keywords: list, source_chars: int):
+        self.title = title
+        self.requirements = requirements
+        self.keywords = keywords
+        self.source_chars = source_chars
+        self.text = self.render()
+        self.tokens = estimate_tokens(self.text)
+
+    def render(self) -> str:
+        lines = [f"Role: {self.title or 'Not specified'}"]
+        if self.keywords:
+            lines.append(f"Key Skills: {', '.join(self.keywords)}")
+        if self.requirements:
+            lines.append("Requirements:")
+            lines.extend(f"- {req}" for req in self.requirements)
+        return "\n".join(lines)
+
+def _candidate_lines(text: str) -> list:
+    """Bullets as-is; prose paragraphs split into sentences."""
+    out = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _BULLET.match(line):
+            out.append(_BULLET.sub("", line))
+        else:
+            out.extend(s.strip() for s in _SENTENCE.split(line) if s.strip())
+    return out
+
+def _find_title(lines: list) -> str:
+    for line in lines[:5]:
+        lowered = line.lower()
+        if len(line) <= 80 and any(hint in lowered for hint in _TITLE_HINTS):
+            return line.rstrip(":.").strip()
+    return ""
+
+def digest_job_description(text: str, max_requirements: int = 8, max_requirement_tokens: int = 30) -> JobDigest:
+    """
+    Extracts a role title, the technical keywords and the most requirement-like
+    lines of a JD (scored by requirement phrasing and keyword density, kept in
+    their original order). Local and synchronous; no LLM call.
+    """
+    lines = _candidate_lines(text or "")
+    title = _find_title(lines)
+    keywords = sorted(keyword_matcher.scan(text or ""))
+
+    scored = []
+    for index, line in enumerate(lines):
+        # Skip the title and section headers like "Requirements:"
+        if line == title or len(line) < 15 or line.endswith(":"):
+            continue
+        lowered = line.lower()
+        score = sum(1 for hint in _REQUIREMENT_HINTS if hint in lowered)
+        score += 2 * len(keyword_matcher.scan(line))
+        if score:
+            scored.append((score, index, line))
+
+    best = sorted(scored, key=lambda item: (-item[0], item[1]))[:max_requirements]
+    requirements = []
+    seen = set()
+    for _, _, line in sorted(best, key=lambda item: item[1]):
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        requirements.append(truncate_to_tokens(line, max_requirement_tokens))
+
+    digest = JobDigest(title, requirements, keywords, len(text or ""))
+    logger.info(f"JD digested: {len(text or '')} chars -> {digest.tokens} tokens "
+                f"({len(requirements)} requirements, {len(keywords)} keywords)")
+    return digest
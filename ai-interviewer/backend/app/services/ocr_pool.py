@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+from app.services.frame_hash import compute_phash
+
+logger = logging.getLogger(__name__)
+
+# --- Worker process side ---
+
+_service = None
+
+def _init_worker(languages: list, gpu: bool, torch_threads: int):
+    """Runs once per worker process: loads the EasyOCR model before any frame arrives."""
+    global _service
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+    from app.services.ocr_service import OCRService
+    _service = OCRService(languages=languages, gpu=gpu)
+
+def _ready() -> int:
+    return os.getpid()
+
+def _read_batch(frames: list) -> list:
+    """Decode + preprocess + one batched inference, all inside the worker."""
+    from app.services.ocr_service import preprocess_frame
+    images = []
+    for image_bytes in frames:
+        try:
+            images.append(preprocess_frame(image_bytes))
+        except Exception:
+            images.append(None)
+    return _service.read_batch(images)
+
+def _read_regions(regions: list) -> list:
+    """(x, y, text) lines for each grayscale region, in region coordinates."""
+    return [_service.read_lines(region) for region in regions]
+
+# --- Event loop side ---
+
+class OCRPool:
+    """
+    Async OCR facade over a process pool.
+
+    - Each worker process loads EasyOCR once at startup (start() waits for that).
+    - extract_text() never blocks the event loop: hashing runs in a thread, decoding
+      and inference in a worker process.
+    - Frames from all sessions share one queue. A batcher collects up to
+      OCR_BATCH_SIZE frames, waiting at most OCR_BATCH_WINDOW_MS after the first,
+      and sends them to a worker as a single batched inference. Up to OCR_WORKERS
+      batches are in flight at once.
+    - Duplicate suppression is per session: a frame is skipped only if it matches
+      the last frame read for the same session_id.
+    """
+    def __init__(self, workers: int, batch_size: int, batch_window_ms: int,
+                 languages: list = None, gpu: bool = False, hash_threshold: int = 5):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window_ms / 1000
+        self.languages = languages or ["en"]
+        self.gpu = gpu
+        self.hash_threshold = hash_threshold
+
+        self.executor = None
+        self.queue = None
+        self.batcher = None
+        self.slots = None
+        self.starting = asyncio.Lock()
+        self.last_hashes = {}
+
+        self.frames = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.batched_frames = 0
+        self.busy_seconds = 0.0
+
+    async def start(self):
+        async with self.starting:
+            if self.executor is None:
+                await self._start()
+
+    async def _start(self):
+        # spawn: torch/OpenMP state doesn't survive fork reliably
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.languages, self.gpu, max(1, (os.cpu_count() or 1) // self.workers))
+        )
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.workers)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        pids = await asyncio.gather(*(loop.run_in_executor(self.executor, _ready) for _ in range(self.workers)))
+        logger.info(f"OCR pool ready: {len(set(pids))} workers in {time.perf_counter() - start:.1f}s")
+        self.batcher = asyncio.create_task(self._batch_loop())
+
+    def is_duplicate(self, session_id: str, frame_hash) -> bool:
+        if session_id is None or frame_hash is None:
+            return False
+        last = self.last_hashes.get(session_id)
+        if last is not None and frame_hash - last < self.hash_threshold:
+            return True
+        self.last_hashes[session_id] = frame_hash
+        return False
+
+    def forget(self, session_id: str):
+        self.last_hashes.pop(session_id, None)
+
+    async def extract_text(self, image_bytes: bytes, session_id: str = None, frame_hash=None) -> str:
+        """
+        OCR text of an encoded frame; "" for a per-session duplicate or on error.
+        Pass session_id=None when the caller has already deduplicated, and
+        frame_hash if it has already computed the frame's pHash.
+        """
+        await self.start()
+        self.frames += 1
+        if session_id is not None:
+            if frame_hash is None:
+                frame_hash = await asyncio.to_thread(compute_phash, image_bytes)
+            if self.is_duplicate(session_id, frame_hash):
+                self.duplicates += 1
+                logger.info("Skipping duplicate frame for OCR.")
+                return ""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((image_bytes, future))
+        return await future
+
+    async def read_regions(self, regions: list) -> list:
+        """
+        Line-level OCR of already-preprocessed grayscale regions (numpy arrays),
+        all in one worker call. Returns [(x, y, text), ...] per region.
+        """
+        await self.start()
+        self.frames += 1
+        async with self.slots:
+            start = time.perf_counter()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, _read_regions, regions)
+            finally:
+                self.busy_seconds += time.perf_counter() - start
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Callers that gave up (cancelled) don't need a slot in the batch
+            batch = [(data, future) for data, future in batch if not future.done()]
+            if not batch:
+                continue
+            await self.slots.acquire()
+            asyncio.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: list):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            texts = await loop.run_in_executor(self.executor, _read_batch, [data for data, _ in batch])
+        except Exception as e:
+            logger.error(f"OCR batch error: {e}")
+            texts = [""] * len(batch)
+        finally:
+            self.slots.release()
+        self.busy_seconds += time.perf_counter() - start
+        self.batches += 1
+        self.batched_frames += len(batch)
+        for (_, future), text in zip(batch, texts):
+            if not future.done():
+                future.set_result(text)
+
+    async def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+            self.batcher = None
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "frames": self.frames,
+            "duplicates": self.duplicates,
+            "batches": self.batches,
+            "avg_batch": round(self.batched_frames / self.batches, 2) if self.batches else 0.0,
+            "queued": self.queue.qsize() if self.queue else 0
+        }
+
+_pool = None
+
+def ocr_pool() -> OCRPool:
+    """Process-wide pool; worker processes start on first use."""
+    global _pool
+    if _pool is None:
+        _pool = OCRPool(
+            workers=settings.OCR_WORKERS,
+            batch_size=settings.OCR_BATCH_SIZE,
+            batch_window_ms=settings.OCR_BATCH_WINDOW_MS,
+            languages=[lang.strip() for lang in settings.OCR_LANGUAGES.split(",") if lang.strip()],
+            gpu=settings.OCR_GPU
+        )
+    return _pool
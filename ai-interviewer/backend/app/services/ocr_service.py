@@ -1,70 +1,60 @@
-import easyocr
 import logging
 import numpy as np
-import cv2
-import imagehash
-from PIL import Image
-import io
+from app.services.frame_hash import compute_phash
 
 logger = logging.getLogger(__name__)
 
 class OCRService:
     def __init__(self, languages=['en'], gpu=False):
+        # Imported here so preprocess_frame() is usable without loading torch
+        import easyocr
         logger.info(f"Loading EasyOCR model (GPU={gpu})...")
         self.reader = easyocr.Reader(languages, gpu=gpu)
-        self.last_frame_hash = None
+        self.last_frame_hashes = {}  # session_id -> pHash of the last frame read for it
         self.hash_threshold = 5  # Difference threshold for pHash
         logger.info("EasyOCR model loaded.")
 
-    def _compute_hash(self, image: Image.Image):
-        return imagehash.phash(image)
-
-    def is_duplicate(self, image_bytes: bytes) -> bool:
+    def is_duplicate(self, image_bytes: bytes, session_id: str = "default", current_hash=None) -> bool:
         """
-        Checks if the current frame is significantly different from the last processed one.
-        Returns True if it's a duplicate (or similar enough to skip).
+        Checks if the current frame is significantly different from the last one processed
+        for the same session. Returns True if it's a duplicate (or similar enough to skip).
         """
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            current_hash = self._compute_hash(image)
-            
-            if self.last_frame_hash is None:
-                self.last_frame_hash = current_hash
+            if current_hash is None:
+                current_hash = compute_phash(image_bytes)
+            if current_hash is None:
+                return False # Process if unsure
+
+            last_hash = self.last_frame_hashes.get(session_id)
+            if last_hash is None:
+                self.last_frame_hashes[session_id] = current_hash
                 return False # First frame is never duplicate
             
-            diff = current_hash - self.last_frame_hash
+            diff = current_hash - last_hash
             if diff < self.hash_threshold:
                 return True # Duplicate
             
-            self.last_frame_hash = current_hash
+            self.last_frame_hashes[session_id] = current_hash
             return False
             
         except Exception as e:
             logger.error(f"Error in duplicate check: {e}")
             return False # Process if unsure
 
-    def extract_text(self, image_bytes: bytes) -> str:
+    def forget(self, session_id: str):
+        self.last_frame_hashes.pop(session_id, None)
+
+    def extract_text(self, image_bytes: bytes, session_id: str = "default") -> str:
         """
         Extracts text from image bytes.
         Returns a single string of combined text.
         """
         try:
-            if self.is_duplicate(image_bytes):
+            if self.is_duplicate(image_bytes, session_id):
                 logger.info("Skipping duplicate frame for OCR.")
                 return ""
 
-            # Convert bytes to numpy for OpenCV
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            # Optimization: Resize if too large (e.g. > 1000px width)
-            height, width = img.shape[:2]
-            if width > 1000:
-                scale = 1000 / width
-                img = cv2.resize(img, (1000, int(height * scale)))
-
-            # Optimization: Grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            gray = preprocess_frame(image_bytes)
 
             # EasyOCR expects bytes or numpy array
             # detail=0 returns just the list of strings
@@ -77,15 +67,64 @@ class OCRService:
                 logger.info(f"OCR Extracted: {full_text[:50]}...")
             
             return full_text
-            if full_text.strip():
-                logger.info(f"OCR Extracted: {full_text[:50]}...")
-            
-            return full_text
             
         except Exception as e:
             logger.error(f"OCR Extraction error: {e}")
             return ""
 
-# Global instance
-# Set gpu=True if CUDA is available, else False
-ocr_engine = OCRService(gpu=False)
+    def read_batch(self, images: list) -> list:
+        """
+        Text for each preprocessed (grayscale) image. Images of the same shape go
+        through EasyOCR's batched recognizer together; the rest are read one by one.
+        """
+        texts = [""] * len(images)
+        groups = {}
+        for i, img in enumerate(images):
+            if img is not None:
+                groups.setdefault(img.shape, []).append(i)
+        for indices in groups.values():
+            if len(indices) == 1:
+                results = [self.reader.readtext(images[indices[0]], detail=0, paragraph=True)]
+            else:
+                results = self.reader.readtext_batched(
+                    [images[i] for i in indices], detail=0, paragraph=True, batch_size=len(indices)
+                )
+            for i, result in zip(indices, results):
+                texts[i] = "\n".join(result)
+        return texts
+
+    def read_lines(self, image) -> list:
+        """
+        Text boxes of a preprocessed image as (x_center, y_center, text), unmerged,
+        so callers can place each line on the page.
+        """
+        lines = []
+        for box, text, confidence in self.reader.readtext(image, detail=1, paragraph=False):
+            xs = [point[0] for point in box]
+            ys = [point[1] for point in box]
+            lines.append((float(sum(xs) / 4), float(sum(ys) / 4), text))
+        return lines
+
+def preprocess_frame(image_bytes: bytes, max_width: int = 1000):
+    """
+    Decoded, downscaled (to max_width) grayscale frame, or None if it can't be decoded.
+    """
+    import cv2  # optional dependency, only needed with VISION_BACKEND=ocr
+
+    # Convert bytes to numpy for OpenCV
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+
+    # Optimization: Resize if too large (e.g. > 1000px width)
+    height, width = img.shape[:2]
+    if width > max_width:
+        scale = max_width / width
+        img = cv2.resize(img, (max_width, int(height * scale)))
+
+    # Optimization: Grayscale
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+# Models load in the worker processes of app.services.ocr_pool, not at import.
+# For in-process use: OCRService(gpu=False)
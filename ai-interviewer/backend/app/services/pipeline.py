@@ -0,0 +1,119 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.metrics import ERRORS, FRAMES, LANE_DROPS
+
+logger = logging.getLogger(__name__)
+
+AUDIO_TYPES = {"audio", "transcript_client"}
+VIDEO_TYPES = {"video"}
+# Control messages the client must hear about if they are dropped (see submit())
+CRITICAL_TYPES = {"job_description", "submit_answer", "end_session"}
+
+class MessageLane:
+    """
+    One bounded queue plus the worker task draining it.
+    put() never waits, so a slow lane can't stall the WebSocket receive loop (and
+    with it every other lane). When full, drop_oldest=True discards the oldest
+    queued item (video: a newer frame supersedes it); otherwise the incoming
+    message is dropped.
+    """
+    def __init__(self, name: str, maxsize: int, drop_oldest: bool = False):
+        self.name = name
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.drop_oldest = drop_oldest
+        self.task = None
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+
+    def put(self, message: dict) -> bool:
+        """Returns False if the message itself was dropped."""
+        if self.queue.full():
+            self.dropped += 1
+            LANE_DROPS.labels(self.name).inc()
+            if not self.drop_oldest:
+                if self.dropped == 1 or self.dropped % 100 == 0:
+                    logger.warning(f"{self.name} lane full ({self.queue.maxsize}); "
+                                   f"dropped {message.get('type')} ({self.dropped} so far)")
+                return False
+            self.queue.get_nowait()
+            self.queue.task_done()
+            if self.name == "video":
+                FRAMES.labels("dropped").inc()
+        self.queue.put_nowait(message)
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize(),
+            "maxsize": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "dropped": self.dropped
+        }
+
+class SessionPipeline:
+    """
+    Per-session message pipeline.
+    Audio, video and control messages each get their own lane and worker, so a slow
+    vision call never delays transcription or answer submission. Ordering is preserved
+    within a lane, not across lanes.
+    """
+    def __init__(self, session, handler):
+        self.session = session
+        self.handler = handler
+        self.audio = MessageLane("audio", settings.AUDIO_QUEUE_SIZE)
+        self.video = MessageLane("video", settings.VIDEO_QUEUE_SIZE, drop_oldest=True)
+        self.control = MessageLane("control", settings.CONTROL_QUEUE_SIZE)
+        self.lanes = [self.audio, self.video, self.control]
+
+    def start(self):
+        for lane in self.lanes:
+            if lane.task is None:
+                lane.task = asyncio.create_task(self._worker(lane))
+
+    def stop(self):
+        for lane in self.lanes:
+            if lane.task is not None:
+                lane.task.cancel()
+                lane.task = None
+
+    def lane_for(self, msg_type: str) -> MessageLane:
+        if msg_type in AUDIO_TYPES:
+            return self.audio
+        if msg_type in VIDEO_TYPES:
+            return self.video
+        return self.control
+
+    def submit(self, message: dict) -> bool:
+        """
+        Queues a message on its lane. Plain function: it never waits, so the receive
+        loop isn't held up by a slow lane. Returns False if the lane was full and the
+        message dropped; for CRITICAL_TYPES the caller tells the client
+        (StreamManager.dispatch), other drops are only counted.
+        """
+        msg_type = message.get("type")
+        accepted = self.lane_for(msg_type).put(message)
+        if not accepted and msg_type in CRITICAL_TYPES:
+            logger.warning(f"[{self.session.client_id}] control lane full; rejected {msg_type}")
+        return accepted
+
+    async def _worker(self, lane: MessageLane):
+        while True:
+            message = await lane.queue.get()
+            try:
+                await self.handler(self.session, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[{self.session.client_id}] {lane.name} worker error: {e}")
+                ERRORS.labels("pipeline").inc()
+            finally:
+                lane.processed += 1
+                lane.queue.task_done()
+
+    def stats(self) -> dict:
+        return {lane.name: lane.stats() for lane in self.lanes}
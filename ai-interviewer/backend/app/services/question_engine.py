@@ -1,6 +1,10 @@
 import logging
 import json
+from functools import lru_cache
 from app.core.llm_client import llm_client
+from app.core.json_stream import JSONStringFieldExtractor, parse_json_object
+from app.core.prompt_builder import PromptAssembler, estimate_tokens
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -8,60 +12,72 @@ class QuestionEngine:
     def __init__(self):
         pass
 
-    async def generate_question(self, context: dict):
+    def build_messages(self, context: dict) -> list:
         """
-        Generates a question based on the provided context.
-        Context keys: 'transcript_summary', 'keywords', 'current_slide', 'topics'
+        Chat messages for a question request.
+        Context keys: 'transcript_summary', 'keywords', 'current_slide', 'topics', 'job_digest', 'current_phase'
+
+        The system message depends only on the JD digest, so it is byte-identical for
+        every question in a session and provider-side prefix caching can reuse it.
+        Everything that changes per question goes in the user message.
         """
-        
-        system_prompt = f"""
-        You are an expert Technical Interviewer conducting a {context.get('current_phase', 'General')} round.
-        Your goal is to ask a relevant question based on the candidate's presentation AND the provided Job Description.
-        
-        Current Phase: {context.get('current_phase', 'General')}
-        Phase Strategy:
-        - Introduction: Ask about their background and the project's inspiration.
-        - Project Walkthrough: Ask about the architecture, tech stack decisions, and flow.
-        - Technical Deep Dive: Ask hard technical questions about specific code/implementation details observed.
-        - Behavioral/HR: Ask about challenges faced, conflicts, and soft skills (aligned with JD).
-        - Closing: Ask if they have questions or summary thoughts.
-        
-        Rules:
-        1. Keep the question short and conversational.
-        2. Focus strictly on the CURRENT PHASE strategy.
-        Rules:
-        1. Keep the question short and conversational.
-        2. Focus strictly on the CURRENT PHASE strategy.
-        3. START with a brief 1-sentence acknowledgment or reaction to the candidate's answer (e.g., "That makes sense.", "Interesting approach.", "I see.").
-        4. Output MUST be valid JSON with keys: "question_text", "difficulty" (Junior/Mid/Senior), "topic".
+        system_prompt = self.system_prompt(context.get('job_digest', ''))
+        phase = context.get('current_phase', 'General')
+
+        prompt = (
+            PromptAssembler(settings.QUESTION_PROMPT_TOKENS, reserved=estimate_tokens(system_prompt))
+            .add("Current Phase", phase, priority=100)
+            .add("Recent Transcript", context.get('transcript_summary', ''), priority=5, keep="tail", min_tokens=150)
+            .add("Detected Keywords", ', '.join(context.get('keywords', [])), priority=4)
+            .add("Slide Text", context.get('current_slide', ''), priority=1)
+            .add("Topics", ', '.join(context.get('topics', [])), priority=3)
+            .add("Visual Description", context.get('visual_context', ''), priority=3)
+            .add("Last Question Asked", context.get('previous_question') or 'None', priority=6)
+            .add("Candidate's Last Answer", context.get('previous_answer') or 'None', priority=6, keep="tail", min_tokens=100)
+            .add(None, f"Generate a {phase} question now.\n"
+                       "IF the valid Candidate's Last Answer is provided, you MUST ask a follow-up question digging deeper into it.",
+                 priority=100)
+            .assemble()
+        )
+        logger.info(f"Question prompt: {prompt.tokens} tokens ({prompt.tokens - estimate_tokens(prompt.text)} stable prefix)")
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt.text}
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def system_prompt(job_digest: str) -> str:
+        return f"""You are an expert Technical Interviewer.
+Your goal is to ask a relevant question based on the candidate's presentation AND the provided Job Description.
+
+Phase Strategy:
+- Introduction: Ask about their background and the project's inspiration.
+- Project Walkthrough: Ask about the architecture, tech stack decisions, and flow.
+- Technical Deep Dive: Ask hard technical questions about specific code/implementation details observed.
+- Behavioral/HR: Ask about challenges faced, conflicts, and soft skills (aligned with JD).
+- Closing: Ask if they have questions or summary thoughts.
+
+Rules:
+1. Keep the question short and conversational.
+2. Focus strictly on the strategy for the Current Phase given in the user message.
+3. START with a brief 1-sentence acknowledgment or reaction to the candidate's answer (e.g., "That makes sense.", "Interesting approach.", "I see.").
+4. Output MUST be valid JSON with keys: "question_text", "difficulty" (Junior/Mid/Senior), "topic".
+
+Job Description (digest):
+{job_digest or 'Not Provided'}
+"""
+
+    async def generate_question(self, context: dict, hedge: bool = True):
         """
-        
-        jd_text = context.get('job_description', 'Not Provided')
-        
-        user_prompt = f"""
-        Job Description:
-        {jd_text[:1000]}... (Truncated)
-        
-        Current Context:
-        - Recent Transcript: {context.get('transcript_summary', '')}
-        - Detected Keywords: {', '.join(context.get('keywords', []))}
-        - Slide Text: {context.get('current_slide', '')[:500]}...
-        - Topics: {', '.join(context.get('topics', []))}
-        - Visual Description: {context.get('visual_context', '')}
-        
-        Last Question Asked: {context.get('previous_question', 'None')}
-        Candidate's Last Answer: {context.get('previous_answer', 'None')}
-        
-        Generate a {context.get('current_phase', 'General')} question now.
-        IF the valid Candidate's Last Answer is provided, you MUST ask a follow-up question digging deeper into it.
+        Generates a question based on the provided context.
+        hedge=False for background work nobody is waiting on.
         """
-
         logger.info("Requesting Question from LLM...")
         response_json_str = await llm_client.get_chat_completion(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+            messages=self.build_messages(context),
+            hedge=hedge
         )
         
         if response_json_str:
@@ -74,4 +90,38 @@ class QuestionEngine:
                 return None
         return None
 
+
+    async def generate_question_stream(self, context: dict, on_delta, on_discard=None):
+        """
+        Streaming variant of generate_question.
+        Calls `await on_delta(text)` with each new piece of "question_text" as it is
+        generated, and returns the complete parsed question dict (or None).
+        Falls back to the non-streaming path if the stream produced nothing, broke
+        off or wasn't valid JSON; `await on_discard()` is called first if deltas
+        had already been sent, so the client can drop the partial text.
+        """
+        logger.info("Streaming Question from LLM...")
+        extractor = JSONStringFieldExtractor("question_text")
+        parts = []
+        sent = False
+        try:
+            async for chunk in llm_client.stream_chat_completion(self.build_messages(context)):
+                parts.append(chunk)
+                delta = extractor.feed(chunk)
+                if delta:
+                    sent = True
+                    await on_delta(delta)
+            if parts:
+                data = parse_json_object("".join(parts))
+                logger.info(f"Generated Question: {data}")
+                return data
+        except json.JSONDecodeError:
+            logger.error("Failed to parse streamed LLM JSON response; retrying without streaming")
+        except Exception as e:
+            logger.error(f"Question stream failed ({e}); retrying without streaming")
+        if sent and on_discard is not None:
+            await on_discard()
+        # The candidate is waiting on this question: hedge the retry
+        return await self.generate_question(context, hedge=True)
+
 question_engine = QuestionEngine()
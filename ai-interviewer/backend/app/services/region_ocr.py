@@ -0,0 +1,130 @@
+import asyncio
+import logging
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.ocr_service import preprocess_frame
+
+logger = logging.getLogger(__name__)
+
+class RegionOCR:
+    """
+    Per-session incremental OCR driven by tile-level frame differencing.
+
+    The preprocessed (grayscale, <=1000 px wide) frame is split into tiles of
+    OCR_TILE_WIDTH x OCR_TILE_HEIGHT. A tile has changed when more than
+    OCR_TILE_CHANGE_RATIO of its pixels moved by more than OCR_PIXEL_DELTA grey
+    levels, which ignores JPEG noise but catches a typed character.
+
+    Text is cached per tile row. Changed rows are merged into horizontal bands,
+    padded by half a row so a text line on a band edge isn't cut, and only those
+    bands go through OCR; each recognized line is assigned to the row holding its
+    centre. The slide text is rebuilt from the row cache. A first frame, a new
+    resolution or a change covering more than OCR_FULL_REFRESH_RATIO of the
+    tiles (a slide switch) re-reads the whole frame.
+    """
+    def __init__(self, pool):
+        self.pool = pool
+        self.tile_w = settings.OCR_TILE_WIDTH
+        self.tile_h = settings.OCR_TILE_HEIGHT
+        self.pixel_delta = settings.OCR_PIXEL_DELTA
+        self.tile_change_ratio = settings.OCR_TILE_CHANGE_RATIO
+        self.full_refresh_ratio = settings.OCR_FULL_REFRESH_RATIO
+
+        self.previous = None
+        self.rows = []  # tile row -> [(x, text), ...]
+
+        self.frames = 0
+        self.unchanged = 0
+        self.full_reads = 0
+        self.partial_reads = 0
+        self.pixels_read = 0
+        self.pixels_seen = 0
+
+    def changed_tiles(self, gray: np.ndarray) -> np.ndarray:
+        """Boolean (rows, cols) grid of changed tiles vs the previous frame."""
+        h, w = gray.shape
+        rows, cols = -(-h // self.tile_h), -(-w // self.tile_w)
+        moved = np.abs(gray.astype(np.int16) - self.previous.astype(np.int16)) > self.pixel_delta
+        padded = np.zeros((rows * self.tile_h, cols * self.tile_w), dtype=np.uint8)
+        padded[:h, :w] = moved
+        counts = padded.reshape(rows, self.tile_h, cols, self.tile_w).sum(axis=(1, 3))
+        return counts > self.tile_change_ratio * self.tile_h * self.tile_w
+
+    def bands(self, changed_rows: np.ndarray) -> list:
+        """Runs of consecutive changed tile rows as (first_row, last_row)."""
+        out = []
+        for row in np.flatnonzero(changed_rows):
+            if out and row == out[-1][1] + 1:
+                out[-1] = (out[-1][0], row)
+            else:
+                out.append((row, row))
+        return out
+
+    def text(self) -> str:
+        lines = []
+        for row in self.rows:
+            if row:
+                lines.append(" ".join(text for _, text in sorted(row)))
+        return "\n".join(lines)
+
+    def _place(self, lines: list, y_offset: int, first_row: int, last_row: int):
+        for row in range(first_row, last_row + 1):
+            self.rows[row] = []
+        for x, y, text in lines:
+            row = int((y + y_offset) // self.tile_h)
+            if first_row <= row <= last_row:
+                self.rows[row].append((x, text))
+
+    async def extract_text(self, image_bytes: bytes):
+        """
+        Full slide text after this frame, or None if nothing changed.
+        """
+        gray = await asyncio.to_thread(preprocess_frame, image_bytes)
+        if gray is None:
+            return None
+        self.frames += 1
+        self.pixels_seen += gray.size
+        n_rows = -(-gray.shape[0] // self.tile_h)
+
+        if self.previous is None or self.previous.shape != gray.shape:
+            changed = None
+        else:
+            changed = await asyncio.to_thread(self.changed_tiles, gray)
+            if not changed.any():
+                self.unchanged += 1
+                return None
+
+        if changed is None or changed.mean() > self.full_refresh_ratio:
+            self.rows = [[] for _ in range(n_rows)]
+            [lines] = await self.pool.read_regions([gray])
+            self._place(lines, 0, 0, n_rows - 1)
+            self.full_reads += 1
+            self.pixels_read += gray.size
+        else:
+            bands = self.bands(changed.any(axis=1))
+            pad = self.tile_h // 2
+            regions, spans = [], []
+            for first, last in bands:
+                top = max(0, first * self.tile_h - pad)
+                bottom = min(gray.shape[0], (last + 1) * self.tile_h + pad)
+                regions.append(gray[top:bottom])
+                spans.append((top, first, last))
+                self.pixels_read += regions[-1].size
+            results = await self.pool.read_regions(regions)
+            for lines, (top, first, last) in zip(results, spans):
+                self._place(lines, top, first, last)
+            self.partial_reads += 1
+
+        self.previous = gray
+        return self.text()
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "unchanged": self.unchanged,
+            "full_reads": self.full_reads,
+            "partial_reads": self.partial_reads,
+            "pixels_read_ratio": round(self.pixels_read / self.pixels_seen, 3) if self.pixels_seen else 0.0
+        }
@@ -1,6 +1,8 @@
 import logging
 import json
 from app.core.llm_client import llm_client
+from app.core.prompt_builder import PromptAssembler, estimate_tokens
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -19,20 +21,23 @@ class ReportGenerator:
         Returns: Markdown string
         """
         
-        q_a_history = ""
+        q_a_items = []
         total_score = 0
         count = 0
         
         for item in session_data.get("q_and_a", []):
-            q_a_history += f"""
-            Q: {item['question']}
-            A: {item['answer']}
-            Score: {item['score']}/10
-            Feedback: {item['feedback']}
-            ---
-            """
-            total_score += item.get('score', 0)
-            count += 1
+            score = item.get('score')
+            q_a_items.append(
+                f"Q: {item['question']}\n"
+                f"A: {item['answer']}\n"
+                f"Score: {score if score is not None else 'N/A'}/10\n"
+                f"Feedback: {item['feedback']}\n"
+                "---"
+            )
+            # Evaluation may still be pending for the last answer
+            if isinstance(score, (int, float)):
+                total_score += score
+                count += 1
             
         avg_score = round(total_score / count, 1) if count > 0 else 0
 
@@ -60,26 +65,29 @@ class ReportGenerator:
         (What exactly should they study next? Be specific.)
         """
         
-        user_prompt = f"""
-        Candidate Context:
-        - Detected Tech Stack: {', '.join(session_data.get('keywords', []))}
-        - Session Transcript Summary: {session_data.get('transcript_summary', '')}
-        
-        Q&A History:
-        {q_a_history}
-        
-        Average Technical Score: {avg_score}/10
-        
-        Generate the report now.
-        """
+        assembler = (
+            PromptAssembler(settings.REPORT_PROMPT_TOKENS, reserved=estimate_tokens(system_prompt))
+            .add("Candidate Context - Detected Tech Stack", ', '.join(session_data.get('keywords', [])), priority=3)
+            .add("Session Transcript Summary", session_data.get('transcript_summary', ''), priority=1, keep="tail")
+            .add(None, "Q&A History:", priority=100)
+        )
+        # Every answer keeps its question, score and the start of the answer
+        for q_a in q_a_items:
+            assembler.add(None, q_a, priority=5, min_tokens=60)
+        prompt = (
+            assembler
+            .add("Average Technical Score", f"{avg_score}/10", priority=100)
+            .add(None, "Generate the report now.", priority=100)
+            .assemble()
+        )
+        logger.info(f"Report prompt: {prompt.tokens} tokens")
 
         logger.info("Requesting Report from LLM...")
         report_md = await llm_client.get_chat_completion(
             messages=[
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "user", "content": prompt.text}
             ],
-            model="llama-3.3-70b-versatile",
             json_mode=False # Request raw Markdown
         )
         
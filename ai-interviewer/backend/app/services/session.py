@@ -0,0 +1,338 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from enum import Enum
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.services.context_engine import ContextEngine
+from app.services.vision_cache import VisionCache
+from app.services.event_log import EventLog
+from app.services.frame_sampler import FrameSampler
+from app.services.ocr_pool import ocr_pool
+from app.services.speculation import SpeculativeQuestioner
+from app.services.question_engine import question_engine
+
+logger = logging.getLogger(__name__)
+
+class InterviewState(str, Enum):
+    MONITORING = "MONITORING"
+    QUESTIONING = "QUESTIONING"
+    AWAITING_ANSWER = "AWAITING_ANSWER"
+    EVALUATING = "EVALUATING"
+
+INTERVIEW_PHASES = ["Introduction", "Project Walkthrough", "Technical Deep Dive", "Behavioral/HR", "Closing"]
+
+PHASE_LIMITS = {
+    "Introduction": 1,
+    "Project Walkthrough": 2,
+    "Technical Deep Dive": 3,
+    "Behavioral/HR": 2,
+    "Closing": 1
+}
+
+def session_file_path(directory: str, client_id: str, suffix: str):
+    """
+    Per-session file under directory (None if directory is unset), with the
+    client_id reduced to filesystem-safe characters.
+    """
+    if not directory:
+        return None
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", client_id)
+    return os.path.join(directory, safe_id + suffix)
+
+class InterviewSession:
+    """
+    All mutable state of a single interview.
+    One instance per client_id, so concurrent candidates never share a state machine.
+    """
+    def __init__(self, client_id: str, websocket: WebSocket = None):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.context_engine = ContextEngine(spill_path=session_file_path(settings.TRANSCRIPT_SPILL_DIR, client_id, ".jsonl"))
+        self.vision_cache = VisionCache()
+        self.last_visual_key = None
+        # Incremental OCR state (app.services.region_ocr.RegionOCR), VISION_BACKEND=ocr only
+        self.region_ocr = None
+
+        self.frame_count = 0
+        self.frame_sampler = FrameSampler()
+        self.state = InterviewState.MONITORING
+        self.last_asked_question = None
+        self.current_answer_buffer = ""
+        self.session_history = []
+        # Issued to the client when the interview starts ("reset" event); a reconnect
+        # must present it to resume, so a new interview never inherits an old one
+        self.resume_token = None
+        # Report of the interview that ended on this connection, resent for a repeated
+        # end_session (its state is gone by then) until the next interview starts
+        self.last_report = None
+
+        # Interview Phase Management
+        self.interview_phases = INTERVIEW_PHASES
+        self.current_phase_index = 0
+        self.questions_asked_in_phase = 0
+        self.PHASE_LIMITS = PHASE_LIMITS
+
+        # Background drafts of the next question while the candidate answers
+        self.speculator = SpeculativeQuestioner(
+            lambda ctx: question_engine.generate_question(ctx, hedge=False)
+        )
+        # One question generation at a time: the video lane's MONITORING trigger and the
+        # control lane can both ask. generation changes on every reset, so a question
+        # generated for an interview that has since been reset is dropped.
+        self.question_lock = asyncio.Lock()
+        self.generation = 0
+
+        # Set by StreamManager on connect (app.services.pipeline.SessionPipeline)
+        self.pipeline = None
+
+        # Local streaming recognizer, created on first audio when ASR_BACKEND=local
+        self.asr = None
+        # Silence gate / utterance coalescer in front of Groq transcription
+        self.speech_gate = None
+
+        # Bytes sent to the client, total and per message type
+        self.egress_bytes = 0
+        self.egress_by_type = {}
+
+        # Session store bookkeeping (app.services.session_store): version last
+        # loaded/saved, unsaved changes, and whether another worker has taken over
+        self.store_version = 0
+        self.dirty = False
+        self.superseded = False
+        self.store_task = None
+
+        # Durable record of state changes (see record()), when EVENT_LOG_DIR is set
+        base_path = session_file_path(settings.EVENT_LOG_DIR, client_id, "")
+        self.event_log = EventLog(
+            base_path,
+            fsync_interval=settings.EVENT_LOG_FSYNC_MS / 1000,
+            snapshot_every=settings.EVENT_LOG_SNAPSHOT_EVERY
+        ) if base_path else None
+
+    @property
+    def current_phase(self) -> str:
+        return self.interview_phases[self.current_phase_index]
+
+    def phase_after_answer(self):
+        """
+        (phase_index, questions_asked_in_phase, interview_complete) once the
+        current question has been answered. Pure; see advance_phase().
+        """
+        limit = self.PHASE_LIMITS.get(self.current_phase, 2)
+        if self.questions_asked_in_phase >= limit:
+            if self.current_phase_index < len(self.interview_phases) - 1:
+                return self.current_phase_index + 1, 0, False
+            return self.current_phase_index, self.questions_asked_in_phase, True
+        return self.current_phase_index, self.questions_asked_in_phase, False
+
+    def advance_phase(self) -> bool:
+        """
+        Applies phase_after_answer(). Returns True when the interview is complete.
+        """
+        index, asked, complete = self.phase_after_answer()
+        if index != self.current_phase_index:
+            logger.info(f"[{self.client_id}] Advancing Phase to: {self.interview_phases[index]}")
+        self.current_phase_index, self.questions_asked_in_phase = index, asked
+        return complete
+
+    def record(self, event_type: str, **data):
+        """
+        Applies a state change and appends it to the event log. Every change that
+        should survive a reconnect or restart goes through here, so live updates
+        and replay share apply().
+        """
+        event = {"type": event_type, "at": time.time(), **data}
+        self.apply(event)
+        self.dirty = True
+        if self.event_log is not None:
+            self.event_log.append(event)
+            if self.event_log.snapshot_due():
+                self.event_log.snapshot(self.snapshot())
+
+    def reset(self, resume_token: str = None):
+        """Back to a blank interview, before its job description (see the "reset" event)."""
+        self.speculator.cancel()
+        self.generation += 1
+        self.resume_token = resume_token
+        self.last_report = None
+        self.state = InterviewState.MONITORING
+        self.last_asked_question = None
+        self.current_answer_buffer = ""
+        self.session_history = []
+        self.current_phase_index = 0
+        self.questions_asked_in_phase = 0
+        self.context_engine.reset()
+
+    def apply(self, event: dict):
+        kind = event["type"]
+        if kind == "reset":
+            self.reset(event["token"])
+        elif kind == "state":
+            self.state = InterviewState(event["state"])
+        elif kind == "transcript":
+            self.context_engine.update_transcript(event["text"], event["at"])
+        elif kind == "answer":
+            self.current_answer_buffer += " " + event["text"]
+        elif kind == "visual":
+            self.context_engine.update_visuals(event["text"])
+        elif kind == "job_description":
+            self.context_engine.set_job_description(event["text"])
+        elif kind == "question":
+            self.last_asked_question = event["text"]
+            self.current_answer_buffer = ""
+            self.current_phase_index = event["phase_index"]
+            self.questions_asked_in_phase = event["asked"]
+        elif kind == "answer_submitted":
+            self.session_history.append({"question": event["question"], "answer": event["answer"], "score": None, "feedback": None})
+            self.advance_phase()
+        elif kind == "evaluation":
+            self.session_history[event["index"]].update(score=event["score"], feedback=event["feedback"])
+        elif kind == "evaluation_failed":
+            del self.session_history[event["index"]]
+        else:
+            logger.warning(f"[{self.client_id}] Unknown session event: {kind}")
+
+    def history_index(self, entry: dict):
+        """Position of this exact entry object in session_history, or None."""
+        return next((i for i, e in enumerate(self.session_history) if e is entry), None)
+
+    def snapshot(self) -> dict:
+        return {
+            "resume_token": self.resume_token,
+            "state": self.state.value,
+            "last_asked_question": self.last_asked_question,
+            "current_answer_buffer": self.current_answer_buffer,
+            "session_history": self.session_history,
+            "current_phase_index": self.current_phase_index,
+            "questions_asked_in_phase": self.questions_asked_in_phase,
+            "context": self.context_engine.snapshot()
+        }
+
+    def restore(self, state: dict):
+        self.resume_token = state.get("resume_token")
+        self.state = InterviewState(state["state"])
+        self.last_asked_question = state["last_asked_question"]
+        self.current_answer_buffer = state["current_answer_buffer"]
+        self.session_history = state["session_history"]
+        self.current_phase_index = state["current_phase_index"]
+        self.questions_asked_in_phase = state["questions_asked_in_phase"]
+        self.context_engine.restore(state["context"])
+
+    async def resume(self, shared_state: dict = None, resume_token: str = None) -> bool:
+        """
+        Rebuilds state from shared_state (the session store's copy, which wins:
+        another worker may have served this client since) or else from the event
+        log (latest snapshot + newer events), then compacts the log.
+        Returns True if there was a previous session to resume. A saved session
+        whose resume token isn't resume_token is not resumed, and its log is deleted.
+        """
+        start = time.perf_counter()
+        state, events = shared_state, []
+        if self.event_log is not None:
+            logged_state, logged_events = await asyncio.to_thread(self.event_log.load)
+            if state is None:
+                state, events = logged_state, logged_events
+        if state is None and not events:
+            return False
+        saved_token = state.get("resume_token") if state is not None else None
+        for event in events:
+            if event["type"] == "reset":
+                saved_token = event["token"]
+        if resume_token is None or saved_token != resume_token:
+            logger.info(f"[{self.client_id}] Saved session belongs to another interview; starting fresh")
+            if self.event_log is not None:
+                await self.event_log.reset()
+            return False
+        self.context_engine.transcript.replaying = True
+        try:
+            if state is not None:
+                self.restore(state)
+            for event in events:
+                self.apply(event)
+        finally:
+            self.context_engine.transcript.replaying = False
+        # A question or evaluation in flight when the old connection died is lost
+        if self.state in (InterviewState.QUESTIONING, InterviewState.EVALUATING):
+            self.state = InterviewState.MONITORING
+        if self.event_log is not None:
+            await self.event_log.compact(self.snapshot())
+        source = "session store" if shared_state is not None else "event log"
+        logger.info(f"[{self.client_id}] Resumed from {source}: {len(events)} events replayed "
+                    f"in {time.perf_counter() - start:.3f}s")
+        return True
+
+    async def send_json(self, data: dict):
+        if self.websocket is None:
+            return
+        # Serialize here (as Starlette's send_json does) so egress can be measured
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        size = len(text.encode("utf-8"))
+        self.egress_bytes += size
+        msg_type = data.get("type", "unknown")
+        self.egress_by_type[msg_type] = self.egress_by_type.get(msg_type, 0) + size
+        await self.websocket.send_text(text)
+
+    def close(self):
+        self.speculator.cancel()
+        if self.store_task is not None:
+            self.store_task.cancel()
+        if self.event_log is not None:
+            self.event_log.close()
+        self.context_engine.transcript.close()
+        if self.asr is not None:
+            self.asr.close()
+        if self.speech_gate is not None:
+            self.speech_gate.close()
+        if settings.VISION_BACKEND == "ocr":
+            ocr_pool().forget(self.client_id)
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+
+class SessionRegistry:
+    """
+    Maps client_id -> InterviewSession.
+    All access happens on the worker's event loop, so plain dict operations are safe
+    without locking; nothing here awaits between lookup and mutation.
+    """
+    def __init__(self):
+        self.sessions: dict[str, InterviewSession] = {}
+
+    def attach(self, client_id: str, websocket: WebSocket) -> InterviewSession:
+        """
+        Returns the session for client_id, creating it if needed, and binds it to websocket.
+        A reconnect with the same client_id takes over the existing session.
+        """
+        session = self.sessions.get(client_id)
+        if session is None:
+            session = InterviewSession(client_id, websocket)
+            self.sessions[client_id] = session
+            logger.info(f"Session created: {client_id}")
+        else:
+            session.websocket = websocket
+            logger.info(f"Session re-attached: {client_id}")
+        return session
+
+    def detach(self, client_id: str, websocket: WebSocket):
+        """
+        Drops the session, unless another socket has already taken it over.
+        """
+        session = self.sessions.get(client_id)
+        if session is not None and session.websocket is websocket:
+            del self.sessions[client_id]
+            session.close()
+            logger.info(f"Session closed: {client_id}")
+
+    def get(self, client_id: str):
+        return self.sessions.get(client_id)
+
+    def __iter__(self):
+        return iter(list(self.sessions.values()))
+
+    def __len__(self):
+        return len(self.sessions)
@@ -0,0 +1,123 @@
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.core.resp import RespClient
+
+logger = logging.getLogger(__name__)
+
+class MemorySessionStore:
+    """
+    Session snapshots in this process only (a single uvicorn worker).
+    Same contract as RedisSessionStore:
+    - load(client_id) -> (version, state or None)
+    - save(client_id, state, version) -> new version, or None if the stored
+      version is no longer `version` (another connection saved in between)
+    """
+    def __init__(self, ttl_seconds: int = 6 * 3600):
+        self.ttl = ttl_seconds
+        self.items = {}  # client_id -> (version, serialized state, expires_at)
+        self.loads = 0
+        self.saves = 0
+        self.conflicts = 0
+
+    def _prune(self, now: float):
+        for client_id in [k for k, (_, _, expires_at) in self.items.items() if expires_at <= now]:
+            del self.items[client_id]
+
+    async def load(self, client_id: str):
+        self.loads += 1
+        version, data, expires_at = self.items.get(client_id, (0, None, 0))
+        if data is None or expires_at <= time.monotonic():
+            return 0, None
+        return version, json.loads(data)
+
+    async def save(self, client_id: str, state: dict, version: int):
+        now = time.monotonic()
+        current, _, expires_at = self.items.get(client_id, (0, None, 0))
+        if expires_at <= now:
+            current = 0
+        if current != version:
+            self.conflicts += 1
+            return None
+        self.items[client_id] = (version + 1, json.dumps(state, ensure_ascii=False), now + self.ttl)
+        self.saves += 1
+        if self.saves % 100 == 0:
+            self._prune(now)
+        return version + 1
+
+    async def delete(self, client_id: str):
+        self.items.pop(client_id, None)
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "sessions": len(self.items), "loads": self.loads, "saves": self.saves, "conflicts": self.conflicts}
+
+class RedisSessionStore:
+    """
+    Session snapshots in a Redis-protocol server shared by every worker and node,
+    so a reconnect can land anywhere.
+
+    Each session is a hash {version, state} that expires after ttl_seconds of no
+    saves. save() is an optimistic compare-and-set: WATCH the key, check the
+    version is still the one this worker loaded or last wrote, then HSET + EXPIRE
+    in MULTI/EXEC. EXEC fails if anyone wrote the key after WATCH, so two workers
+    can never both advance the same version.
+    """
+    def __init__(self, url: str, ttl_seconds: int = 6 * 3600, prefix: str = "interview:session:"):
+        self.client = RespClient(url)
+        self.ttl = ttl_seconds
+        self.prefix = prefix
+        self.loads = 0
+        self.saves = 0
+        self.conflicts = 0
+
+    async def load(self, client_id: str):
+        self.loads += 1
+        version, data = await self.client.execute("HMGET", self.prefix + client_id, "version", "state")
+        if data is None:
+            return 0, None
+        return int(version), json.loads(data)
+
+    async def save(self, client_id: str, state: dict, version: int):
+        key = self.prefix + client_id
+        data = json.dumps(state, ensure_ascii=False)
+        async with self.client.connection() as conn:
+            await conn.execute("WATCH", key)
+            current = await conn.execute("HGET", key, "version")
+            if int(current or 0) != version:
+                await conn.execute("UNWATCH")
+                self.conflicts += 1
+                return None
+            await conn.execute("MULTI")
+            await conn.execute("HSET", key, "version", version + 1, "state", data)
+            await conn.execute("EXPIRE", key, self.ttl)
+            if await conn.execute("EXEC") is None:
+                self.conflicts += 1
+                return None
+        self.saves += 1
+        return version + 1
+
+    async def delete(self, client_id: str):
+        await self.client.execute("DEL", self.prefix + client_id)
+
+    async def close(self):
+        await self.client.close()
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "loads": self.loads, "saves": self.saves, "conflicts": self.conflicts}
+
+_store = None
+
+def session_store():
+    """The process-wide store selected by SESSION_STORE, created on first use."""
+    global _store
+    if _store is None:
+        if settings.SESSION_STORE == "redis":
+            _store = RedisSessionStore(settings.REDIS_URL, settings.SESSION_TTL_SECONDS)
+        else:
+            _store = MemorySessionStore(settings.SESSION_TTL_SECONDS)
+    return _store
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+class SpeculativeQuestioner:
+    """
+    Drafts the next question in the background while the candidate is still answering.
+
+    Every time the answer buffer grows, any older draft is cancelled and a new one is
+    scheduled after a short debounce, so drafting happens in the pauses between
+    utterances rather than on every word. On submit, take() hands back the draft
+    task if it was built from exactly the submitted answer.
+    """
+    def __init__(self, generate):
+        self.generate = generate  # async (ctx: dict) -> question dict | None
+        self.task = None
+        self.basis = None
+        self.expedite = None
+        self.drafts = 0
+        self.used = 0
+        self.cancelled = 0
+
+    def update(self, basis: str, build_context):
+        """
+        basis: the answer text so far. build_context: () -> question context dict,
+        called when the draft actually starts so it sees the latest visuals.
+        """
+        if len(basis.strip()) < settings.SPECULATION_MIN_CHARS:
+            return
+        self.cancel()
+        self.basis = basis
+        self.expedite = asyncio.Event()
+        self.task = asyncio.create_task(self._draft(build_context, self.expedite))
+
+    async def _draft(self, build_context, expedite: asyncio.Event):
+        try:
+            await asyncio.wait_for(expedite.wait(), timeout=settings.SPECULATION_DEBOUNCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self.drafts += 1
+        try:
+            return await self.generate(build_context())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Speculative draft failed: {e}")
+            return None
+
+    def take(self, answer: str):
+        """
+        Returns the draft task for this exact answer (possibly still running), or None.
+        Any draft built from a different answer is cancelled.
+        """
+        task, basis = self.task, self.basis
+        self.task, self.basis = None, None
+        if task is None:
+            return None
+        if _normalize(basis) == _normalize(answer) and not task.cancelled():
+            self.used += 1
+            self.expedite.set()  # skip whatever is left of the debounce
+            return task
+        task.cancel()
+        self.cancelled += 1
+        return None
+
+    def cancel(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            self.cancelled += 1
+        self.task, self.basis = None, None
+
+    def stats(self) -> dict:
+        return {
+            "drafts": self.drafts,
+            "used": self.used,
+            "cancelled": self.cancelled
+        }
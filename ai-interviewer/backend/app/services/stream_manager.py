@@ -1,293 +1,674 @@
-import base64
+import asyncio
 import json
 import logging
 import os
-from enum import Enum
+import secrets
+import time
 from fastapi import WebSocket, WebSocketDisconnect
 
 # from app.services.transcription import transcriber # Removed local transcriber
-# from app.services.ocr_service import ocr_engine # Replaced by Molmo2-8B Vision
-from app.services.context_engine import context_engine
+# from app.services.ocr_service import ocr_engine # Replaced by Molmo2-8B Vision (VISION_BACKEND=ocr uses ocr_pool)
+from app.services.session import InterviewSession, InterviewState, SessionRegistry
+from app.services.pipeline import CRITICAL_TYPES, SessionPipeline
+from app.services.session_store import session_store
+from app.services.audio_gate import SpeechGate
+from app.services.audio_frontend import SAMPLE_RATE
+from app.services.streaming_asr import StreamingTranscriber, local_asr_engine
+from app.services.frame_hash import compute_phash
+from app.services.frame_sampler import frame_signature
+from app.services.ocr_pool import ocr_pool
+from app.services.region_ocr import RegionOCR
+from app.services.frame_preview import visual_log_image_fields
 from app.services.question_engine import question_engine
 from app.services.evaluation_engine import evaluation_engine
 from app.services.report_generator import report_generator
+from app.core.config import settings
 from app.core.llm_client import llm_client
-
-def log_debug(msg):
-    try:
-        # Use a safe absolute path or just current dir if writable
-        path = "a:/Navgurukul/ai-interviewer/backend/debug_final.log"
-        with open(path, "a") as f:
-            f.write(msg + "\n")
-    except Exception as e:
-        pass
+from app.core.metrics import CACHE_LOOKUPS, ERRORS, FRAMES, MESSAGE_SECONDS, MESSAGES, STAGE_SECONDS, metrics
+from app.core.protocol import ProtocolError, decode_frame, payload_base64, payload_bytes
 
 logger = logging.getLogger(__name__)
 
-class InterviewState(str, Enum):
-    MONITORING = "MONITORING"         
-    QUESTIONING = "QUESTIONING"       
-    AWAITING_ANSWER = "AWAITING_ANSWER" 
-    EVALUATING = "EVALUATING"         
+# Client message types with their own metric label; anything else counts as "other"
+MESSAGE_TYPES = {"audio", "transcript_client", "video", "job_description", "submit_answer", "end_session",
+                 "trigger_question"}
 
 class StreamManager:
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
-        self.frame_count = 0 
-        self.state = InterviewState.MONITORING
-        self.last_asked_question = None
-        self.current_answer_buffer = "" 
-        self.session_history = [] 
-        
-        # Interview Phase Management
-        self.interview_phases = ["Introduction", "Project Walkthrough", "Technical Deep Dive", "Behavioral/HR", "Closing"]
-        self.current_phase_index = 0
-        self.questions_asked_in_phase = 0
-        self.PHASE_LIMITS = {
-            "Introduction": 1,
-            "Project Walkthrough": 2,
-            "Technical Deep Dive": 3,
-            "Behavioral/HR": 2,
-            "Closing": 1
-        } 
-
-    async def connect(self, websocket: WebSocket):
+        self.sessions = SessionRegistry()
+
+    async def connect(self, websocket: WebSocket, client_id: str, resume_token: str = None) -> InterviewSession:
+        """
+        Binds websocket to client_id's session. Only a reconnect presenting the
+        session's resume token continues it; otherwise a new interview starts and
+        its token is sent in a session_started message.
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
-        await self.send_state_update(websocket)
-        logger.info(f"Client connected. Total clients: {len(self.active_connections)}")
+        existing = self.sessions.get(client_id)
+        if existing is not None and existing.resume_token != resume_token:
+            # Not a reconnect of this interview: the newer connection starts afresh
+            old_socket = existing.websocket
+            self.sessions.detach(client_id, old_socket)
+            if old_socket is not None:
+                try:
+                    await old_socket.close(code=4000)
+                except Exception:
+                    pass
+        session = self.sessions.attach(client_id, websocket)
+        resumed = started = False
+        if session.pipeline is None:
+            session.pipeline = SessionPipeline(session, self.handle_message)
+            session.pipeline.start()
+            # New in this worker: pick up where a dropped connection, a restart or
+            # another worker left off
+            shared_state = None
+            try:
+                session.store_version, shared_state = await session_store().load(client_id)
+            except Exception as e:
+                logger.error(f"[{client_id}] Session store load failed: {e}")
+            resumed = await session.resume(shared_state, resume_token)
+            if not resumed:
+                session.record("reset", token=secrets.token_urlsafe(16))
+                started = True
+            # Claim it now, so a worker still holding the old connection loses its next save
+            session.dirty = True
+            await self.save_session(session)
+            session.store_task = asyncio.create_task(self.store_loop(session))
+        await self.send_state_update(session)
+        if started:
+            await session.send_json({"type": "session_started", "resume_token": session.resume_token})
+        if resumed:
+            await session.send_json({
+                "type": "session_resumed",
+                "question": session.last_asked_question if session.state == InterviewState.AWAITING_ANSWER else None,
+                "answered": len(session.session_history)
+            })
+        logger.info(f"Client connected: {client_id}. Total sessions: {len(self.sessions)}")
+        return session
+
+    async def disconnect(self, websocket: WebSocket, client_id: str):
+        session = self.sessions.get(client_id)
+        if session is not None and session.websocket is websocket:
+            await self.save_session(session)
+        self.sessions.detach(client_id, websocket)
+        logger.info(f"Client disconnected: {client_id}. Total sessions: {len(self.sessions)}")
+
+    async def save_session(self, session: InterviewSession) -> bool:
+        """
+        Writes the session snapshot to the session store if anything changed.
+        Returns False once another worker has saved a newer version (the client
+        reconnected there), after which this copy is never saved again.
+        """
+        if session.superseded:
+            return False
+        if not session.dirty:
+            return True
+        session.dirty = False
+        try:
+            version = await session_store().save(session.client_id, session.snapshot(), session.store_version)
+        except Exception as e:
+            session.dirty = True
+            logger.error(f"[{session.client_id}] Session store save failed: {e}")
+            return True
+        if version is None:
+            session.superseded = True
+            logger.warning(f"[{session.client_id}] Session taken over by another worker; closing this connection")
+            return False
+        session.store_version = version
+        return True
+
+    async def store_loop(self, session: InterviewSession):
+        while True:
+            await asyncio.sleep(settings.SESSION_STORE_SAVE_SECONDS)
+            if not await self.save_session(session):
+                if session.websocket is not None:
+                    # 4000: application-defined; the newer connection owns the interview
+                    await session.websocket.close(code=4000)
+                return
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        logger.info(f"Client disconnected. Total clients: {len(self.active_connections)}")
+    async def end_interview(self, session: InterviewSession):
+        """
+        Forgets a finished interview: its stored snapshot, event log and state,
+        so nothing carries over to the next interview on this client_id.
+        Only its report is kept (session.last_report, set by the caller).
+        """
+        session.reset(session.resume_token)
+        session.dirty = False
+        if session.event_log is not None:
+            await session.event_log.reset()
+        try:
+            await session_store().delete(session.client_id)
+            session.store_version = 0
+        except Exception as e:
+            logger.error(f"[{session.client_id}] Session store delete failed: {e}")
 
-    async def send_state_update(self, websocket: WebSocket):
-        await websocket.send_json({
+    async def send_state_update(self, session: InterviewSession):
+        await session.send_json({
             "type": "state_update",
-            "state": self.state
+            "state": session.state
+        })
+
+    async def transition_to(self, new_state: InterviewState, session: InterviewSession):
+        logger.info(f"[{session.client_id}] State Transition: {session.state} -> {new_state}")
+        session.record("state", state=new_state.value)
+        await self.send_state_update(session)
+
+    def question_context(self, session: InterviewSession, previous_question=None, previous_answer=None, phase_index=None) -> dict:
+        ctx = session.context_engine.get_context()
+        if phase_index is None:
+            phase_index = session.current_phase_index
+        ctx["current_phase"] = session.interview_phases[phase_index]
+        if previous_question:
+            ctx["previous_question"] = previous_question
+            ctx["previous_answer"] = previous_answer or ""
+        return ctx
+
+    def append_answer(self, session: InterviewSession, text: str):
+        """
+        Adds transcript text to the answer buffer and re-drafts the next question speculatively.
+        """
+        session.record("answer", text=text)
+        basis = session.current_answer_buffer
+        question = session.last_asked_question
+        # The draft is for the phase we'll be in once this answer is submitted
+        phase_index, _, complete = session.phase_after_answer()
+        if not complete:
+            session.speculator.update(
+                basis, lambda: self.question_context(session, question, basis, phase_index)
+            )
+
+    async def send_question(self, session: InterviewSession, q_data: dict):
+        session.record(
+            "question",
+            text=q_data.get("question_text"),
+            phase_index=session.current_phase_index,
+            asked=session.questions_asked_in_phase + 1
+        )
+        await session.send_json({
+            "type": "question",
+            "payload": q_data
+        })
+        await self.transition_to(InterviewState.AWAITING_ANSWER, session)
+
+    async def submit_answer(self, session: InterviewSession, answer_text: str, overlap: bool = None):
+        """
+        Grades the answer and asks the next question.
+        With overlap (OVERLAP_EVALUATION), evaluation and next-question generation run
+        concurrently and whichever finishes first is pushed first. The phase advance
+        doesn't depend on the evaluation, so it is decided before either starts.
+        """
+        if overlap is None:
+            overlap = settings.OVERLAP_EVALUATION
+        generation = session.generation
+        await self.transition_to(InterviewState.EVALUATING, session)
+        question_text = session.last_asked_question
+        draft_task = session.speculator.take(answer_text)
+        ctx = session.context_engine.get_context()
+
+        # Reserve the history slot now so entries stay in question order even if
+        # the evaluation lands after the candidate has moved on.
+        _, _, complete = session.phase_after_answer()
+        session.record("answer_submitted", question=question_text, answer=answer_text)
+        entry = session.session_history[-1]
+        if complete:
+            logger.debug("Interview Complete. Ending Session.")
+            # Could auto-trigger end_session here
+            if draft_task:
+                draft_task.cancel()
+            await self.evaluate_into(session, entry, ctx)
+            await self.transition_to(InterviewState.MONITORING, session)
+            return
+
+        async with session.question_lock:
+            if not overlap:
+                await self.evaluate_into(session, entry, ctx)
+                await self.transition_to(InterviewState.QUESTIONING, session)
+                q_data = await self.next_question(session, question_text, answer_text, draft_task)
+                await self.deliver_question(session, q_data, generation)
+                return
+
+            eval_task = asyncio.create_task(self.evaluate_into(session, entry, ctx))
+            question_task = asyncio.create_task(self.next_question(session, question_text, answer_text, draft_task))
+            try:
+                done, _ = await asyncio.wait({eval_task, question_task}, return_when=asyncio.FIRST_COMPLETED)
+                if question_task in done:
+                    await self.deliver_question(session, question_task.result(), generation)
+                    await eval_task
+                else:
+                    await self.transition_to(InterviewState.QUESTIONING, session)
+                    await self.deliver_question(session, await question_task, generation)
+            finally:
+                eval_task.cancel()
+                question_task.cancel()
+
+    async def evaluate_into(self, session: InterviewSession, entry: dict, ctx: dict):
+        with STAGE_SECONDS.labels("evaluation").time():
+            eval_data = await evaluation_engine.evaluate_answer(entry["question"], entry["answer"], ctx)
+        index = session.history_index(entry)
+        if not eval_data:
+            if index is not None:
+                session.record("evaluation_failed", index=index)
+            return
+        if index is not None:
+            session.record("evaluation", index=index, score=eval_data.get("score"), feedback=eval_data.get("feedback"))
+        await session.send_json({
+            "type": "evaluation",
+            "payload": eval_data
         })
 
-    async def transition_to(self, new_state: InterviewState, websocket: WebSocket):
-        logger.info(f"State Transition: {self.state} -> {new_state}")
-        self.state = new_state
-        await self.send_state_update(websocket)
+    async def next_question(self, session: InterviewSession, question_text: str, answer_text: str, draft_task=None):
+        """
+        The speculative draft if one was built from this answer, else a fresh streamed generation.
+        """
+        if draft_task:
+            try:
+                q_data = await draft_task
+            except asyncio.CancelledError:
+                q_data = None
+            if q_data:
+                logger.debug("Using speculative question draft")
+                return q_data
+        ctx = self.question_context(session, question_text, answer_text)
+        return await self.stream_question(session, ctx)
+
+    async def ask_question(self, session: InterviewSession, make_context):
+        """
+        Generates and sends a question outside the answer flow (the MONITORING
+        trigger, trigger_question), under the session's question lock.
+        """
+        generation = session.generation
+        async with session.question_lock:
+            if generation != session.generation:
+                return
+            await self.transition_to(InterviewState.QUESTIONING, session)
+            q_data = await self.stream_question(session, make_context())
+            await self.deliver_question(session, q_data, generation)
+
+    async def deliver_question(self, session: InterviewSession, q_data, generation: int = None):
+        if generation is not None and generation != session.generation:
+            # Generated for an interview that has since been reset (new JD / end_session)
+            logger.info(f"[{session.client_id}] Dropping a question generated before a reset")
+            return
+        if q_data:
+            await self.send_question(session, q_data)
+        else:
+            await self.transition_to(InterviewState.MONITORING, session)
+
+    async def stream_question(self, session: InterviewSession, ctx: dict):
+        """
+        Generates the next question, pushing question_delta messages as the
+        question text streams in. The caller sends the final "question" message.
+        """
+        async def send_delta(delta: str):
+            await session.send_json({
+                "type": "question_delta",
+                "delta": delta
+            })
+
+        async def discard_deltas():
+            # The stream failed part-way; the question will come from a fresh generation
+            await session.send_json({"type": "question_reset"})
+        with STAGE_SECONDS.labels("question").time():
+            return await question_engine.generate_question_stream(ctx, send_delta, discard_deltas)
+
+    async def describe_frame(self, session: InterviewSession, image_bytes: bytes, payload: str):
+        """
+        Vision description for a frame, gated by perceptual hash
+        (or, for region-of-change OCR, by tile differencing).
+        Returns None when the screen hasn't changed since the last described frame,
+        the cached description when it matches an earlier frame, and otherwise
+        calls the vision model and caches the result.
+        """
+        if settings.VISION_BACKEND == "ocr" and settings.OCR_REGION_MODE:
+            # Tile differencing replaces the pHash gate: partial edits aren't missed
+            if session.region_ocr is None:
+                session.region_ocr = RegionOCR(ocr_pool())
+            return await session.region_ocr.extract_text(image_bytes)
+
+        frame_hash = await asyncio.to_thread(compute_phash, image_bytes)
+        if frame_hash is not None:
+            cached = session.vision_cache.lookup(frame_hash)
+            CACHE_LOOKUPS.labels("vision", "miss" if cached is None else "hit").inc()
+            if cached is not None:
+                key, description = cached
+                if key == session.last_visual_key:
+                    logger.debug("Vision gate: unchanged screen, skipping")
+                    return None
+                logger.debug("Vision gate: reusing cached description")
+                session.last_visual_key = key
+                return description
+
+        if settings.VISION_BACKEND == "ocr":
+            # Local OCR pool; it also skips a repeat of the last frame this session had
+            # read (e.g. a blank screen, whose empty text the cache above doesn't keep)
+            description = await ocr_pool().extract_text(image_bytes, session_id=session.client_id, frame_hash=frame_hash)
+        else:
+            # Use LLM Vision (OpenRouter / Molmo2-8B)
+            logger.debug(f"Sending frame to Vision Model... ({len(payload)} bytes)")
+            description = await llm_client.analyze_image(payload)
+        if frame_hash is not None and description and description.strip():
+            session.last_visual_key = session.vision_cache.store(frame_hash, description)
+        return description
+
+    async def enqueue(self, session: InterviewSession, data: str):
+        """
+        Parses a raw WebSocket text frame and hands it to the session pipeline.
+        """
+        try:
+            message = json.loads(data)
+        except json.JSONDecodeError:
+            logger.error("Failed to decode JSON message")
+            return
+        await self.dispatch(session, message)
+
+    async def enqueue_binary(self, session: InterviewSession, frame: bytes):
+        """
+        Parses a binary media frame (see app.core.protocol) and hands it to the session pipeline.
+        """
+        try:
+            message = decode_frame(frame)
+        except ProtocolError as e:
+            logger.error(f"Invalid binary frame: {e}")
+            return
+        await self.dispatch(session, message)
+
+    async def dispatch(self, session: InterviewSession, message: dict):
+        if session.pipeline is not None:
+            if not session.pipeline.submit(message) and message.get("type") in CRITICAL_TYPES:
+                # Not processed: let the client retry rather than wait forever
+                await session.send_json({"type": "error", "code": "busy", "message_type": message.get("type")})
+        else:
+            await self.handle_message(session, message)
 
-    async def process_message(self, websocket: WebSocket, data: str):
+    async def process_message(self, session: InterviewSession, data: str):
+        """
+        Parses and handles a message inline, bypassing the pipeline.
+        """
         try:
-            log_debug(f"Processing message: {data[:50]}...")
             message = json.loads(data)
+        except json.JSONDecodeError:
+            logger.error("Failed to decode JSON message")
+            return
+        await self.handle_message(session, message)
+
+    async def local_asr(self, session: InterviewSession) -> StreamingTranscriber:
+        if session.asr is None:
+            async def on_result(text, is_final, segment_id):
+                if is_final:
+                    await self.on_transcript(session, text, segment_id=segment_id)
+                else:
+                    await session.send_json({
+                        "type": "transcript",
+                        "text": text,
+                        "is_final": False,
+                        "segment_id": segment_id
+                    })
+            # Normally already loaded by the startup warm-up
+            engine = await asyncio.to_thread(local_asr_engine)
+            session.asr = StreamingTranscriber(engine, on_result)
+        return session.asr
+
+    def speech_gate(self, session: InterviewSession) -> SpeechGate:
+        if session.speech_gate is None:
+            async def on_segment(audio_bytes, filename):
+                text = await self.transcribe(audio_bytes, filename)
+                logger.debug(f"Transcription result: {text}")
+                if text:
+                    await self.on_transcript(session, text)
+            session.speech_gate = SpeechGate(on_segment)
+        return session.speech_gate
+
+    async def transcribe(self, audio_bytes: bytes, filename: str = "audio.webm", pcm: bool = False):
+        with STAGE_SECONDS.labels("transcription").time():
+            return await llm_client.transcribe_audio(audio_bytes, filename=filename, pcm=pcm,
+                                                     sample_rate=SAMPLE_RATE if pcm else None)
+
+    async def on_transcript(self, session: InterviewSession, text: str, timestamp=None, segment_id=None):
+        """
+        A final piece of server-side transcription: context, answer buffer,
+        client echo and the spoken "done" trigger.
+        """
+        session.record("transcript", text=text)
+        
+        if session.state == InterviewState.AWAITING_ANSWER:
+            self.append_answer(session, text)
+        
+        message = {
+            "type": "transcript",
+            "text": text,
+            "timestamp": timestamp
+        }
+        if segment_id is not None:
+            message.update(is_final=True, segment_id=segment_id)
+        await session.send_json(message)
+        
+        # Voice Trigger for "Done"
+        trigger_phrases = ["done with", "next question", "finished answer", "that's my answer"]
+        if any(phrase in text.lower() for phrase in trigger_phrases):
+            logger.debug(f"Voice Trigger Detected: {text}")
+            # Mimic submit_answer payload
+            await self.dispatch(session, {
+                "type": "submit_answer", 
+                "payload": session.current_answer_buffer
+            })
+
+    async def handle_message(self, session: InterviewSession, message: dict):
+        label = message.get("type") if message.get("type") in MESSAGE_TYPES else "other"
+        MESSAGES.labels(label).inc()
+        handle_start = time.perf_counter()
+        try:
             msg_type = message.get("type")
+            logger.debug(f"Processing message: {msg_type}")
             
             if msg_type == "audio":
-                payload = message.get("payload")
-                if payload:
-                    if "," in payload:
-                        payload = payload.split(",")[1]
-                    audio_bytes = base64.b64decode(payload)
-                    log_debug(f"Received audio: {len(audio_bytes)} bytes")
+                audio_bytes = payload_bytes(message)
+                if audio_bytes:
+                    logger.debug(f"Received audio: {len(audio_bytes)} bytes")
+
+                    if settings.ASR_BACKEND == "local":
+                        # Streaming recognizer; hypotheses arrive asynchronously via local_asr()
+                        await (await self.local_asr(session)).feed(audio_bytes, message.get("pcm", False))
+                        return
+                    
+                    if settings.AUDIO_GATE_ENABLED:
+                        # Silence dropped, speech uploaded once per utterance
+                        await self.speech_gate(session).feed(audio_bytes, message.get("pcm", False))
+                        return
                     
-                    # Use Groq API (Async)
-                    text = await llm_client.transcribe_audio(audio_bytes)
-                    log_debug(f"Transcription result: {text}")
+                    # Remote transcription per chunk
+                    text = await self.transcribe(audio_bytes, pcm=message.get("pcm", False))
+                    logger.debug(f"Transcription result: {text}")
                     
                     if text:
-                        context_engine.update_transcript(text)
-                        
-                        if self.state == InterviewState.AWAITING_ANSWER:
-                            self.current_answer_buffer += " " + text
-                        
-                        await websocket.send_json({
-                            "type": "transcript",
-                            "text": text,
-                            "timestamp": message.get("timestamp")
-                        })
-                        
-                        # Voice Trigger for "Done"
-                        trigger_phrases = ["done with", "next question", "finished answer", "that's my answer"]
-                        if any(phrase in text.lower() for phrase in trigger_phrases):
-                            log_debug(f"Voice Trigger Detected: {text}")
-                            # Mimic submit_answer payload
-                            await self.process_message(websocket, json.dumps({
-                                "type": "submit_answer", 
-                                "payload": self.current_answer_buffer
-                            }))
+                        await self.on_transcript(session, text, message.get("timestamp"))
 
             elif msg_type == "transcript_client":
                 text = message.get("payload")
-                log_debug(f"Received Client Transcript: {text}")
+                logger.debug(f"Received Client Transcript: {text}")
                 
                 if text:
-                    context_engine.update_transcript(text)
+                    session.record("transcript", text=text)
                     
-                    if self.state == InterviewState.AWAITING_ANSWER:
-                        self.current_answer_buffer += " " + text
+                    if session.state == InterviewState.AWAITING_ANSWER:
+                        self.append_answer(session, text)
                     
                     # Voice Trigger for "Done"
                     trigger_phrases = ["done with", "next question", "finished answer", "that's my answer"]
                     if any(phrase in text.lower() for phrase in trigger_phrases):
-                        log_debug(f"Voice Trigger Detected (Client): {text}")
+                        logger.debug(f"Voice Trigger Detected (Client): {text}")
                         # Mimic submit_answer payload
-                        await self.process_message(websocket, json.dumps({
+                        await self.dispatch(session, {
                             "type": "submit_answer", 
-                            "payload": self.current_answer_buffer
-                        }))
+                            "payload": session.current_answer_buffer
+                        })
 
             elif msg_type == "video":
-                self.frame_count += 1
-                # Process every 3 frames (approx 3 seconds) -> faster feedback
-                if self.frame_count % 3 == 0: 
-                    print(f"DEBUG: Processing Video Frame #{self.frame_count}")
-                    payload = message.get("payload")
+                session.frame_count += 1
+                sampler = session.frame_sampler
+                image_bytes = payload_bytes(message)
+                if image_bytes:
+                    now = time.monotonic()
+                    signature = await asyncio.to_thread(frame_signature, image_bytes)
+                    change = sampler.observe(signature, now)
+                    backlog = session.pipeline.video.queue.qsize() if session.pipeline else 0
+                    sample = sampler.should_sample(change, session.state, backlog, now)
+                else:
+                    sample = False
+
+                FRAMES.labels("processed" if sample else "skipped").inc()
+                if sample:
+                    sampler.mark_sampled(signature, now)
+                    payload = payload_base64(message)
                     if payload:
-                        if "," in payload:
-                            payload = payload.split(",")[1]
-                        
-                        # Use LLM Vision (OpenRouter / Molmo2-8B)
-                        log_debug(f"Sending frame to Vision Model... ({len(payload)} bytes)")
-                        extracted_text = await llm_client.analyze_image(payload)
+                        start = time.perf_counter()
+                        extracted_text = await self.describe_frame(session, image_bytes, payload)
+                        elapsed = time.perf_counter() - start
+                        sampler.observe_latency(elapsed)
+                        STAGE_SECONDS.labels("vision").observe(elapsed)
                         
                         if extracted_text and extracted_text.strip():
-                            log_debug(f"Vision Description: {extracted_text[:50]}...")
-                            context_engine.update_visuals(extracted_text)
+                            logger.debug(f"Vision Description: {extracted_text[:50]}...")
+                            session.record("visual", text=extracted_text)
                             
-                            await websocket.send_json({
+                            image_fields = await asyncio.to_thread(
+                                visual_log_image_fields, image_bytes, payload
+                            )
+                            await session.send_json({
                                 "type": "visual_log",
                                 "text": f"Visual Context: {extracted_text[:100]}...", 
                                 "description": extracted_text, 
-                                "image": payload, 
+                                **image_fields,
                                 "timestamp": message.get("timestamp")
                             })
 
-                if self.state == InterviewState.MONITORING:
-                    # Check for context update every 5 seconds
-                    if self.frame_count % 5 == 0: 
-                         ctx = context_engine.get_context()
+                rate = sampler.rate_control(session.state, time.monotonic())
+                if rate:
+                    logger.debug(f"Rate control: {rate}")
+                    await session.send_json({"type": "rate_control", **rate})
+
+                # Skipped while another question is being generated (e.g. trigger_question)
+                if session.state == InterviewState.MONITORING and not session.question_lock.locked():
+                    # Check for context update every QUESTION_TRIGGER_INTERVAL seconds
+                    if sampler.trigger_due(time.monotonic()): 
+                         ctx = session.context_engine.get_context()
                          # Trigger if we have enough context (visuals or audio)
                          if ctx["keywords"] or ctx["transcript_summary"] or ctx.get("visual_context"):
-                             await self.transition_to(InterviewState.QUESTIONING, websocket)
-                             
-                             # Get Current Phase
-                             current_phase = self.interview_phases[self.current_phase_index]
-                             ctx["current_phase"] = current_phase
-                             
                              # Inject Previous Answer for continuity
-                             if self.session_history:
-                                 last_entry = self.session_history[-1]
-                                 ctx["previous_answer"] = last_entry.get("answer", "")
-                                 ctx["previous_question"] = last_entry.get("question", "")
-                             
-                             q_data = await question_engine.generate_question(ctx)
-                             if q_data:
-                                 self.questions_asked_in_phase += 1
-                             if q_data:
-                                 self.last_asked_question = q_data.get("question_text")
-                                 self.current_answer_buffer = "" 
-                                 await websocket.send_json({
-                                    "type": "question",
-                                    "payload": q_data
-                                 })
-                                 await self.transition_to(InterviewState.AWAITING_ANSWER, websocket)
-                             else:
-                                 await self.transition_to(InterviewState.MONITORING, websocket)
+                             previous_question, previous_answer = None, None
+                             if session.session_history:
+                                 last_entry = session.session_history[-1]
+                                 previous_question = last_entry.get("question", "")
+                                 previous_answer = last_entry.get("answer", "")
+                             await self.ask_question(
+                                 session, lambda: self.question_context(session, previous_question, previous_answer)
+                             )
 
             elif msg_type == "job_description":
                 text = message.get("payload")
                 if text:
-                    context_engine.set_job_description(text)
-                    log_debug(f"JD Set via WebSocket: {len(text)} chars")
+                    # A new job description starts a new interview on this connection
+                    session.record("reset", token=session.resume_token)
+                    session.record("job_description", text=text)
+                    logger.debug(f"JD Set via WebSocket: {len(text)} chars")
                     
                     # Trigger Greeting (Intro Phase)
                     greeting = "System checks complete. Audio and Video streams are active. I have reviewed the job description. Let's begin the interview. Please start by introducing yourself and your project."
-                    await self.transition_to(InterviewState.AWAITING_ANSWER, websocket)
-                    self.last_asked_question = greeting
-                    self.current_answer_buffer = ""
-                    # Reset Phase
-                    self.current_phase_index = 0
-                    self.questions_asked_in_phase = 1 # Greeting counts as 1
+                    await self.transition_to(InterviewState.AWAITING_ANSWER, session)
+                    # Reset Phase; the greeting counts as question 1
+                    session.record("question", text=greeting, phase_index=0, asked=1)
                     
-                    await websocket.send_json({
+                    await session.send_json({
                         "type": "question",
                         "payload": {"question_text": greeting, "difficulty": "Intro", "topic": "Introduction"}
                     })
 
             elif msg_type == "submit_answer":
-                if self.state == InterviewState.AWAITING_ANSWER and self.last_asked_question:
-                    await self.transition_to(InterviewState.EVALUATING, websocket)
-                    answer_text = message.get("payload") or self.current_answer_buffer
-                    ctx = context_engine.get_context()
-                    eval_data = await evaluation_engine.evaluate_answer(self.last_asked_question, answer_text, ctx)
-                    
-                    if eval_data:
-                        self.session_history.append({
-                            "question": self.last_asked_question,
-                            "answer": answer_text,
-                            "score": eval_data.get("score"),
-                            "feedback": eval_data.get("feedback")
-                        })
-                        await websocket.send_json({
-                            "type": "evaluation",
-                            "payload": eval_data
-                        })
-                        
-                    # Advance Phase Logic
-                    current_phase = self.interview_phases[self.current_phase_index]
-                    limit = self.PHASE_LIMITS.get(current_phase, 2)
-                    
-                    if self.questions_asked_in_phase >= limit:
-                        if self.current_phase_index < len(self.interview_phases) - 1:
-                            self.current_phase_index += 1
-                            self.questions_asked_in_phase = 0
-                            log_debug(f"Advancing Phase to: {self.interview_phases[self.current_phase_index]}")
-                        else:
-                            log_debug("Interview Complete. Ending Session.")
-                            # Could auto-trigger end_session here
-                            
-                    await self.transition_to(InterviewState.MONITORING, websocket)
+                if session.state == InterviewState.AWAITING_ANSWER and session.last_asked_question:
+                    answer_text = message.get("payload") or session.current_answer_buffer
+                    await self.submit_answer(session, answer_text)
 
             elif msg_type == "end_session":
-                log_debug("Received end_session")
+                logger.debug("Received end_session")
+                if session.last_report is not None:
+                    await session.send_json({"type": "report", "payload": session.last_report})
+                    return
+                report = None
                 try:
-                    ctx = context_engine.get_context()
+                    ctx = session.context_engine.get_context()
                     session_data = {
                         "transcript_summary": ctx.get("transcript_summary", ""),
                         "keywords": list(ctx.get("keywords", [])),
-                        "q_and_a": self.session_history
+                        "q_and_a": session.session_history
                     }
-                    log_debug("Calling Report Generator...")
-                    report = await report_generator.generate_report(session_data)
-                    log_debug(f"Report Generated ({len(report) if report else 0} chars)")
+                    logger.debug("Calling Report Generator...")
+                    with STAGE_SECONDS.labels("report").time():
+                        report = await report_generator.generate_report(session_data)
+                    logger.debug(f"Report Generated ({len(report) if report else 0} chars)")
                     
                     if report:
-                        await websocket.send_json({
+                        await session.send_json({
                             "type": "report",
                             "payload": report
                         })
-                        log_debug("Report Sent to Client")
+                        logger.debug("Report Sent to Client")
                     else:
-                        log_debug("Report generation returned None")
+                        logger.debug("Report generation returned None")
                 except Exception as e:
-                    log_debug(f"Error generating report: {e}")
                     logger.error(f"Report Error: {e}")
+                    ERRORS.labels("report").inc()
+                if report:
+                    await self.end_interview(session)
+                    session.last_report = report
 
             elif msg_type == "trigger_question":
-                 print("DEBUG: Received trigger_question")
-                 await self.transition_to(InterviewState.QUESTIONING, websocket)
-                 ctx = context_engine.get_context()
-                 q_data = await question_engine.generate_question(ctx)
-                 if q_data:
-                    self.last_asked_question = q_data.get("question_text")
-                    self.current_answer_buffer = ""
-                    await websocket.send_json({
-                        "type": "question",
-                        "payload": q_data
-                    })
-                    print("DEBUG: Question Sent")
-                    await self.transition_to(InterviewState.AWAITING_ANSWER, websocket)
+                 await self.ask_question(session, session.context_engine.get_context)
 
-        except json.JSONDecodeError:
-            logger.error("Failed to decode JSON message")
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
-            log_debug(f"DEBUG Error: {e}")
+            ERRORS.labels("handle_message").inc()
+        finally:
+            MESSAGE_SECONDS.labels(label).observe(time.perf_counter() - handle_start)
+
+    def collect_metrics(self) -> list:
+        """Scrape-time gauges (see app.core.metrics.MetricsRegistry)."""
+        depths = []
+        if settings.METRICS_PER_SESSION:
+            for session in self.sessions:
+                if session.pipeline:
+                    depths += [((session.client_id, lane.name), lane.queue.qsize()) for lane in session.pipeline.lanes]
+        breakers = [((name, capability), 1 if health.breaker.state != "closed" else 0)
+                    for (name, capability), health in llm_client.router.health.items()]
+        return [
+            ("interview_active_sessions", "gauge", "Connected interview sessions.", (), [((), len(self.sessions))]),
+            ("interview_queue_depth", "gauge", "Messages waiting in a session's pipeline lane.",
+             ("session", "lane"), depths),
+            ("interview_provider_breaker_open", "gauge", "1 while a backend's circuit breaker is open or half-open.",
+             ("backend", "capability"), breakers)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "active_sessions": len(self.sessions),
+            "llm_cache": llm_client.cache.stats() if llm_client.cache else {},
+            "session_store": session_store().stats(),
+            "providers": llm_client.router.stats(),
+            "ocr": ocr_pool().stats() if settings.VISION_BACKEND == "ocr" else {},
+            "sessions": {
+                session.client_id: {
+                    "queues": session.pipeline.stats() if session.pipeline else {},
+                    "vision_cache": session.vision_cache.stats(),
+                    "event_log": session.event_log.stats() if session.event_log else {},
+                    "frame_sampler": session.frame_sampler.stats(),
+                    "region_ocr": session.region_ocr.stats() if session.region_ocr else {},
+                    "speculation": session.speculator.stats(),
+                    "asr": session.asr.stats() if session.asr else {},
+                    "speech_gate": session.speech_gate.stats() if session.speech_gate else {},
+                    "egress_bytes": session.egress_bytes,
+                    "egress_by_type": session.egress_by_type
+                }
+                for session in self.sessions
+            }
+        }
 
 manager = StreamManager()
+metrics.register_collector(manager.collect_metrics)
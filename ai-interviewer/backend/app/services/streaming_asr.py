@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.services.audio_frontend import SAMPLE_RATE, AudioRingBuffer, SpeechSegmenter, decode_audio
+
+logger = logging.getLogger(__name__)
+
+class LocalASREngine:
+    """
+    faster-whisper behind a small thread pool.
+
+    CTranslate2 releases the GIL during inference and the model is loaded with
+    num_workers=ASR_WORKERS, so up to that many sessions decode in parallel on
+    one shared copy of the weights while the event loop keeps running.
+    """
+    def __init__(self, model_size: str, device: str, compute_type: str, workers: int):
+        from app.services.transcription import TranscriptionService
+        self.service = TranscriptionService(model_size=model_size, device=device, compute_type=compute_type,
+                                            num_workers=workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr")
+        self.decode_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    async def transcribe(self, samples, initial_prompt: str = None, beam_size: int = 5) -> str:
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        text = await loop.run_in_executor(
+            self.executor, self.service.transcribe_pcm, samples, initial_prompt, beam_size
+        )
+        self.decode_seconds += time.perf_counter() - start
+        self.audio_seconds += len(samples) / SAMPLE_RATE
+        return text
+
+    def stats(self) -> dict:
+        return {
+            "audio_seconds": round(self.audio_seconds, 1),
+            "decode_seconds": round(self.decode_seconds, 1),
+            "rtf": round(self.decode_seconds / self.audio_seconds, 3) if self.audio_seconds else None
+        }
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def local_asr_engine() -> LocalASREngine:
+    """Process-wide engine, loaded on first use (blocking; call from a thread)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalASREngine(settings.ASR_MODEL_SIZE, settings.ASR_DEVICE, settings.ASR_COMPUTE_TYPE,
+                                     settings.ASR_WORKERS)
+    return _engine
+
+class StreamingTranscriber:
+    """
+    Per-session streaming recognizer.
+
+    Audio goes into a ring buffer and through the speech segmenter. While an
+    utterance is in progress, the last ASR_WINDOW_SECONDS of it are re-decoded
+    every ASR_PARTIAL_INTERVAL_SECONDS (greedy) and reported as a partial
+    hypothesis. When the utterance ends, or reaches ASR_MAX_UTTERANCE_SECONDS,
+    it is decoded in full (beam search) and reported as final.
+
+    on_result(text, is_final, segment_id) is awaited for every hypothesis. Finals
+    are delivered in order; a partial that arrives after its segment was
+    finalized is dropped, and at most one partial decode is in flight.
+    """
+    def __init__(self, engine: LocalASREngine, on_result):
+        self.engine = engine
+        self.on_result = on_result
+        self.ring = AudioRingBuffer(settings.ASR_RING_SECONDS)
+        self.segmenter = SpeechSegmenter(hangover_ms=settings.VAD_HANGOVER_MS)
+        self.partial_interval = int(settings.ASR_PARTIAL_INTERVAL_SECONDS * SAMPLE_RATE)
+        self.window = int(settings.ASR_WINDOW_SECONDS * SAMPLE_RATE)
+        self.max_utterance = int(settings.ASR_MAX_UTTERANCE_SECONDS * SAMPLE_RATE)
+
+        self.segment_id = 0
+        self.last_partial_end = 0
+        self.partial_task = None
+        self.final_chain = None
+        self.context = ""  # last final text, passed as Whisper's initial prompt
+        self.tasks = set()
+        self.partials = 0
+        self.finals = 0
+
+    async def feed(self, audio_bytes: bytes, pcm: bool = False):
+        try:
+            samples = await asyncio.to_thread(decode_audio, audio_bytes, SAMPLE_RATE, pcm)
+        except ValueError as e:
+            # No decoder state to continue from (e.g. a headerless webm chunk); skip it
+            logger.debug(f"Undecodable audio chunk skipped: {e}")
+            return
+        if not len(samples):
+            return
+        self.ring.append(samples)
+
+        for start, end in self.segmenter.feed(samples):
+            self._finalize(start, end)
+
+        start = self.segmenter.speech_start
+        if start is None:
+            return
+        end = self.ring.end
+        if end - start >= self.max_utterance:
+            # Long monologue: commit what we have and keep going
+            self._finalize(*self.segmenter.split(end))
+        elif end - self.last_partial_end >= self.partial_interval and self.partial_task is None:
+            self.last_partial_end = end
+            self.partial_task = self._spawn(self._partial(self.segment_id, max(start, end - self.window), end))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def _finalize(self, start: int, end: int):
+        segment_id = self.segment_id
+        self.segment_id += 1
+        self.last_partial_end = end
+        samples = self.ring.read(start, end)
+        self.final_chain = self._spawn(self._final(self.final_chain, segment_id, samples))
+
+    async def _partial(self, segment_id: int, start: int, end: int):
+        try:
+            text = await self.engine.transcribe(self.ring.read(start, end), self.context, beam_size=1)
+            if text and segment_id == self.segment_id:
+                self.partials += 1
+                await self.on_result(text, False, segment_id)
+        except Exception as e:
+            logger.error(f"Partial transcription error: {e}")
+        finally:
+            self.partial_task = None
+
+    async def _final(self, previous, segment_id: int, samples):
+        text = ""
+        try:
+            text = await self.engine.transcribe(samples, self.context)
+        except Exception as e:
+            logger.error(f"Final transcription error: {e}")
+        if previous is not None:
+            # Deliver finals in segment order even if a later one decoded faster
+            await asyncio.gather(previous, return_exceptions=True)
+        if text:
+            self.context = text
+            self.finals += 1
+            try:
+                await self.on_result(text, True, segment_id)
+            except Exception as e:
+                logger.error(f"Transcript delivery error: {e}")
+
+    def close(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "buffered_seconds": round((self.ring.end - self.ring.start) / SAMPLE_RATE, 1),
+            "partials": self.partials,
+            "finals": self.finals,
+            **self.segmenter.stats()
+        }
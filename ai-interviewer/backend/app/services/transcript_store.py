@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+
+from app.core.prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+class TranscriptSegment:
+    __slots__ = ("timestamp", "text")
+
+    def __init__(self, timestamp: float, text: str):
+        self.timestamp = timestamp
+        self.text = text
+
+    def to_dict(self) -> dict:
+        return {"timestamp": self.timestamp, "text": self.text}
+
+def _tail_words(text: str, max_tokens: int) -> str:
+    """The last whole words of text within an estimated token budget."""
+    words = []
+    used = 0
+    for word in reversed(text.split()):
+        used += estimate_tokens(word)
+        if used > max_tokens:
+            break
+        words.append(word)
+    words.reverse()
+    return " ".join(words)
+
+class TranscriptStore:
+    """
+    Bounded window of timestamped transcript segments.
+
+    append() is O(1) amortized; once the window exceeds max_segments or max_chars the
+    oldest segments are evicted (and appended to spill_path as JSON lines, if set), so
+    memory per session stays flat however long the interview runs.
+
+    While `replaying` is set (a session being rebuilt from a snapshot or event log)
+    evicted segments are not spilled: the original run already wrote them.
+    """
+    def __init__(self, max_segments: int = 500, max_chars: int = 50_000, spill_path: str = None):
+        self.max_segments = max_segments
+        self.max_chars = max_chars
+        self.spill_path = spill_path
+        self.segments = deque()
+        self.chars = 0
+        self.total_segments = 0
+        self.spilled = 0
+        self.replaying = False
+        self._spill_file = None
+
+    def append(self, text: str, timestamp: float = None):
+        segment = TranscriptSegment(timestamp if timestamp is not None else time.time(), text)
+        self.segments.append(segment)
+        self.chars += len(text)
+        self.total_segments += 1
+        while len(self.segments) > self.max_segments or (self.chars > self.max_chars and len(self.segments) > 1):
+            self._evict()
+
+    def _evict(self):
+        segment = self.segments.popleft()
+        self.chars -= len(segment.text)
+        if self.spill_path and not self.replaying:
+            try:
+                if self._spill_file is None:
+                    os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+                    self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+                self._spill_file.write(json.dumps(segment.to_dict()) + "\n")
+                self.spilled += 1
+            except OSError as e:
+                logger.error(f"Transcript spill error: {e}")
+
+    def last(self, n: int) -> list:
+        """The newest n segments, oldest first."""
+        if n <= 0:
+            return []
+        return list(self.segments)[-n:]
+
+    def between(self, start: float, end: float = None) -> list:
+        """Segments with start <= timestamp < end (end=None: up to now)."""
+        out = []
+        for segment in reversed(self.segments):
+            if segment.timestamp < start:
+                break
+            if end is None or segment.timestamp < end:
+                out.append(segment)
+        out.reverse()
+        return out
+
+    def tail_text(self, max_chars: int) -> str:
+        """
+        The most recent text within max_chars, cut at a segment boundary
+        (only the oldest included segment is trimmed if a single one is too long).
+        """
+        parts = []
+        used = 0
+        for segment in reversed(self.segments):
+            needed = len(segment.text) + (1 if parts else 0)
+            if used + needed > max_chars:
+                if not parts:
+                    parts.append(segment.text[-max_chars:])
+                break
+            parts.append(segment.text)
+            used += needed
+        parts.reverse()
+        return " ".join(parts)
+
+    def tail_tokens(self, max_tokens: int) -> str:
+        """
+        The most recent text within an estimated token budget, cut at a segment
+        boundary (a newest segment over budget on its own is cut to its last words).
+        """
+        parts = []
+        used = 0
+        for segment in reversed(self.segments):
+            cost = estimate_tokens(segment.text)
+            if used + cost > max_tokens:
+                if not parts:
+                    parts.append(_tail_words(segment.text, max_tokens))
+                break
+            parts.append(segment.text)
+            used += cost
+        parts.reverse()
+        return " ".join(parts)
+
+    def text(self) -> str:
+        """Everything still in the in-memory window."""
+        return " ".join(segment.text for segment in self.segments)
+
+    def clear(self):
+        """Empties the store; outside replay the spill file is deleted too."""
+        self.segments.clear()
+        self.chars = 0
+        self.total_segments = 0
+        if self.spill_path and not self.replaying:
+            self.close()
+            try:
+                os.remove(self.spill_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Transcript spill cleanup error: {e}")
+            self.spilled = 0
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __len__(self):
+        return len(self.segments)
@@ -1,18 +1,18 @@
 import numpy as np
 import logging
-from faster_whisper import WhisperModel
 import io
 
 logger = logging.getLogger(__name__)
 
-def log_debug(msg):
-    with open("debug.log", "a") as f:
-        f.write(f"[TRANSCRIPTION] {msg}\n")
-
 class TranscriptionService:
-    def __init__(self, model_size="base", device="cpu", compute_type="int8"):
+    def __init__(self, model_size="base", device="cpu", compute_type="int8", num_workers=1, cpu_threads=0):
+        # Imported here so the module loads without faster-whisper; only the
+        # model registry (streaming_asr.local_asr_engine) constructs this
+        from faster_whisper import WhisperModel
         logger.info(f"Loading Whisper model: {model_size} on {device}...")
-        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        # num_workers > 1 lets that many transcribe() calls run in parallel from different threads
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                                  num_workers=num_workers, cpu_threads=cpu_threads)
         logger.info("Whisper model loaded.")
 
     def transcribe_audio(self, audio_data: bytes) -> str:
@@ -38,14 +38,29 @@ class TranscriptionService:
 
             text = " ".join([segment.text for segment in segments])
             if text:
-                log_debug(f"Result: '{text}'")
+                logger.debug(f"Result: '{text}'")
             return text.strip()
             
         except Exception as e:
             logger.error(f"Transcription error: {e}")
-            log_debug(f"Exception: {e}")
             return ""
 
-# Global instance
-# Using 'tiny' or 'base' for CPU performance during dev
-transcriber = TranscriptionService(model_size="base") 
+    def transcribe_pcm(self, samples: np.ndarray, initial_prompt: str = None, beam_size: int = 5) -> str:
+        """
+        Transcribes an already-segmented utterance (float32 mono, 16 kHz).
+        Blocking; call from a worker thread. Segmentation is done upstream,
+        so Whisper's own VAD filter is off.
+        """
+        try:
+            segments, info = self.model.transcribe(
+                samples,
+                beam_size=beam_size,
+                initial_prompt=initial_prompt or None,
+                condition_on_previous_text=False,
+                without_timestamps=True,
+                vad_filter=False
+            )
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            return ""
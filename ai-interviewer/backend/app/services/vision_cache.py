@@ -0,0 +1,58 @@
+import logging
+from collections import OrderedDict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class VisionCache:
+    """
+    LRU cache from perceptual frame hash -> vision model description.
+    A lookup matches any cached hash within `threshold` Hamming distance, so a
+    slide that is unchanged (or re-shown later) reuses its description instead of
+    costing another remote vision call.
+    """
+    def __init__(self, max_size: int = None, threshold: int = None):
+        self.max_size = max_size or settings.VISION_CACHE_SIZE
+        self.threshold = threshold if threshold is not None else settings.VISION_HASH_THRESHOLD
+        self.entries = OrderedDict()  # str(hash) -> (hash, description)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, frame_hash):
+        """
+        Returns (key, description) of the closest cached frame within threshold, or None.
+        """
+        best_key, best_diff = None, None
+        for key, (cached_hash, _) in self.entries.items():
+            diff = frame_hash - cached_hash
+            if diff < self.threshold and (best_diff is None or diff < best_diff):
+                best_key, best_diff = key, diff
+                if diff == 0:
+                    break
+
+        if best_key is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(best_key)
+        return best_key, self.entries[best_key][1]
+
+    def store(self, frame_hash, description: str) -> str:
+        key = str(frame_hash)
+        self.entries[key] = (frame_hash, description)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return key
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
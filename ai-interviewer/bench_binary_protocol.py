@@ -0,0 +1,66 @@
+"""
+Compares JSON/base64 framing against binary framing for media messages.
+
+Reports wire bytes per second for a typical capture profile and CPU time per
+frame for client-side encoding and server-side decoding in each mode.
+
+Usage: python bench_binary_protocol.py
+"""
+import base64
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.protocol import decode_frame, encode_frame, payload_bytes
+
+# Capture profile: 1 JPEG frame per second, 4 audio chunks per second
+VIDEO_FRAME_BYTES = 120_000
+VIDEO_FPS = 1
+AUDIO_CHUNK_BYTES = 8_000
+AUDIO_CHUNKS_PER_SEC = 4
+ITERATIONS = 500
+
+def json_encode(msg_type, data, mime):
+    payload = f"data:{mime};base64," + base64.b64encode(data).decode("ascii")
+    return json.dumps({"type": msg_type, "payload": payload, "timestamp": time.time() * 1000})
+
+def json_decode(text):
+    return payload_bytes(json.loads(text))
+
+def binary_encode(msg_type, data, mime):
+    return encode_frame(msg_type, data, time.time() * 1000)
+
+def binary_decode(frame):
+    return payload_bytes(decode_frame(frame))
+
+def cpu_per_call(fn, *args):
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        fn(*args)
+    return (time.process_time() - start) / ITERATIONS * 1e6  # microseconds
+
+def bench_mode(name, encode, decode):
+    video = os.urandom(VIDEO_FRAME_BYTES)
+    audio = os.urandom(AUDIO_CHUNK_BYTES)
+
+    video_wire = encode("video", video, "image/jpeg")
+    audio_wire = encode("audio", audio, "audio/webm")
+    assert decode(video_wire) == video and decode(audio_wire) == audio
+
+    wire_bytes_per_sec = len(video_wire) * VIDEO_FPS + len(audio_wire) * AUDIO_CHUNKS_PER_SEC
+    print(f"--- {name} ---")
+    print(f"Video frame on wire : {len(video_wire):>9,} bytes ({len(video_wire) / VIDEO_FRAME_BYTES:.3f}x raw)")
+    print(f"Audio chunk on wire : {len(audio_wire):>9,} bytes ({len(audio_wire) / AUDIO_CHUNK_BYTES:.3f}x raw)")
+    print(f"Upload per session  : {wire_bytes_per_sec / 1024:>9,.1f} KiB/s")
+    print(f"Video encode CPU    : {cpu_per_call(encode, 'video', video, 'image/jpeg'):>9.1f} us/frame")
+    print(f"Video decode CPU    : {cpu_per_call(decode, video_wire):>9.1f} us/frame")
+    print(f"Audio decode CPU    : {cpu_per_call(decode, audio_wire):>9.1f} us/chunk")
+    return wire_bytes_per_sec
+
+if __name__ == "__main__":
+    json_bps = bench_mode("JSON + base64", json_encode, json_decode)
+    binary_bps = bench_mode("Binary", binary_encode, binary_decode)
+    print(f"\nBinary mode uses {100 * (1 - binary_bps / json_bps):.1f}% fewer bytes on the wire")
@@ -0,0 +1,102 @@
+"""
+Session durability cost and recovery time for a long interview.
+
+Drives InterviewSession.record() with a synthetic session (a transcript segment
+every 2 s, a screen description every 6 s and a question/answer/evaluation every
+5 min of simulated time, with the state changes in between), as fast as possible
+into a temporary EVENT_LOG_DIR. Then "crashes" (the log is never closed, so only
+what reached the OS survives) and times resume() in a fresh session, for each
+snapshot interval. Reports append cost, fsyncs, files left on disk and recovery
+time; snapshot interval 0 means no compaction (replay the whole log).
+
+Usage: python bench_event_log.py [--hours 3] [--snapshot-every 0,200,1000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.config import settings
+from app.services.session import InterviewSession, InterviewState
+
+WORDS = ("so the service reads from the queue and writes to postgres then we cache "
+         "hot keys in redis with a short ttl and invalidate on update").split()
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+async def drive(session: InterviewSession, hours: float) -> int:
+    rng = random.Random(0)
+    session.record("reset", token="bench")
+    session.record("job_description", text="Backend Engineer\nRequirements:\n- Python, FastAPI\n- PostgreSQL, Redis\n- Docker")
+    events = 1
+    for second in range(0, int(hours * 3600), 2):
+        session.record("transcript", text=sentence(rng, 12))
+        events += 1
+        if session.state == InterviewState.AWAITING_ANSWER:
+            session.record("answer", text=sentence(rng, 12))
+            events += 1
+        if second % 6 == 0:
+            session.record("visual", text=f"Slide {second // 60}\n" + sentence(rng, 30))
+            events += 1
+        if second % 300 == 0:
+            session.record("state", state=InterviewState.QUESTIONING.value)
+            session.record("question", text=sentence(rng, 15) + "?", phase_index=session.current_phase_index,
+                           asked=session.questions_asked_in_phase + 1)
+            session.record("state", state=InterviewState.AWAITING_ANSWER.value)
+            events += 3
+        elif second % 300 == 150:
+            session.record("state", state=InterviewState.EVALUATING.value)
+            session.record("answer_submitted", question=session.last_asked_question, answer=session.current_answer_buffer[-500:])
+            session.record("evaluation", index=len(session.session_history) - 1, score=rng.randint(4, 9), feedback=sentence(rng, 20))
+            session.record("state", state=InterviewState.MONITORING.value)
+            events += 4
+        if second % 200 == 0:
+            # Let batched fsyncs and snapshot threads run, as they would between messages
+            await asyncio.sleep(0)
+    return events
+
+async def run(hours: float, snapshot_every: int):
+    with tempfile.TemporaryDirectory() as directory:
+        settings.EVENT_LOG_DIR = directory
+        settings.EVENT_LOG_SNAPSHOT_EVERY = snapshot_every
+
+        session = InterviewSession("bench")
+        start = time.perf_counter()
+        events = await drive(session, hours)
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(settings.EVENT_LOG_FSYNC_MS / 1000 * 2)
+        if session.event_log.snapshot_task:
+            await session.event_log.snapshot_task
+        stats = session.event_log.stats()
+        on_disk = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        expected = (session.state, len(session.session_history), session.current_phase_index, len(session.context_engine.transcript))
+
+        # Crash: session is abandoned without close()
+        recovered = InterviewSession("bench")
+        start = time.perf_counter()
+        await recovered.resume(resume_token="bench")
+        recovery = time.perf_counter() - start
+        got = (recovered.state, len(recovered.session_history), recovered.current_phase_index, len(recovered.context_engine.transcript))
+        # resume() parks an in-flight QUESTIONING/EVALUATING state in MONITORING
+        ok = got[1:] == expected[1:]
+        print(f"{snapshot_every or 'never':>9} {events:>7} {elapsed / events * 1e6:>10.1f} {stats['fsyncs']:>7} "
+              f"{stats['snapshots']:>9} {on_disk / 1024:>8.0f} {recovery * 1000:>12.1f}  {'ok' if ok else f'MISMATCH {got} != {expected}'}")
+        recovered.event_log.close()
+
+async def main(args):
+    print(f"{args.hours}h simulated session")
+    print(f"{'snapshot':>9} {'events':>7} {'us/event':>10} {'fsyncs':>7} {'snapshots':>9} {'disk KB':>8} {'recovery ms':>12}")
+    for snapshot_every in args.snapshot_every:
+        await run(args.hours, snapshot_every)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--snapshot-every", type=lambda s: [int(x) for x in s.split(",")], default=[0, 200, 1000])
+    asyncio.run(main(parser.parse_args()))
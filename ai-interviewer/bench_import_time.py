@@ -0,0 +1,80 @@
+"""
+Startup cost per module.
+
+Imports each module in a fresh interpreter with `python -X importtime` and
+reports its cumulative import time plus the heaviest dependencies it pulled in.
+Run it before and after touching imports to catch a heavy SDK or model sneaking
+back into import time.
+
+Usage: python bench_import_time.py [--runs 3] [--top 3] [module ...]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+MODULES = [
+    "app.core.config",
+    "app.core.llm_client",
+    "app.core.registry",
+    "app.services.frame_hash",
+    "app.services.audio_frontend",
+    "app.services.ocr_service",
+    "app.services.transcription",
+    "app.services.stream_manager",
+    "app.main",
+]
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(module: str):
+    """(cumulative_us, [(cumulative_us, name) of direct top-level deps], error)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [BACKEND, os.environ.get("PYTHONPATH")]))}
+    )
+    if proc.returncode != 0:
+        return None, [], proc.stderr.strip().splitlines()[-1]
+    total = None
+    deps = []
+    subtree = []
+    # Children are printed before their parent; a line at indent 1 closes a top-level import
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if name == module:
+            total = cumulative
+            deps = [(us, dep) for us, dep in subtree if "." not in dep and not dep.startswith("app")]
+        elif indent == 1:
+            subtree = []
+        else:
+            subtree.append((cumulative, name))
+    deps.sort(reverse=True)
+    return total, deps, None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'module':<32} {'median ms':>10}   heaviest top-level imports")
+    for module in args.modules:
+        samples, deps, error = [], [], None
+        for _ in range(args.runs):
+            total, deps, error = measure(module)
+            if error:
+                break
+            samples.append(total)
+        if error:
+            print(f"{module:<32} {'-':>10}   import failed: {error}")
+            continue
+        heavy = ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in deps[:args.top])
+        print(f"{module:<32} {statistics.median(samples) / 1000:>10.1f}   {heavy}")
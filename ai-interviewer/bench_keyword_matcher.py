@@ -0,0 +1,88 @@
+"""
+Keyword scanning: per-keyword substring loop vs the compiled KeywordMatcher.
+
+Builds a synthetic taxonomy of several thousand terms (the real keyword set
+plus generated one- and two-word terms), then scans a stream of transcript
+segments with both approaches and reports time per segment and false positives.
+
+Usage: python bench_keyword_matcher.py [--terms 5000] [--segments 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.keyword_matcher import KeywordMatcher
+from app.core.keywords import KEYWORD_ALIASES, TECHNICAL_KEYWORDS
+
+FILLER = ("we", "built", "the", "service", "using", "a", "good", "approach", "for", "going", "to",
+          "scale", "it", "and", "then", "deployed", "on", "cluster", "with", "our", "team", "data")
+
+def make_taxonomy(n_terms: int, rng: random.Random) -> set:
+    terms = set(TECHNICAL_KEYWORDS)
+    syllables = ["ka", "zo", "lin", "tra", "mex", "vor", "qui", "dex", "pol", "nar", "sy", "bex"]
+    while len(terms) < n_terms:
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.2:
+            word += " " + "".join(rng.choice(syllables) for _ in range(2))
+        terms.add(word)
+    return terms
+
+def make_segments(n: int, taxonomy: list, rng: random.Random) -> list:
+    segments = []
+    for _ in range(n):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(12, 30))]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words)), rng.choice(taxonomy))
+        segments.append(" ".join(words))
+    return segments
+
+def naive_scan(segments, taxonomy):
+    # The previous ContextEngine approach: substring test per keyword
+    found = set()
+    for text in segments:
+        lower_text = text.lower()
+        for kw in taxonomy:
+            if kw in lower_text:
+                found.add(kw)
+    return found
+
+def matcher_scan(segments, matcher):
+    stream = matcher.stream()
+    found = set()
+    for text in segments:
+        found |= stream.feed(text)
+    return found
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--segments", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    taxonomy = make_taxonomy(args.terms, rng)
+    segments = make_segments(args.segments, sorted(taxonomy), rng)
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(taxonomy, KEYWORD_ALIASES)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Taxonomy: {len(taxonomy)} terms, automaton: {len(matcher.goto)} states, built in {build_ms:.1f} ms")
+    print(f"Segments: {len(segments)}, avg {sum(map(len, segments)) / len(segments):.0f} chars\n")
+
+    start = time.perf_counter()
+    naive = naive_scan(segments, taxonomy)
+    naive_us = (time.perf_counter() - start) / len(segments) * 1e6
+
+    start = time.perf_counter()
+    compiled = matcher_scan(segments, matcher)
+    compiled_us = (time.perf_counter() - start) / len(segments) * 1e6
+
+    print(f"{'approach':<18} {'us/segment':>12} {'terms found':>12}")
+    print(f"{'substring loop':<18} {naive_us:>12.1f} {len(naive):>12}")
+    print(f"{'KeywordMatcher':<18} {compiled_us:>12.1f} {len(compiled):>12}")
+    print(f"\nSpeedup: {naive_us / compiled_us:.1f}x")
+    print(f"Substring-only hits (false positives such as 'go' in 'good'): {len(naive - compiled - set(KEYWORD_ALIASES))}")
@@ -0,0 +1,95 @@
+"""
+Real-time factor of the local streaming ASR on CPU.
+
+Loads a WAV file (or synthesizes a few seconds of speech-like noise bursts if
+none is given), then:
+  1. decodes each VAD segment once with beam search (final pass), and
+  2. replays the audio through StreamingTranscriber in 250 ms chunks as fast as
+     possible, which adds the sliding-window partial decodes.
+RTF = decode time / audio duration; below 1.0 keeps up with live speech.
+
+Usage: python bench_local_asr.py [--wav speech.wav] [--model base] [--workers 2] [--compute-type int8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.audio_frontend import SAMPLE_RATE, SpeechSegmenter, decode_audio
+from app.services.streaming_asr import LocalASREngine, StreamingTranscriber
+
+def synthetic_speech(seconds: float, rng: np.random.Generator) -> np.ndarray:
+    # Alternating ~2 s voiced bursts (modulated harmonics) and ~0.8 s pauses
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voiced = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((140, 280, 420, 900)))
+    envelope = (np.sin(2 * np.pi * t / 2.8) > -0.3).astype(np.float32) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    return (0.1 * voiced * envelope + 0.002 * rng.standard_normal(len(t))).astype(np.float32)
+
+def to_pcm16(samples: np.ndarray) -> bytes:
+    return (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+
+async def streaming_run(engine: LocalASREngine, samples: np.ndarray, chunk_seconds: float) -> dict:
+    results = {"partial": 0, "final": 0}
+
+    async def on_result(text, is_final, segment_id):
+        results["final" if is_final else "partial"] += 1
+
+    transcriber = StreamingTranscriber(engine, on_result)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    for i in range(0, len(samples), chunk):
+        await transcriber.feed(to_pcm16(samples[i:i + chunk]), pcm=True)
+    # Flush the trailing utterance, then wait for outstanding decodes
+    await transcriber.feed(to_pcm16(np.zeros(SAMPLE_RATE, dtype=np.float32)), pcm=True)
+    while transcriber.tasks:
+        await asyncio.gather(*list(transcriber.tasks), return_exceptions=True)
+    return results
+
+async def main(args):
+    rng = np.random.default_rng(0)
+    if args.wav:
+        with open(args.wav, "rb") as f:
+            samples = decode_audio(f.read())
+    else:
+        samples = synthetic_speech(args.seconds, rng)
+    duration = len(samples) / SAMPLE_RATE
+
+    segments = SpeechSegmenter(hangover_ms=settings.VAD_HANGOVER_MS).feed(
+        np.concatenate((samples, np.zeros(SAMPLE_RATE, dtype=np.float32)))
+    )
+    speech = sum(end - start for start, end in segments) / SAMPLE_RATE
+    print(f"Audio: {duration:.1f}s, {len(segments)} VAD segments, {speech:.1f}s of speech")
+
+    start = time.perf_counter()
+    engine = LocalASREngine(args.model, "cpu", args.compute_type, args.workers)
+    print(f"Model '{args.model}' ({args.compute_type}) loaded in {time.perf_counter() - start:.1f}s, "
+          f"{args.workers} workers\n")
+
+    start = time.perf_counter()
+    for seg_start, seg_end in segments:
+        await engine.transcribe(samples[seg_start:seg_end])
+    final_rtf = (time.perf_counter() - start) / duration
+
+    start = time.perf_counter()
+    counts = await streaming_run(engine, samples, args.chunk)
+    stream_rtf = (time.perf_counter() - start) / duration
+
+    print(f"{'pass':<28} {'RTF':>7}")
+    print(f"{'finals only (beam 5)':<28} {final_rtf:>7.3f}")
+    print(f"{'streaming (partials+finals)':<28} {stream_rtf:>7.3f}   "
+          f"{counts['partial']} partials, {counts['final']} finals")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--model", default=settings.ASR_MODEL_SIZE)
+    parser.add_argument("--compute-type", default=settings.ASR_COMPUTE_TYPE)
+    parser.add_argument("--workers", type=int, default=settings.ASR_WORKERS)
+    parser.add_argument("--chunk", type=float, default=0.25)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""
+Per-call cost of the /metrics instrumentation (app.core.metrics).
+
+Times each operation the hot paths use, minus an empty loop, in nanoseconds per
+call, plus the cost of rendering a scrape:
+
+  counter child inc     pre-bound child (llm_cache)
+  counter labels+inc    label lookup then inc (messages, frames)
+  histogram observe     label lookup, bisect into 15 buckets, sum
+  timer block           `with histogram.labels(...).time():` around a no-op
+  message path          everything handle_message adds per message
+
+Budget: every per-call row must stay in the low microseconds (--max-us, default 5).
+
+Usage: python bench_metrics.py [--number 200000] [--max-us 5]
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.metrics import MetricsRegistry
+
+def bench(stmt, setup_globals: dict, number: int) -> float:
+    """Best of 5 repeats, seconds per call."""
+    return min(timeit.repeat(stmt, globals=setup_globals, number=number, repeat=5)) / number
+
+def main(args):
+    registry = MetricsRegistry()
+    stages = registry.histogram("bench_stage_seconds", "Stage time.", ["stage"])
+    handled = registry.histogram("bench_message_handle_seconds", "Message time.", ["type"])
+    messages = registry.counter("bench_messages_total", "Messages.", ["type"])
+    child = messages.labels("audio")
+    env = {"stages": stages, "handled": handled, "messages": messages, "child": child,
+           "perf_counter": time.perf_counter, "value": 0.0123}
+
+    baseline = bench("pass", env, args.number)
+    rows = [
+        ("counter child inc", "child.inc()"),
+        ("counter labels+inc", "messages.labels('audio').inc()"),
+        ("histogram observe", "stages.labels('vision').observe(value)"),
+        ("timer block", "with stages.labels('question').time():\n    pass"),
+        ("message path", "messages.labels('audio').inc()\n"
+                         "start = perf_counter()\n"
+                         "handled.labels('audio').observe(perf_counter() - start)"),
+    ]
+    print(f"{'operation':<20} {'ns/call':>8}")
+    failures = []
+    for name, stmt in rows:
+        ns = (bench(stmt, env, args.number) - baseline) * 1e9
+        print(f"{name:<20} {ns:>8.0f}")
+        if ns / 1000 > args.max_us:
+            failures.append(f"{name} {ns / 1000:.2f}us > {args.max_us}us")
+
+    # A scrape with a realistic number of series: 8 stages, 10 message types, 50 sessions x 3 lanes
+    for i in range(8):
+        stages.labels(f"stage{i}").observe(0.1)
+    for i in range(10):
+        handled.labels(f"type{i}").observe(0.01)
+        messages.labels(f"type{i}").inc()
+    depths = [((f"client-{i}", lane), 0) for i in range(50) for lane in ("audio", "video", "control")]
+    registry.register_collector(lambda: [("bench_queue_depth", "gauge", "Depth.", ("session", "lane"), depths)])
+    render_ms = bench("registry.render()", {"registry": registry}, 200) * 1000
+    text = registry.render()
+    print(f"\nscrape: {len(text.splitlines())} lines, {len(text) / 1024:.1f} KiB, {render_ms:.2f} ms to render")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--max-us", type=float, default=5.0)
+    sys.exit(main(parser.parse_args()))
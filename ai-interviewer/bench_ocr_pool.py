@@ -0,0 +1,109 @@
+"""
+OCR throughput: inline OCRService vs the batched OCRPool.
+
+Renders synthetic slides (title + bullets + a code block) with OpenCV, then
+  1. runs OCRService.extract_text inline, one frame at a time, and
+  2. submits the same frames from several simulated sessions at once to
+     OCRPool with 1..N workers.
+Reports frames/s, frames/s per core and the longest event-loop stall seen while
+each run was in progress (inline OCR blocks the loop; the pool shouldn't).
+
+Usage: python bench_ocr_pool.py [--frames 48] [--sessions 4] [--workers 1,2,4] [--batch-size 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import cv2
+import numpy as np
+
+from app.services.ocr_pool import OCRPool
+from app.services.ocr_service import OCRService
+
+WORDS = ["FastAPI", "Redis", "cache", "latency", "queue", "worker", "Docker", "deploy", "schema", "index"]
+
+def render_slide(i: int, width: int = 1280, height: int = 720) -> bytes:
+    rng = np.random.default_rng(i)
+    img = np.full((height, width, 3), 255, dtype=np.uint8)
+    cv2.putText(img, f"Slide {i}: System Design", (60, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.6, (20, 20, 20), 3)
+    for line in range(5):
+        text = "- " + " ".join(rng.choice(WORDS, size=5))
+        cv2.putText(img, text, (80, 180 + line * 60), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (40, 40, 40), 2)
+    cv2.rectangle(img, (60, 500), (width - 60, 680), (240, 240, 240), -1)
+    cv2.putText(img, f"def handler(req): return cache.get(req.id_{i})", (80, 600),
+                cv2.FONT_HERSHEY_PLAIN, 2.0, (10, 10, 120), 2)
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+class LoopLag:
+    """Largest gap between 10 ms ticks while active."""
+    def __init__(self):
+        self.max_lag = 0.0
+        self.task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(0.01)
+            self.max_lag = max(self.max_lag, loop.time() - start - 0.01)
+
+    def __enter__(self):
+        self.task = asyncio.ensure_future(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self.task.cancel()
+
+async def run_inline(frames: list) -> tuple:
+    service = OCRService(gpu=False)
+    with LoopLag() as lag:
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            service.extract_text(frame, session_id=f"s{i}")  # distinct ids: no dedup
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+    return elapsed, lag.max_lag
+
+async def run_pool(frames: list, sessions: int, workers: int, batch_size: int) -> tuple:
+    pool = OCRPool(workers=workers, batch_size=batch_size, batch_window_ms=50)
+    await pool.start()
+
+    async def session(frames_for_session):
+        for frame in frames_for_session:
+            await pool.extract_text(frame)
+
+    with LoopLag() as lag:
+        start = time.perf_counter()
+        await asyncio.gather(*(session(frames[s::sessions]) for s in range(sessions)))
+        elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    await pool.close()
+    return elapsed, lag.max_lag, stats["avg_batch"]
+
+async def main(args):
+    frames = [render_slide(i) for i in range(args.frames)]
+    cores = os.cpu_count() or 1
+    print(f"{len(frames)} frames (1280x720 JPEG), {args.sessions} sessions, {cores} cores\n")
+    print(f"{'mode':<22} {'fps':>7} {'fps/core':>9} {'max loop stall':>15} {'avg batch':>10}")
+
+    elapsed, stall = await run_inline(frames)
+    fps = len(frames) / elapsed
+    print(f"{'inline OCRService':<22} {fps:>7.2f} {fps / cores:>9.3f} {stall * 1000:>13.0f}ms {1:>10}")
+
+    for workers in [int(w) for w in args.workers.split(",")]:
+        elapsed, stall, avg_batch = await run_pool(frames, args.sessions, workers, args.batch_size)
+        fps = len(frames) / elapsed
+        print(f"{f'OCRPool x{workers}':<22} {fps:>7.2f} {fps / cores:>9.3f} {stall * 1000:>13.0f}ms {avg_batch:>10}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=48)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--batch-size", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
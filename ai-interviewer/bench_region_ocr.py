@@ -0,0 +1,80 @@
+"""
+Live-coding OCR cost: full-frame OCR per changed frame vs region-of-change OCR.
+
+Renders a code editor screen and "types" a line of code a few characters per
+frame, then OCRs every frame both ways through one OCRPool worker:
+  - full:   pHash-gated full-frame reads (frames whose pHash barely moves are
+            skipped, as the old OCRService did, so those edits are missed)
+  - region: RegionOCR, reading only the tile rows that changed
+Reports OCR time per frame, the share of pixels sent to OCR and edits missed.
+
+Usage: python bench_region_ocr.py [--frames 30] [--chars-per-frame 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import cv2
+import numpy as np
+
+from app.services.frame_hash import compute_phash
+from app.services.ocr_pool import OCRPool
+from app.services.region_ocr import RegionOCR
+
+CODE = [
+    "from fastapi import FastAPI",
+    "app = FastAPI()",
+    "",
+    "@app.get('/items/{item_id}')",
+    "async def read_item(item_id: int):",
+    "    return {'item_id': item_id}",
+]
+TYPED = "    cached = await redis.get(f'item:{item_id}')"
+
+def render(typed: str) -> bytes:
+    img = np.full((720, 1280, 3), 30, dtype=np.uint8)
+    for i, line in enumerate(CODE + [typed]):
+        cv2.putText(img, line, (40, 60 + i * 44), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (230, 230, 230), 2)
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 85])[1].tobytes()
+
+async def main(args):
+    frames = [render(TYPED[:n]) for n in range(0, len(TYPED) + 1, args.chars_per_frame)][:args.frames]
+    pool = OCRPool(workers=1, batch_size=1, batch_window_ms=0)
+    await pool.start()
+
+    # Full-frame, pHash-gated
+    start = time.perf_counter()
+    last_hash, reads, missed = None, 0, 0
+    for frame in frames:
+        frame_hash = compute_phash(frame)
+        if last_hash is not None and frame_hash - last_hash < 5:
+            missed += 1
+            continue
+        last_hash = frame_hash
+        await pool.extract_text(frame)
+        reads += 1
+    full_ms = (time.perf_counter() - start) / len(frames) * 1000
+    print(f"{'mode':<8} {'ms/frame':>9} {'pixels read':>12} {'edits missed':>13}")
+    print(f"{'full':<8} {full_ms:>9.0f} {reads / len(frames):>11.0%} {missed:>13}")
+
+    # Region-of-change
+    region = RegionOCR(pool)
+    start = time.perf_counter()
+    text = ""
+    for frame in frames:
+        text = await region.extract_text(frame) or text
+    region_ms = (time.perf_counter() - start) / len(frames) * 1000
+    stats = region.stats()
+    print(f"{'region':<8} {region_ms:>9.0f} {stats['pixels_read_ratio']:>11.0%} {stats['unchanged']:>13}")
+    print(f"\nLast line read: {text.splitlines()[-1] if text else ''!r}")
+    await pool.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--chars-per-frame", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
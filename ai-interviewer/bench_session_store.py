@@ -0,0 +1,144 @@
+"""
+Interview throughput vs worker count with the shared (Redis-protocol) session store.
+
+Starts the local RESP stand-in (or uses --redis-url), then runs 1..N worker
+processes, each with --clients concurrent simulated interviews. Every turn is
+handled as if the client had just reconnected to that worker: load the session
+from the store, resume an InterviewSession from it, record a turn's worth of
+transcript, build the question prompt, submit the answer, and save with the
+optimistic version check (retrying from load on conflict).
+
+  spread:    every client has its own session (the normal case)
+  contended: all workers share --keys sessions, so saves race; afterwards the
+             stored answer count must equal the number of successful turns
+             (no update lost)
+
+Reports turns/s, speed-up over one worker, p50/p95 turn latency and conflicts.
+The stand-in is a single Python process and becomes the bottleneck before real
+Redis would; point --redis-url at a Redis server for a fair scaling curve.
+
+Usage: python bench_session_store.py [--workers 1,2,4] [--clients 8] [--seconds 5] [--keys 4] [--redis-url URL]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.services.question_engine import question_engine
+from app.services.session import InterviewSession
+from app.services.session_store import RedisSessionStore
+from resp_standin import RespStandIn
+
+WORDS = ("we shard the queue by tenant and the consumer batches writes to postgres "
+         "while redis caches the hot keys behind a ttl").split()
+
+async def turn(store: RedisSessionStore, client_id: str, rng: random.Random):
+    """(seconds, conflicts) for one handled turn."""
+    start = time.perf_counter()
+    conflicts = 0
+    while True:
+        version, state = await store.load(client_id)
+        session = InterviewSession(client_id)
+        if not await session.resume(state, client_id):
+            session.record("reset", token=client_id)
+        for _ in range(5):
+            session.record("transcript", text=" ".join(rng.choice(WORDS) for _ in range(12)))
+        ctx = session.context_engine.get_context()
+        ctx["current_phase"] = session.current_phase
+        question_engine.build_messages(ctx)
+        session.record("answer_submitted", question="How do you avoid hot partitions?", answer=session.context_engine.transcript.tail_tokens(80))
+        saved = await store.save(client_id, session.snapshot(), version)
+        session.close()
+        if saved is not None:
+            return time.perf_counter() - start, conflicts
+        conflicts += 1
+
+async def worker_main(url: str, worker_id: int, clients: int, seconds: float, keys: int, results):
+    store = RedisSessionStore(url)
+    rng = random.Random(worker_id)
+    latencies, conflicts = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(index: int):
+        nonlocal conflicts
+        client_id = f"c{index % keys}" if keys else f"w{worker_id}-c{index}"
+        while time.perf_counter() < deadline:
+            elapsed, lost = await turn(store, client_id, rng)
+            latencies.append(elapsed)
+            conflicts += lost
+
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    await store.close()
+    results.put((latencies, conflicts))
+
+def worker_process(*args):
+    asyncio.run(worker_main(*args))
+
+async def run(url: str, workers: int, clients: int, seconds: float, keys: int):
+    store = RedisSessionStore(url)
+    await store.client.execute("FLUSHALL")
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker_process, args=(url, w, clients, seconds, keys, results)) for w in range(workers)]
+    for p in processes:
+        p.start()
+    latencies, conflicts = [], 0
+    for _ in processes:
+        worker_latencies, worker_conflicts = await asyncio.to_thread(results.get)
+        latencies += worker_latencies
+        conflicts += worker_conflicts
+    for p in processes:
+        await asyncio.to_thread(p.join)
+
+    lost = None
+    if keys:
+        stored = 0
+        for k in range(keys):
+            _, state = await store.load(f"c{k}")
+            stored += len(state["session_history"]) if state else 0
+        lost = len(latencies) - stored
+    await store.close()
+    latencies.sort()
+    return {
+        "turns_per_s": len(latencies) / seconds,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "conflicts": conflicts,
+        "lost": lost
+    }
+
+async def main(args):
+    standin = None
+    url = args.redis_url
+    if not url:
+        standin = RespStandIn()
+        port = await standin.start("127.0.0.1", 0)
+        url = f"redis://127.0.0.1:{port}/0"
+    print(f"store: {url}{' (stand-in)' if standin else ''}, {args.clients} clients/worker, {args.seconds}s per run")
+    for mode, keys in (("spread", 0), ("contended", args.keys)):
+        print(f"\n{mode}")
+        print(f"{'workers':>7} {'turns/s':>9} {'speed-up':>9} {'p50 ms':>8} {'p95 ms':>8} {'conflicts':>10} {'lost':>5}")
+        baseline = None
+        for workers in args.workers:
+            r = await run(url, workers, args.clients, args.seconds, keys)
+            baseline = baseline or r["turns_per_s"]
+            lost = "-" if r["lost"] is None else r["lost"]
+            print(f"{workers:>7} {r['turns_per_s']:>9.0f} {r['turns_per_s'] / baseline:>8.2f}x "
+                  f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['conflicts']:>10} {lost:>5}")
+    if standin:
+        await standin.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--keys", type=int, default=4)
+    parser.add_argument("--redis-url", default="")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""
+Latency of the submit_answer flow, serial vs overlapped.
+
+Runs the LLM client on the shared mock provider (app.core.mock_provider) with
+fixed delays for evaluation and question generation, then drives
+StreamManager.submit_answer on a fresh session and reports when the candidate
+sees the evaluation, the first question token and the full next question.
+
+Usage: python bench_submit_overlap.py [--eval-delay 1.5] [--question-delay 1.0] [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.config import settings
+
+settings.MOCK_PROVIDER = True
+settings.MOCK_ERROR_RATE = 0.0
+# Every run must reach the provider
+settings.LLM_CACHE_ENABLED = False
+
+from app.core.llm_client import llm_client
+from app.core.mock_provider import LatencyModel
+from app.services.session import InterviewSession, InterviewState
+from app.services.stream_manager import manager
+
+def configure_mock(eval_delay: float, question_delay: float):
+    """Fixed latencies: evaluation is a plain completion, the question a streamed one."""
+    provider = llm_client.connect().groq_client
+    provider.chat_latency = LatencyModel(str(eval_delay))
+    # Time to first token is ~20% of the total, then tokens arrive evenly
+    provider.first_token_latency = LatencyModel(str(question_delay * 0.2))
+    provider.stream_latency = LatencyModel(str(question_delay))
+
+class RecordingSocket:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events = {}
+
+    async def send_text(self, text: str):
+        msg_type = json.loads(text)["type"]
+        self.events.setdefault(msg_type, time.perf_counter() - self.start)
+
+async def run_once(overlap: bool) -> dict:
+    socket = RecordingSocket()
+    session = InterviewSession("bench", socket)
+    session.state = InterviewState.AWAITING_ANSWER
+    session.current_phase_index = 1  # Project Walkthrough, so the interview continues
+    session.last_asked_question = "Walk me through the architecture."
+    socket.start = time.perf_counter()
+    await manager.submit_answer(session, "We use FastAPI workers behind nginx with Redis for sessions.", overlap=overlap)
+    total = time.perf_counter() - socket.start
+    return {
+        "evaluation": socket.events.get("evaluation"),
+        "first_token": socket.events.get("question_delta"),
+        "question": socket.events.get("question"),
+        "total": total
+    }
+
+async def main(args):
+    configure_mock(args.eval_delay, args.question_delay)
+
+    print(f"Mock provider: evaluation {args.eval_delay:.2f}s, question {args.question_delay:.2f}s\n")
+    print(f"{'flow':<11} {'evaluation':>11} {'1st token':>11} {'question':>11} {'total':>11}")
+    for name, overlap in (("serial", False), ("overlapped", True)):
+        runs = [await run_once(overlap) for _ in range(args.runs)]
+        cols = [statistics.median(r[k] for r in runs) for k in ("evaluation", "first_token", "question", "total")]
+        print(f"{name:<11} " + " ".join(f"{c:>10.3f}s" for c in cols))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--eval-delay", type=float, default=1.5)
+    parser.add_argument("--question-delay", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,70 @@
+"""
+Measures visual_log egress per session for each VISUAL_LOG_IMAGE_MODE.
+
+Builds synthetic 1280x720 slide frames, formats the visual_log message exactly
+as StreamManager does, and reports bytes per message, projected bytes per
+session and server CPU per message in each mode.
+
+Usage: python bench_visual_log_egress.py [--minutes 30] [--visual-logs-per-minute 6]
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from PIL import Image, ImageDraw
+
+from app.services.frame_preview import VISUAL_LOG_IMAGE_MODES, visual_log_image_fields
+
+DESCRIPTION = "Slide titled 'System Architecture' showing a FastAPI backend, Redis cache and a React frontend. " * 3
+
+def make_slide(seed: int) -> bytes:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1280, 720), color=(250, 250, 250))
+    d = ImageDraw.Draw(img)
+    d.rectangle((0, 0, 1280, 90), fill=(40, 60, 120))
+    d.text((40, 30), f"Slide {seed}: Architecture Overview", fill=(255, 255, 255))
+    for line in range(14):
+        words = " ".join(rng.choice(["FastAPI", "Redis", "queue", "worker", "latency", "React", "cache"]) for _ in range(8))
+        d.text((60, 120 + line * 40), f"- {words}", fill=(20, 20, 20))
+    d.rectangle((900, 200, 1200, 600), outline=(200, 30, 30), width=4)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=70)
+    return buf.getvalue()
+
+def message_size(image_bytes: bytes, payload: str, mode: str) -> int:
+    message = {
+        "type": "visual_log",
+        "text": f"Visual Context: {DESCRIPTION[:100]}...",
+        "description": DESCRIPTION,
+        **visual_log_image_fields(image_bytes, payload, mode),
+        "timestamp": time.time() * 1000
+    }
+    return len(json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--visual-logs-per-minute", type=int, default=6)
+    args = parser.parse_args()
+
+    frames = [make_slide(i) for i in range(20)]
+    payloads = [base64.b64encode(f).decode("ascii") for f in frames]
+    messages_per_session = args.minutes * args.visual_logs_per_minute
+    print(f"Average uploaded frame: {sum(map(len, frames)) / len(frames) / 1024:.1f} KiB")
+    print(f"Session profile: {args.minutes} min, {messages_per_session} visual_log messages\n")
+    print(f"{'mode':<10} {'bytes/msg':>12} {'MiB/session':>12} {'CPU us/msg':>12}")
+
+    for mode in VISUAL_LOG_IMAGE_MODES:
+        start = time.process_time()
+        sizes = [message_size(f, p, mode) for f, p in zip(frames, payloads)]
+        cpu_us = (time.process_time() - start) / len(frames) * 1e6
+        per_msg = sum(sizes) / len(sizes)
+        per_session = per_msg * messages_per_session / (1024 * 1024)
+        print(f"{mode:<10} {per_msg:>12,.0f} {per_session:>12.2f} {cpu_us:>12.0f}")
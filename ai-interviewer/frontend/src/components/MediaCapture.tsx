@@ -1,5 +1,43 @@
 import React, { useState, useRef, useEffect } from 'react';
 
+// Send media as binary WebSocket frames (see backend app/core/protocol.py).
+// Set to false to fall back to JSON + base64 data URLs.
+const USE_BINARY_FRAMES = true;
+const FRAME_HEADER_SIZE = 12;
+const FRAME_TYPE_IDS = { audio: 1, video: 2 } as const;
+const MAX_KEPT_FRAMES = 30;
+const INTERVIEW_ID_KEY = 'interviewId';
+const RESUME_TOKEN_KEY = 'resumeToken';
+
+// Per-interview client id: survives reloads of this tab, replaced when a new interview starts
+const interviewId = (fresh = false) => {
+    let id = sessionStorage.getItem(INTERVIEW_ID_KEY);
+    if (fresh || !id) {
+        id = crypto.randomUUID();
+        sessionStorage.setItem(INTERVIEW_ID_KEY, id);
+        sessionStorage.removeItem(RESUME_TOKEN_KEY);
+    }
+    return id;
+};
+
+const encodeBinaryFrame = (type: keyof typeof FRAME_TYPE_IDS, data: ArrayBuffer, timestamp: number) => {
+    const frame = new Uint8Array(FRAME_HEADER_SIZE + data.byteLength);
+    const view = new DataView(frame.buffer);
+    view.setUint8(0, 1); // protocol version
+    view.setUint8(1, FRAME_TYPE_IDS[type]);
+    view.setFloat64(4, timestamp); // big-endian
+    frame.set(new Uint8Array(data), FRAME_HEADER_SIZE);
+    return frame.buffer;
+};
+
+// Bytes of a base64 data URL: the same bytes the server decodes and hashes for image_ref
+const dataUrlBytes = (dataUrl: string) => {
+    const binary = atob(dataUrl.slice(dataUrl.indexOf(',') + 1));
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return bytes.buffer;
+};
+
 interface MediaCaptureProps {
     onStatusChange?: (status: string) => void;
 }
@@ -25,7 +63,35 @@ const MediaCapture: React.FC<MediaCaptureProps> = ({ onStatusChange }) => {
     const mediaStreamRef = useRef<MediaStream | null>(null);
     const audioRecorderRef = useRef<MediaRecorder | null>(null);
     const intervalRef = useRef<number | null>(null);
+    // Frame capture rate and JPEG quality, adjusted by server 'rate_control' messages
+    const captureIntervalMsRef = useRef(1000);
+    const jpegQualityRef = useRef(0.7);
+    const captureFrameRef = useRef<(() => void) | null>(null);
     const isRecordingRef = useRef(false);
+    const questionStreamingRef = useRef(false);
+    // Segment id of the partial (server ASR) transcript currently shown last, if any
+    const liveSegmentRef = useRef<number | null>(null);
+    // Recently sent frames by SHA-256, so visual_log image_ref can be resolved without re-downloading
+    const keptFramesRef = useRef<Map<string, string>>(new Map());
+
+    const keepFrame = async (data: ArrayBuffer) => {
+        const digest = await crypto.subtle.digest('SHA-256', data);
+        const ref = Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+        const frames = keptFramesRef.current;
+        frames.set(ref, URL.createObjectURL(new Blob([data], { type: 'image/jpeg' })));
+        while (frames.size > MAX_KEPT_FRAMES) {
+            const oldest = frames.keys().next().value as string;
+            URL.revokeObjectURL(frames.get(oldest)!);
+            frames.delete(oldest);
+        }
+    };
+
+    const takeKeptFrame = (ref: string) => {
+        // Removed from the map so the URL isn't revoked while the gallery shows it
+        const url = keptFramesRef.current.get(ref);
+        keptFramesRef.current.delete(ref);
+        return url;
+    };
 
     // Format seconds into MM:SS
     const formatTime = (seconds: number) => {
@@ -51,59 +117,113 @@ const MediaCapture: React.FC<MediaCaptureProps> = ({ onStatusChange }) => {
     };
 
     useEffect(() => {
-        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
-        const wsUrl = `${protocol}://localhost:8000/ws/stream/client-1`;
-        socketRef.current = new WebSocket(wsUrl);
-
-        socketRef.current.onopen = () => {
-            console.log('Connected to Backend Stream');
-            onStatusChange?.('Connected to Server');
-        };
-
-        socketRef.current.onmessage = (event) => {
-            try {
-                const data = JSON.parse(event.data);
-                if (data.type === 'transcript') {
-                    const now = Date.now();
-                    const elapsed = sessionStartTime ? Math.floor((now - sessionStartTime) / 1000) : 0;
-                    const timeStr = formatTime(elapsed);
-                    setTranscriptLog(prev => [...prev, { time: timeStr, text: data.text, type: 'audio' }]);
-
-                } else if (data.type === 'visual_log') {
-                    const now = Date.now();
-                    const elapsed = sessionStartTime ? Math.floor((now - sessionStartTime) / 1000) : 0;
-                    const timeStr = formatTime(elapsed);
-                } else if (data.type === 'visual_log') {
-                    const now = Date.now();
-                    const elapsed = sessionStartTime ? Math.floor((now - sessionStartTime) / 1000) : 0;
-                    const timeStr = formatTime(elapsed);
-                    setVisualLog(prev => [...prev, { time: timeStr, text: data.text, type: 'visual', image: data.image }]);
-                    // Do NOT add to transcriptLog
-
-                } else if (data.type === 'evaluation') {
-                    // Speak the feedback to "reply" to the user
-                    if (data.payload?.feedback) {
-                        speakText(data.payload.feedback);
+        let disposed = false;
+        let retryTimer: number | undefined;
+
+        const connect = () => {
+            const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+            const clientId = interviewId();
+            // The server resumes the interview only when handed back the token it issued
+            const resumeToken = sessionStorage.getItem(RESUME_TOKEN_KEY);
+            const query = resumeToken ? `?resume=${encodeURIComponent(resumeToken)}` : '';
+            const wsUrl = `${protocol}://localhost:8000/ws/stream/${clientId}${query}`;
+            socketRef.current = new WebSocket(wsUrl);
+
+            socketRef.current.onopen = () => {
+                console.log('Connected to Backend Stream');
+                onStatusChange?.('Connected to Server');
+            };
+
+            socketRef.current.onmessage = (event) => {
+                try {
+                    const data = JSON.parse(event.data);
+                    if (data.type === 'transcript') {
+                        const now = Date.now();
+                        const elapsed = sessionStartTime ? Math.floor((now - sessionStartTime) / 1000) : 0;
+                        const timeStr = formatTime(elapsed);
+                        const entry: TranscriptEntry = { time: timeStr, text: data.text, type: 'audio' };
+                        // Partial hypotheses replace each other until their segment's final arrives
+                        const replacing = data.segment_id !== undefined && liveSegmentRef.current === data.segment_id;
+                        liveSegmentRef.current = data.is_final === false ? data.segment_id : null;
+                        setTranscriptLog(prev => replacing ? [...prev.slice(0, -1), entry] : [...prev, entry]);
+
+                    } else if (data.type === 'visual_log') {
+                        const now = Date.now();
+                        const elapsed = sessionStartTime ? Math.floor((now - sessionStartTime) / 1000) : 0;
+                        const timeStr = formatTime(elapsed);
+                        // Server sends a thumbnail, or a reference to a frame we kept locally
+                        let image = data.image ?? (data.image_ref ? takeKeptFrame(data.image_ref) : undefined);
+                        // "full" mode echoes the frame as bare base64; thumbnails are data URLs
+                        if (image && !image.startsWith('data:')) image = `data:image/jpeg;base64,${image}`;
+                        setVisualLog(prev => [...prev, { time: timeStr, text: data.text, type: 'visual', image }]);
+                        // Do NOT add to transcriptLog
+
+                    } else if (data.type === 'evaluation') {
+                        // Speak the feedback to "reply" to the user
+                        if (data.payload?.feedback) {
+                            speakText(data.payload.feedback);
+                        }
+                    } else if (data.type === 'question_delta') {
+                        // Question text streaming in; the final 'question' message replaces it
+                        const fresh = !questionStreamingRef.current;
+                        questionStreamingRef.current = true;
+                        setCurrentQuestion(prev => (fresh ? '' : prev ?? '') + data.delta);
+                    } else if (data.type === 'question_reset') {
+                        // The streamed question broke off; drop the partial text
+                        questionStreamingRef.current = false;
+                        setCurrentQuestion(null);
+                    } else if (data.type === 'question') {
+                        questionStreamingRef.current = false;
+                        const qText = data.payload.question_text;
+                        setCurrentQuestion(qText);
+                        speakText(qText); // Trigger TTS
+                    } else if (data.type === 'session_started') {
+                        sessionStorage.setItem(RESUME_TOKEN_KEY, data.resume_token);
+                    } else if (data.type === 'session_resumed') {
+                        // Reconnected to an interview the server restored from its event log
+                        if (data.question) setCurrentQuestion(data.question);
+                        onStatusChange?.('Session Resumed');
+                    } else if (data.type === 'rate_control') {
+                        // Server scales capture to screen activity and vision backlog
+                        captureIntervalMsRef.current = Math.round(1000 / data.fps);
+                        jpegQualityRef.current = data.jpeg_quality;
+                        if (intervalRef.current && captureFrameRef.current) {
+                            clearInterval(intervalRef.current);
+                            intervalRef.current = window.setInterval(captureFrameRef.current, captureIntervalMsRef.current);
+                        }
+                    } else if (data.type === 'report') {
+                        setReport(data.payload);
+                        onStatusChange?.('Report Received');
+                    } else if (data.type === 'error' && data.code === 'busy') {
+                        // The server's queue was full and this request was not processed
+                        onStatusChange?.(`Server busy, please retry (${data.message_type})`);
                     }
-                } else if (data.type === 'question') {
-                    const qText = data.payload.question_text;
-                    setCurrentQuestion(qText);
-                    speakText(qText); // Trigger TTS
-                } else if (data.type === 'report') {
-                    setReport(data.payload);
-                    onStatusChange?.('Report Received');
+                } catch (e) {
+                    console.error("Error parsing message", e);
                 }
-            } catch (e) {
-                console.error("Error parsing message", e);
-            }
-        };
-
-        socketRef.current.onclose = () => {
-            console.log('Disconnected from Backend');
-            onStatusChange?.('Disconnected');
+            };
+
+            socketRef.current.onclose = (event) => {
+                if (event.code === 1013 && !disposed) {
+                    // Server is still loading models (see /ready); try again shortly
+                    onStatusChange?.('Server warming up...');
+                    retryTimer = window.setTimeout(connect, 2000);
+                    return;
+                }
+                if (event.code === 4000) {
+                    // Another connection (tab, device or reconnect to another worker) took over the interview
+                    onStatusChange?.('Session continued elsewhere');
+                    return;
+                }
+                console.log('Disconnected from Backend');
+                onStatusChange?.('Disconnected');
+            };
         };
+        connect();
 
         return () => {
+            disposed = true;
+            window.clearTimeout(retryTimer);
             socketRef.current?.close();
         };
     }, [onStatusChange, sessionStartTime]);
@@ -111,6 +231,7 @@ const MediaCapture: React.FC<MediaCaptureProps> = ({ onStatusChange }) => {
     const [jobDescription, setJobDescription] = useState<string>("");
 
     const startCapture = async () => {
+        interviewId(true); // the reconnect triggered by the new start time uses it
         setReport(null);
         setTranscriptLog([]);
         setVisualLog([]);
@@ -235,16 +356,29 @@ const MediaCapture: React.FC<MediaCaptureProps> = ({ onStatusChange }) => {
         video.srcObject = processingStream;
         video.play();
 
-        intervalRef.current = window.setInterval(() => {
+        const captureFrame = () => {
             if (!ctx || video.videoWidth === 0) return;
             canvas.width = video.videoWidth;
             canvas.height = video.videoHeight;
             ctx.drawImage(video, 0, 0);
-            const frameData = canvas.toDataURL('image/jpeg', 0.7);
+            if (USE_BINARY_FRAMES) {
+                const timestamp = Date.now();
+                canvas.toBlob(async (blob) => {
+                    if (!blob || socketRef.current?.readyState !== WebSocket.OPEN) return;
+                    const data = await blob.arrayBuffer();
+                    socketRef.current.send(encodeBinaryFrame('video', data, timestamp));
+                    keepFrame(data);
+                }, 'image/jpeg', jpegQualityRef.current);
+                return;
+            }
+            const frameData = canvas.toDataURL('image/jpeg', jpegQualityRef.current);
             if (socketRef.current?.readyState === WebSocket.OPEN) {
                 socketRef.current.send(JSON.stringify({ type: 'video', payload: frameData, timestamp: Date.now() }));
+                keepFrame(dataUrlBytes(frameData));
             }
-        }, 1000);
+        };
+        captureFrameRef.current = captureFrame;
+        intervalRef.current = window.setInterval(captureFrame, captureIntervalMsRef.current);
     };
 
     const stopCapture = () => {
@@ -264,6 +398,7 @@ const MediaCapture: React.FC<MediaCaptureProps> = ({ onStatusChange }) => {
         }
 
         if (intervalRef.current) clearInterval(intervalRef.current);
+        intervalRef.current = null;
         setIsCapturing(false);
         onStatusChange?.('Stopped. Generating Report...');
     };
@@ -0,0 +1,306 @@
+"""
+Offline capacity test: N concurrent simulated candidates against the real
+message handling (StreamManager, per-session pipelines, engines, ProviderGuard,
+caches), with the mock LLM provider in place of Groq/OpenRouter.
+
+Each candidate connects, sends the job description, then until the end of the run:
+  - streams 0.5 s WAV audio chunks (speech bursts and pauses) and, while speaking,
+    a browser transcript (transcript_client) per utterance
+  - sends JPEG screen frames at 1 fps, following the server's rate_control
+    messages, switching slides every --slide-seconds
+  - answers each question it receives by speaking for --answer-seconds, then
+    sends submit_answer
+and finally end_session. Runs in-process on one event loop, no network.
+
+Reports, per client message type, the time from dispatch to handler completion
+(queueing + processing) at p50/p95/p99 and messages/s; reply latencies from
+submit_answer to the evaluation and next question; frames dropped by the video
+lane; and event-loop lag. With --max-p95-ms / --max-lag-ms it exits non-zero
+when a budget is exceeded, so it can gate capacity regressions in CI.
+
+Usage: python load_test.py [--candidates 20] [--duration 60] [--ramp 10]
+       [--chat-latency 0.6,1.5] [--vision-latency 1.2,3.0] [--transcribe-latency 0.35,0.9]
+       [--error-rate 0.02] [--seed 0] [--max-p95-ms submit_answer=8000,video=3000]
+       [--max-lag-ms 100] [--json results.json]
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import struct
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+SAMPLE_RATE = 16000
+WORDS = ("our pipeline consumes events from kafka and we cache user profiles in redis "
+         "then the api serves them through fastapi with postgres behind it").split()
+JD = """Backend Engineer
+Requirements:
+- Python, FastAPI, asyncio
+- PostgreSQL and Redis
+- Docker, CI/CD
+"""
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def wav_chunk(rng: random.Random, speech: bool, seconds: float = 0.5) -> bytes:
+    n = int(SAMPLE_RATE * seconds)
+    amplitude = 3000 if speech else 40
+    # Syllable-rate (~4 Hz) envelope over noise
+    samples = [int(amplitude * (0.6 + 0.4 * math.sin(2 * math.pi * 4 * i / SAMPLE_RATE)) * rng.uniform(-1, 1)) for i in range(n)]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(struct.pack(f"<{n}h", *samples))
+    return buffer.getvalue()
+
+def render_slides(count: int) -> list:
+    from PIL import Image, ImageDraw
+    slides = []
+    for i in range(count):
+        image = Image.new("RGB", (1280, 720), (250, 250, 250))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((0, 0, 1280, 90), fill=(30 + 40 * i % 200, 60, 120))
+        for line in range(8):
+            draw.text((60, 140 + line * 60), " ".join(WORDS[(i + line) % len(WORDS):][:6]), fill=(20, 20, 20))
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=70)
+        slides.append(out.getvalue())
+    return slides
+
+class Metrics:
+    def __init__(self):
+        self.handled = {}  # msg type -> [seconds]
+        self.replies = {}  # "submit_answer->question" -> [seconds]
+        self.lag = []
+        self.received = {}
+        self.frames_dropped = 0
+
+    def add(self, table: dict, key: str, seconds: float):
+        table.setdefault(key, []).append(seconds)
+
+class CandidateSocket:
+    """The subset of fastapi.WebSocket StreamManager uses, feeding replies to the candidate."""
+    def __init__(self, candidate):
+        self.candidate = candidate
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.candidate.on_message(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.candidate.closed = True
+
+class Candidate:
+    def __init__(self, index: int, manager, metrics: Metrics, args, slides: list, audio: dict):
+        self.client_id = f"load-{index}"
+        self.manager = manager
+        self.metrics = metrics
+        self.args = args
+        self.slides = slides
+        self.audio = audio
+        self.rng = random.Random(args.seed * 1000 + index)
+        self.session = None
+        self.closed = False
+        self.frame_interval = 1.0
+        self.speaking_until = 0.0
+        self.submitted_at = None
+        self.answer_task = None
+
+    def on_message(self, message: dict):
+        kind = message.get("type")
+        self.metrics.received[kind] = self.metrics.received.get(kind, 0) + 1
+        now = time.perf_counter()
+        if kind == "rate_control":
+            # Frames are pre-rendered, so only the rate is followed (not jpeg_quality)
+            self.frame_interval = 1.0 / message["fps"]
+        elif kind == "evaluation" and self.submitted_at is not None:
+            self.metrics.add(self.metrics.replies, "submit_answer->evaluation", now - self.submitted_at)
+        elif kind == "question":
+            if self.submitted_at is not None:
+                self.metrics.add(self.metrics.replies, "submit_answer->question", now - self.submitted_at)
+                self.submitted_at = None
+            if self.answer_task is None or self.answer_task.done():
+                self.answer_task = asyncio.get_running_loop().create_task(self.answer())
+
+    async def send(self, message: dict):
+        message["timestamp"] = int(time.time() * 1000)
+        await self.manager.dispatch(self.session, message)
+
+    async def answer(self):
+        await asyncio.sleep(0.5)
+        self.speaking_until = time.perf_counter() + self.args.answer_seconds
+        await asyncio.sleep(self.args.answer_seconds + 0.5)
+        if not self.closed:
+            self.submitted_at = time.perf_counter()
+            await self.send({"type": "submit_answer", "payload": ""})
+
+    async def audio_loop(self, stop_at: float):
+        while time.perf_counter() < stop_at and not self.closed:
+            now = time.perf_counter()
+            # Outside answers: occasional narration over the slides
+            if now >= self.speaking_until and self.rng.random() < 0.08:
+                self.speaking_until = now + self.rng.uniform(2, 6)
+            speaking = now < self.speaking_until
+            await self.send({"type": "audio", "data": self.rng.choice(self.audio[speaking])})
+            if speaking and self.rng.random() < 0.2:
+                await self.send({"type": "transcript_client", "payload": " ".join(self.rng.choice(WORDS) for _ in range(10))})
+            await asyncio.sleep(0.5)
+
+    async def video_loop(self, stop_at: float):
+        slide = 0
+        next_switch = time.perf_counter() + self.args.slide_seconds
+        while time.perf_counter() < stop_at and not self.closed:
+            if time.perf_counter() >= next_switch:
+                slide = (slide + 1) % len(self.slides)
+                next_switch += self.args.slide_seconds
+            await self.send({"type": "video", "data": self.slides[slide]})
+            await asyncio.sleep(self.frame_interval)
+
+    async def run(self, delay: float, stop_at: float):
+        await asyncio.sleep(delay)
+        self.session = await self.manager.connect(CandidateSocket(self), self.client_id)
+        await self.send({"type": "job_description", "payload": JD})
+        await asyncio.gather(self.audio_loop(stop_at), self.video_loop(stop_at))
+        if self.answer_task:
+            self.answer_task.cancel()
+        await self.send({"type": "end_session"})
+        await asyncio.sleep(2)
+        self.metrics.frames_dropped += self.session.pipeline.video.dropped if self.session.pipeline else 0
+        await self.manager.disconnect(self.session.websocket, self.client_id)
+
+async def lag_monitor(metrics: Metrics, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        metrics.lag.append(time.perf_counter() - start - interval)
+
+def parse_budgets(spec: str) -> dict:
+    budgets = {}
+    for item in filter(None, spec.split(",")):
+        key, _, value = item.partition("=")
+        budgets[key.strip()] = float(value)
+    return budgets
+
+async def main(args):
+    # Configure before the app reads settings
+    os.environ.update({
+        "MOCK_PROVIDER": "true",
+        "MOCK_SEED": str(args.seed),
+        "MOCK_CHAT_LATENCY": args.chat_latency,
+        "MOCK_VISION_LATENCY": args.vision_latency,
+        "MOCK_TRANSCRIBE_LATENCY": args.transcribe_latency,
+        "MOCK_ERROR_RATE": str(args.error_rate),
+        "SESSION_STORE": "memory",
+        "EVENT_LOG_DIR": "",
+        "ASR_BACKEND": "groq",
+        "VISION_BACKEND": "llm"
+    })
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+    from app.core.llm_client import llm_client
+    from app.services.stream_manager import StreamManager
+
+    metrics = Metrics()
+
+    class InstrumentedManager(StreamManager):
+        async def dispatch(self, session, message):
+            message.setdefault("_dispatched_at", time.perf_counter())
+            await super().dispatch(session, message)
+
+        async def handle_message(self, session, message):
+            await super().handle_message(session, message)
+            if "_dispatched_at" in message:
+                metrics.add(metrics.handled, message.get("type"), time.perf_counter() - message["_dispatched_at"])
+
+    manager = InstrumentedManager()
+    llm_client.connect()
+    rng = random.Random(args.seed)
+    slides = render_slides(4)
+    audio = {True: [wav_chunk(rng, True) for _ in range(4)], False: [wav_chunk(rng, False) for _ in range(2)]}
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(lag_monitor(metrics, stop))
+    start = time.perf_counter()
+    stop_at = start + args.ramp + args.duration
+    candidates = [Candidate(i, manager, metrics, args, slides, audio) for i in range(args.candidates)]
+    print(f"{args.candidates} candidates, {args.ramp:.0f}s ramp + {args.duration:.0f}s, mock provider "
+          f"(chat {args.chat_latency}, vision {args.vision_latency}, transcribe {args.transcribe_latency}, errors {args.error_rate:.0%})")
+    await asyncio.gather(*(c.run(args.ramp * i / max(1, args.candidates), stop_at) for i, c in enumerate(candidates)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    results = {"candidates": args.candidates, "seconds": round(elapsed, 1), "handled": {}, "replies": {}}
+    print(f"\n{'message':<28} {'count':>7} {'msg/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for table, key in ((metrics.handled, "handled"), (metrics.replies, "replies")):
+        for name, values in sorted(table.items()):
+            row = {
+                "count": len(values),
+                "per_s": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 1)
+            }
+            results[key][name] = row
+            print(f"{name:<28} {row['count']:>7} {row['per_s']:>7.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+    total = sum(len(v) for v in metrics.handled.values())
+    results["messages_per_s"] = round(total / elapsed, 1)
+    results["loop_lag_ms"] = {
+        "p50": round(percentile(metrics.lag, 0.50) * 1000, 2),
+        "p99": round(percentile(metrics.lag, 0.99) * 1000, 2),
+        "max": round(max(metrics.lag, default=0) * 1000, 2)
+    }
+    results["provider"] = llm_client.router.stats()
+    results["received"] = metrics.received
+    results["frames_dropped"] = metrics.frames_dropped
+    print(f"\nmessages/s: {results['messages_per_s']}   event-loop lag ms: p50 {results['loop_lag_ms']['p50']}, "
+          f"p99 {results['loop_lag_ms']['p99']}, max {results['loop_lag_ms']['max']}")
+    print(f"video frames dropped (newer frame queued): {metrics.frames_dropped}")
+    print(f"replies received: " + ", ".join(f"{k} {v}" for k, v in sorted(metrics.received.items())))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    for name, budget in parse_budgets(args.max_p95_ms).items():
+        row = results["handled"].get(name) or results["replies"].get(name)
+        if row and row["p95_ms"] > budget:
+            failures.append(f"{name} p95 {row['p95_ms']}ms > {budget:.0f}ms")
+    if args.max_lag_ms and results["loop_lag_ms"]["p99"] > args.max_lag_ms:
+        failures.append(f"event-loop lag p99 {results['loop_lag_ms']['p99']}ms > {args.max_lag_ms:.0f}ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--ramp", type=float, default=10)
+    parser.add_argument("--answer-seconds", type=float, default=8)
+    parser.add_argument("--slide-seconds", type=float, default=20)
+    parser.add_argument("--chat-latency", default="0.6,1.5")
+    parser.add_argument("--vision-latency", default="1.2,3.0")
+    parser.add_argument("--transcribe-latency", default="0.35,0.9")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-p95-ms", default="")
+    parser.add_argument("--max-lag-ms", type=float, default=0)
+    parser.add_argument("--json", default="")
+    sys.exit(asyncio.run(main(parser.parse_args())))
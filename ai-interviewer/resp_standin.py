@@ -0,0 +1,183 @@
+"""
+Local stand-in for a Redis server, for trying SESSION_STORE=redis without one.
+
+Speaks RESP2 and implements the commands the session store uses (strings,
+hashes, EXPIRE, and WATCH / MULTI / EXEC optimistic transactions with Redis
+semantics: EXEC returns nil if a watched key changed since WATCH). Single
+process, in memory, no persistence; not for production.
+
+Usage: python resp_standin.py [--host 127.0.0.1] [--port 6379]
+Then run the backend with SESSION_STORE=redis REDIS_URL=redis://127.0.0.1:6379/0
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.resp import RespError, read_reply
+
+# EXEC reply when a watched key changed
+NIL_ARRAY = object()
+
+def encode(value) -> bytes:
+    if value is NIL_ARRAY:
+        return b"*-1\r\n"
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+
+class RespStandIn:
+    def __init__(self):
+        self.data = {}      # key -> bytes | dict
+        self.expires = {}   # key -> monotonic deadline
+        self.versions = {}  # key -> modification counter, for WATCH
+        self.commands = 0
+        self.server = None
+
+    def _live(self, key):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._delete(key)
+        return self.data.get(key)
+
+    def _touch(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def _delete(self, key) -> int:
+        self.expires.pop(key, None)
+        if self.data.pop(key, None) is None:
+            return 0
+        self._touch(key)
+        return 1
+
+    def _hash(self, key) -> dict:
+        value = self._live(key)
+        if value is None:
+            value = self.data[key] = {}
+        if not isinstance(value, dict):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def run(self, name: str, args: list):
+        if name == "PING":
+            return "PONG"
+        if name in ("AUTH", "SELECT", "CLIENT"):
+            return "OK"
+        if name == "GET":
+            return self._live(args[0])
+        if name == "SET":
+            self.data[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            self._touch(args[0])
+            return "OK"
+        if name == "DEL":
+            return sum(self._delete(key) for key in args)
+        if name == "EXISTS":
+            return sum(self._live(key) is not None for key in args)
+        if name == "HSET":
+            value = self._hash(args[0])
+            added = sum(field not in value for field in args[1::2])
+            value.update(zip(args[1::2], args[2::2]))
+            self._touch(args[0])
+            return added
+        if name == "HGET":
+            return (self._live(args[0]) or {}).get(args[1])
+        if name == "HMGET":
+            value = self._live(args[0]) or {}
+            return [value.get(field) for field in args[1:]]
+        if name == "HGETALL":
+            return [item for pair in (self._live(args[0]) or {}).items() for item in pair]
+        if name == "EXPIRE":
+            if self._live(args[0]) is None:
+                return 0
+            self.expires[args[0]] = time.monotonic() + int(args[1])
+            return 1
+        if name == "DBSIZE":
+            return sum(self._live(key) is not None for key in list(self.data))
+        if name == "FLUSHALL":
+            for key in list(self.data):
+                self._delete(key)
+            return "OK"
+        raise RespError(f"ERR unknown command '{name}'")
+
+    def run_queued(self, name: str, args: list):
+        try:
+            return self.run(name, args)
+        except RespError as e:
+            return e
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        watched = {}   # key -> version at WATCH
+        queued = None  # commands inside MULTI
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    break
+                self.commands += 1
+                name, args = command[0].decode().upper(), command[1:]
+                if name == "WATCH":
+                    watched.update({key: self.versions.get(key, 0) for key in args})
+                    reply = "OK"
+                elif name == "UNWATCH":
+                    watched.clear()
+                    reply = "OK"
+                elif name == "MULTI":
+                    queued = []
+                    reply = "OK"
+                elif name == "DISCARD":
+                    queued, reply = None, "OK"
+                    watched.clear()
+                elif name == "EXEC":
+                    if queued is None:
+                        reply = RespError("ERR EXEC without MULTI")
+                    elif any(self.versions.get(key, 0) != version for key, version in watched.items()):
+                        reply = NIL_ARRAY
+                    else:
+                        reply = [self.run_queued(queued_name, queued_args) for queued_name, queued_args in queued]
+                    queued = None
+                    watched.clear()
+                elif queued is not None:
+                    queued.append((name, args))
+                    reply = "QUEUED"
+                else:
+                    reply = self.run_queued(name, args)
+                writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the stand-in is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 6379):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+async def main(args):
+    standin = RespStandIn()
+    port = await standin.start(args.host, args.port)
+    print(f"RESP stand-in listening on {args.host}:{port}")
+    await standin.server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    asyncio.run(main(parser.parse_args()))
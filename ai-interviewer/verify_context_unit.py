@@ -1,7 +1,8 @@
-from app.services.context_engine import context_engine
+from app.services.context_engine import ContextEngine
 
 def test_context_engine():
     print("Testing Context Engine Logic...")
+    context_engine = ContextEngine()
     
     # 1. Test Transcript Update
     context_engine.update_transcript("I am building a backend with Python and FastAPI.")
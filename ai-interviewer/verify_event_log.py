@@ -0,0 +1,101 @@
+"""
+Session recovery from the event log (app.services.event_log, InterviewSession.resume).
+
+An interview is recorded with EVENT_LOG_DIR set and a small snapshot interval,
+so recovery goes through snapshot + replay. Then:
+
+- the same resume token restores an identical snapshot(), also after a crash
+  (no close) that left a torn final line
+- a different token doesn't resume and deletes the saved log
+- EventLog.reset() leaves nothing to load
+
+Usage: python verify_event_log.py [--events 60]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.config import settings
+
+settings.EVENT_LOG_FSYNC_MS = 10
+settings.EVENT_LOG_SNAPSHOT_EVERY = 16
+
+from app.services.session import InterviewSession, InterviewState
+
+def check(label: str, passed: bool, detail: str = "") -> bool:
+    print(f"[{'PASS' if passed else 'FAIL'}] {label}" + ("" if passed else f" ({detail})"))
+    return passed
+
+async def record_interview(client_id: str, token: str, events: int) -> InterviewSession:
+    session = InterviewSession(client_id)
+    session.record("reset", token=token)
+    session.record("job_description", text="Backend engineer: Python, FastAPI, Redis, Kafka")
+    asked = 1
+    session.record("question", text="Introduce yourself and your project.", phase_index=0, asked=asked)
+    for i in range(events):
+        session.record("transcript", text=f"we shard the kafka consumers by tenant, part {i}")
+        session.record("answer", text=f"part {i}")
+        if i % 10 == 9:
+            session.record("answer_submitted", question=session.last_asked_question,
+                           answer=session.current_answer_buffer)
+            session.record("evaluation", index=len(session.session_history) - 1, score=7, feedback="Solid.")
+            asked += 1
+            session.record("question", text=f"Follow-up {asked}?", phase_index=0, asked=asked)
+    session.record("state", state=InterviewState.AWAITING_ANSWER.value)
+    if session.event_log.snapshot_task is not None:
+        await session.event_log.snapshot_task
+    await session.event_log.sync()
+    return session
+
+async def main(args) -> int:
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.EVENT_LOG_DIR = tmp
+
+        original = await record_interview("cand-1", "token-1", args.events)
+        expected = original.snapshot()
+        snapshots = original.event_log.snapshots
+        original.close()
+        ok &= check("interview compacted into snapshots while recording", snapshots > 0, f"{snapshots}")
+
+        restored = InterviewSession("cand-1")
+        resumed = await restored.resume(None, "token-1")
+        ok &= check("same token resumes", resumed)
+        ok &= check("restored state equals the recorded state", restored.snapshot() == expected)
+        restored.close()
+
+        crashed = await record_interview("cand-2", "token-2", args.events)
+        expected = crashed.snapshot()
+        # Crash: no close(); the last write was cut off half-way
+        with open(crashed.event_log.log_path, "a", encoding="utf-8") as f:
+            f.write('{"seq": 999999, "type": "transcr')
+        recovered = InterviewSession("cand-2")
+        resumed = await recovered.resume(None, "token-2")
+        ok &= check("recovers after a crash with a torn final line",
+                    resumed and recovered.snapshot() == expected)
+        recovered.close()
+
+        stranger = InterviewSession("cand-1")
+        resumed = await stranger.resume(None, "another-interview")
+        stranger.close()
+        ok &= check("a different token starts fresh", not resumed)
+        again = InterviewSession("cand-1")
+        ok &= check("... and the old interview's log is deleted", not await again.resume(None, "token-1"))
+        again.close()
+
+        finished = await record_interview("cand-3", "token-3", 5)
+        await finished.event_log.reset()
+        state, events = finished.event_log.load()
+        ok &= check("EventLog.reset() leaves nothing to load", state is None and events == [],
+                    f"{len(events)} events")
+        finished.close()
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=60)
+    sys.exit(asyncio.run(main(parser.parse_args())))
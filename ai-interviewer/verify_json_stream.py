@@ -0,0 +1,75 @@
+"""
+Streaming JSON field extraction (app.core.json_stream) under every chunking.
+
+Each case is a JSON object as an LLM would stream it; it is fed to
+JSONStringFieldExtractor in chunks of 1, 2, 3, 7 and all characters. The joined
+deltas must equal the decoded field (json.loads) and always encode as UTF-8:
+escapes split across chunks, \\uXXXX escapes, surrogate pairs (escaped emoji)
+and unpaired surrogates (which become U+FFFD).
+
+Usage: python verify_json_stream.py
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.json_stream import JSONStringFieldExtractor, parse_json_object
+
+CHUNK_SIZES = (1, 2, 3, 7, None)
+
+# (label, streamed text, expected value or None for json.loads' value)
+CASES = (
+    ("plain", '{"question_text": "How does the cache expire?", "difficulty": "Mid"}', None),
+    ("field not first", '{"topic": "Caching", "question_text": "Why Redis?"}', None),
+    ("simple escapes", r'{"question_text": "Line one\nLine \"two\" \\ back\/slash\ttab"}', None),
+    ("unicode escape", r'{"question_text": "caf\u00e9 na\u00efve"}', None),
+    ("surrogate pair", r'{"question_text": "Nice \ud83d\ude00 work"}', None),
+    ("raw emoji", '{"question_text": "Nice \U0001F600 work"}', None),
+    ("lone high surrogate", r'{"question_text": "bad \ud83dy"}', "bad \ufffdy"),
+    ("high surrogate at end", r'{"question_text": "bad \ud83d"}', "bad \ufffd"),
+    ("lone low surrogate", r'{"question_text": "bad \ude00 x"}', "bad \ufffd x"),
+    ("high + non-surrogate", r'{"question_text": "\ud83dA"}', "\ufffdA"),
+)
+
+def chunks(text: str, size):
+    if size is None:
+        return [text]
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def main() -> int:
+    ok = True
+    for label, text, expected in CASES:
+        if expected is None:
+            expected = json.loads(text)["question_text"]
+        results = set()
+        encodable = True
+        for size in CHUNK_SIZES:
+            extractor = JSONStringFieldExtractor("question_text")
+            value = "".join(extractor.feed(chunk) for chunk in chunks(text, size))
+            results.add(value)
+            try:
+                value.encode("utf-8")
+            except UnicodeEncodeError:
+                encodable = False
+        passed = results == {expected} and encodable
+        print(f"[{'PASS' if passed else 'FAIL'}] {label}: {expected!r}"
+              + ("" if passed else f" got {sorted(results)!r}"))
+        ok = ok and passed
+
+    extractor = JSONStringFieldExtractor("question_text")
+    extractor.feed('{"question_text": "done"')
+    late = extractor.feed(', "other": "ignored"}')
+    passed = late == "" and extractor.done and extractor.value == "done"
+    print(f"[{'PASS' if passed else 'FAIL'}] nothing emitted after the closing quote")
+    ok = ok and passed
+
+    fenced = 'Here you go:\n```json\n{"question_text": "Why?", "topic": "Design"}\n```'
+    passed = parse_json_object(fenced) == {"question_text": "Why?", "topic": "Design"}
+    print(f"[{'PASS' if passed else 'FAIL'}] parse_json_object tolerates prose and code fences")
+    ok = ok and passed
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Keyword matching on word boundaries (app.core.keyword_matcher).
+
+Checks whole-word matching ("go" not in "good", "java" not in "javascript"),
+punctuated terms ("c++", "c#"), aliases, case and whitespace folding, and that
+KeywordStream finds the same terms when the text arrives split into segments,
+including a multi-word term split across two of them.
+
+Usage: python verify_keyword_matcher.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.keyword_matcher import KeywordMatcher
+from app.core.keywords import KEYWORD_ALIASES, TECHNICAL_KEYWORDS
+
+# (text, terms that must match, terms that must not)
+CASES = (
+    ("this is a good design", set(), {"go"}),
+    ("we use go for the workers", {"go"}, set()),
+    ("golang services", {"go"}, set()),
+    ("the frontend is javascript", {"javascript"}, {"java"}),
+    ("java and javascript", {"java", "javascript"}, set()),
+    ("written in c++ and c#", {"c++", "c#"}, set()),
+    ("our cpp engine", {"c++"}, set()),
+    ("Deployed on K8S with Postgres", {"kubernetes", "postgresql"}, set()),
+    ("a REST   API over http", {"rest api"}, set()),
+    ("restful apis everywhere", set(), {"rest api"}),
+    ("python_scripts and pythonic code", set(), {"python"}),
+    ("(python), [redis]; docker.", {"python", "redis", "docker"}, set()),
+)
+
+def check(label: str, passed: bool, detail: str = "") -> bool:
+    print(f"[{'PASS' if passed else 'FAIL'}] {label}" + ("" if passed else f" ({detail})"))
+    return passed
+
+def main() -> int:
+    matcher = KeywordMatcher(TECHNICAL_KEYWORDS, KEYWORD_ALIASES)
+    ok = True
+    for text, present, absent in CASES:
+        found = matcher.scan(text)
+        passed = present <= found and not (absent & found)
+        ok &= check(repr(text), passed, f"found {sorted(found)}")
+
+    segments = ["we deploy with docker and a rest", "api backed by postgres,", "then go workers"]
+    stream = matcher.stream()
+    streamed = set()
+    for segment in segments:
+        streamed |= stream.feed(segment)
+    streamed |= stream.flush()
+    whole = matcher.scan(" ".join(segments))
+    ok &= check("stream over segments matches a scan of the joined text", streamed == whole,
+                f"stream {sorted(streamed)} vs scan {sorted(whole)}")
+    ok &= check("multi-word term split across segments", "rest api" in streamed)
+
+    # Unseparated chunks (e.g. streamed tokens): "java" + "script" is one word
+    stream = matcher.stream(separator="")
+    found = stream.feed("the frontend is java") | stream.feed("script today") | stream.flush()
+    ok &= check("a match at a chunk end waits for the next chunk's boundary",
+                "javascript" in found and "java" not in found, sorted(found))
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Provider routing under a simulated cloud brown-out (no network, no models).
+
+A mock "groq" transcription backend (app.core.mock_provider) goes through four
+phases while a stand-in local engine with a fixed 1.5 s latency waits as the
+fallback:
+
+  healthy   groq answers in ~0.4 s             -> served by groq
+  outage    every groq call fails (503)        -> breaker opens, local serves
+  slow      groq answers, but in ~6 s          -> local serves, groq only probed
+  recovered groq back to ~0.4 s                -> probe succeeds, groq serves again
+
+Per phase: which backend served each call, p50/max latency and groq's breaker
+state. Every call must get a transcript; in the outage no call should wait for
+groq retries once the breaker is open.
+
+Then the real local backend (with a recording stand-in engine) is given headerless
+PCM16 at 16 and 8 kHz and a headerless webm continuation chunk: the PCM must reach
+the engine as 16 kHz samples, the webm chunk must come back empty without counting
+as a backend failure.
+
+Usage: python verify_provider_router.py [--calls 12] [--gap 0.5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.config import settings
+
+# Time-compressed so the whole run takes well under a minute
+settings.PROVIDER_BREAKER_COOLDOWN = 2.0
+settings.PROVIDER_PROBE_SECONDS = 5.0
+settings.LLM_BACKOFF_BASE = 0.1
+settings.MOCK_TRANSCRIBE_LATENCY = "0.4,0.6"
+
+from app.core.mock_provider import LatencyModel, MockProvider
+from app.core.providers import LocalASRBackend, ProviderRouter, cloud_backends
+
+class StandInLocalASR:
+    """Local engine stand-in: always answers, in a fixed 1.5 s."""
+    name = "local_asr"
+    local = True
+    capabilities = {"transcribe"}
+
+    async def transcribe(self, audio_bytes, **_):
+        await asyncio.sleep(1.5)
+        return "local transcript"
+
+    def stats(self):
+        return {}
+
+class RecordingEngine:
+    """Stands in for the faster-whisper engine; records how many samples it got."""
+    def __init__(self):
+        self.received = []
+
+    async def transcribe(self, samples, **_):
+        self.received.append(len(samples))
+        return f"{len(samples)} samples"
+
+async def check_local_inputs() -> bool:
+    from app.services import streaming_asr
+    engine = RecordingEngine()
+    streaming_asr._engine = engine
+    router = ProviderRouter()
+    router.register(LocalASRBackend())
+    health = router.health[("local_asr", "transcribe")]
+    # Continuation chunks carry no EBML header: just cluster/block bytes
+    webm_tail = bytes.fromhex("1f43b675") + bytes(range(200))
+    cases = (
+        ("pcm 16 kHz", dict(audio_bytes=bytes(32000), pcm=True, sample_rate=16000), 16000),
+        ("pcm 8 kHz", dict(audio_bytes=bytes(16000), pcm=True, sample_rate=8000), 16000),
+        ("webm chunk", dict(audio_bytes=webm_tail, filename="audio.webm"), None),
+    )
+    ok = True
+    for label, request, expected in cases:
+        before = len(engine.received)
+        try:
+            text = await router.call("transcribe", 5.0, **request)
+        except Exception as e:
+            text = f"error: {e}"
+        got = engine.received[before] if len(engine.received) > before else None
+        passed = got == expected and (text == "" if expected is None else bool(text))
+        print(f"  {label:<11} -> engine samples {got}, text {text!r}{'' if passed else '  <- unexpected'}")
+        ok = ok and passed
+    ok = ok and health.failures == 0
+    print(f"  local_asr failures recorded: {health.failures}")
+    streaming_asr._engine = None
+    return ok
+
+PHASES = (
+    ("healthy", "0.4,0.6", 0.0),
+    ("outage", "0.4,0.6", 1.0),
+    ("slow", "6,7", 0.0),
+    ("recovered", "0.4,0.6", 0.0),
+)
+
+async def main(args):
+    groq = MockProvider("groq")
+    router = ProviderRouter()
+    router.register(cloud_backends(groq, None)[0])
+    router.register(StandInLocalASR())
+    audio = bytes(32000)
+
+    ok = True
+    print(f"{'phase':<10} {'groq':>5} {'local':>6} {'failed':>7} {'p50 s':>6} {'max s':>6}  breaker")
+    for phase, latency, error_rate in PHASES:
+        groq.transcribe_latency = LatencyModel(latency)
+        groq.error_rate = error_rate
+        served, latencies, failed = {"groq": 0, "local_asr": 0}, [], 0
+        for i in range(args.calls):
+            before = {name: router.health[(name, "transcribe")].calls - router.health[(name, "transcribe")].failures
+                      for name in served}
+            start = time.perf_counter()
+            try:
+                text = await router.call("transcribe", settings.TRANSCRIBE_DEADLINE_SECONDS,
+                                         audio_bytes=audio + bytes([i]), filename="a.wav")
+            except Exception as e:
+                text = None
+                print(f"  call failed: {e}")
+            latencies.append(time.perf_counter() - start)
+            if not text:
+                failed += 1
+            for name in served:
+                health = router.health[(name, "transcribe")]
+                served[name] += (health.calls - health.failures) - before[name]
+            await asyncio.sleep(args.gap)
+        breaker = router.health[("groq", "transcribe")].breaker.state
+        print(f"{phase:<10} {served['groq']:>5} {served['local_asr']:>6} {failed:>7} "
+              f"{statistics.median(latencies):>6.2f} {max(latencies):>6.2f}  {breaker}")
+        ok = ok and failed == 0
+    print(f"\nfailovers {router.failovers}, degraded {router.degraded}, unavailable {router.unavailable}")
+    print("[PASS] every call answered" if ok else "[FAIL] some calls got no transcript")
+
+    print("\nlocal backend inputs")
+    inputs_ok = await check_local_inputs()
+    print("[PASS] local backend decodes PCM, skips undecodable chunks" if inputs_ok
+          else "[FAIL] local backend mishandled an input")
+    return 0 if ok and inputs_ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=12)
+    parser.add_argument("--gap", type=float, default=0.5)
+    sys.exit(asyncio.run(main(parser.parse_args())))
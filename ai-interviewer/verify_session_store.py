@@ -0,0 +1,92 @@
+"""
+Session store contract (app.services.session_store), for the in-process store
+and the Redis-protocol store.
+
+The Redis store runs against the local RESP stand-in (resp_standin.py), or a
+real server with --redis-url. For each store:
+
+- an unknown session loads as (0, None)
+- save/load round-trips the state (non-ASCII text included) and bumps the version
+- a save with a stale version is refused and counted as a conflict
+- of several concurrent saves from the same version exactly one wins
+- a session expires ttl seconds after its last save; delete() removes it
+
+Usage: python verify_session_store.py [--redis-url redis://127.0.0.1:6379/0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.services.session_store import MemorySessionStore, RedisSessionStore
+from resp_standin import RespStandIn
+
+STATE = {"state": "awaiting_answer", "session_history": [{"question": "Caf\u00e9 app?", "answer": "Yes \U0001F600"}]}
+
+def check(label: str, passed: bool, detail: str = "") -> bool:
+    print(f"[{'PASS' if passed else 'FAIL'}] {label}" + ("" if passed else f" ({detail})"))
+    return passed
+
+async def verify(name: str, make_store) -> bool:
+    print(f"\n{name}")
+    store = make_store(ttl_seconds=3600)
+    short_lived = make_store(ttl_seconds=1)
+    client_id = f"verify-{uuid.uuid4().hex[:8]}"
+    ok = True
+    try:
+        ok &= check("unknown session loads as (0, None)", await store.load(client_id) == (0, None))
+
+        version = await store.save(client_id, STATE, 0)
+        ok &= check("first save returns version 1", version == 1, f"{version}")
+        ok &= check("load round-trips the state", await store.load(client_id) == (1, STATE))
+
+        stale = await store.save(client_id, {"state": "monitoring"}, 0)
+        ok &= check("stale save is refused", stale is None and store.conflicts == 1,
+                    f"{stale}, {store.conflicts} conflicts")
+        ok &= check("refused save changed nothing", await store.load(client_id) == (1, STATE))
+
+        results = await asyncio.gather(*(store.save(client_id, {"writer": i}, 1) for i in range(4)))
+        winners = [i for i, result in enumerate(results) if result == 2]
+        version, state = await store.load(client_id)
+        ok &= check("one of four concurrent saves wins", len(winners) == 1 and results.count(None) == 3,
+                    f"{results}")
+        ok &= check("the winner's state is stored", winners and (version, state) == (2, {"writer": winners[0]}))
+
+        await store.delete(client_id)
+        ok &= check("delete() removes the session", await store.load(client_id) == (0, None))
+
+        await short_lived.save(client_id, STATE, 0)
+        await asyncio.sleep(1.2)
+        ok &= check("session expires after its ttl", await short_lived.load(client_id) == (0, None))
+        ok &= check("an expired session can be saved again from version 0",
+                    await short_lived.save(client_id, STATE, 0) == 1)
+        await short_lived.delete(client_id)
+    finally:
+        await store.close()
+        await short_lived.close()
+    return ok
+
+async def main(args) -> int:
+    ok = await verify("memory", lambda ttl_seconds: MemorySessionStore(ttl_seconds))
+
+    standin = None
+    url = args.redis_url
+    if url is None:
+        standin = RespStandIn()
+        port = await standin.start("127.0.0.1", 0)
+        url = f"redis://127.0.0.1:{port}/0"
+    try:
+        ok &= await verify(f"redis ({'stand-in' if standin else url})",
+                           lambda ttl_seconds: RedisSessionStore(url, ttl_seconds))
+    finally:
+        if standin is not None:
+            await standin.close()
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redis-url", default=None, help="real Redis server instead of the local stand-in")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,76 @@
+"""
+TranscriptStore windowing and token budgeting (app.services.transcript_store).
+
+- tail_tokens stays within its budget, cuts at segment boundaries, and keeps the
+  last words of a newest segment that is over budget on its own
+- eviction keeps the window under max_segments / max_chars and spills evicted
+  segments to the spill file, except while replaying a restored session
+
+Usage: python verify_transcript_store.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.prompt_builder import estimate_tokens
+from app.services.transcript_store import TranscriptStore
+
+def check(label: str, passed: bool, detail: str = "") -> bool:
+    print(f"[{'PASS' if passed else 'FAIL'}] {label}" + ("" if passed else f" ({detail})"))
+    return passed
+
+def main() -> int:
+    ok = True
+
+    store = TranscriptStore()
+    for i in range(20):
+        store.append(f"segment {i} we cache profiles in redis and shard the queue by tenant", timestamp=i)
+    for budget in (10, 50, 200):
+        tail = store.tail_tokens(budget)
+        used = estimate_tokens(tail)
+        ok &= check(f"tail_tokens({budget}) within budget", 0 < used <= budget, f"{used} tokens")
+        ok &= check(f"tail_tokens({budget}) ends with the newest text", tail.endswith("by tenant"))
+    tail = store.tail_tokens(50)
+    ok &= check("tail_tokens cuts at a segment boundary", tail.startswith("segment "), repr(tail[:30]))
+    ok &= check("tail_tokens(0) is empty", store.tail_tokens(0) == "")
+
+    long_store = TranscriptStore()
+    long_store.append("short earlier segment", timestamp=0)
+    words = [f"word{i}" for i in range(1000)]
+    long_store.append(" ".join(words), timestamp=1)
+    tail = long_store.tail_tokens(400)
+    used = estimate_tokens(tail)
+    ok &= check("over-budget newest segment is trimmed, not dropped", tail != "" and used <= 400, f"{used} tokens")
+    ok &= check("trimmed segment keeps its last words", tail.endswith("word999") and "earlier" not in tail)
+
+    bounded = TranscriptStore(max_segments=10, max_chars=10_000)
+    for i in range(25):
+        bounded.append(f"line {i}", timestamp=i)
+    ok &= check("max_segments bounds the window", len(bounded) == 10 and bounded.segments[0].text == "line 15")
+    by_chars = TranscriptStore(max_segments=1000, max_chars=100)
+    for i in range(50):
+        by_chars.append("x" * 30, timestamp=i)
+    ok &= check("max_chars bounds the window", by_chars.chars <= 100, f"{by_chars.chars} chars")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_path = os.path.join(tmp, "spill.jsonl")
+        spilling = TranscriptStore(max_segments=5, spill_path=spill_path)
+        for i in range(8):
+            spilling.append(f"line {i}", timestamp=i)
+        spilling.replaying = True
+        for i in range(8, 12):
+            spilling.append(f"line {i}", timestamp=i)
+        spilling.replaying = False
+        spilling.close()
+        with open(spill_path, encoding="utf-8") as f:
+            spilled = sum(1 for _ in f)
+        ok &= check("evicted segments spill, but not while replaying", spilled == 3, f"{spilled} lines")
+        spilling.clear()
+        ok &= check("clear() removes the spill file", not os.path.exists(spill_path))
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())